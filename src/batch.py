@@ -0,0 +1,329 @@
+"""
+Run the statistical tests and features over a whole panel of time series at once.
+
+Rather than writing a Python loop over every column of a wide `DataFrame`, pass the whole panel to `run_batch()`.
+With `n_jobs > 1`, the panel is copied once into shared memory, and the workers are only sent ranges of row indices, so the series are never pickled (see `src.utils.shared`). Every (series, test) pair is recorded as one row of a tidy result table.
+Any exception or warning raised by an individual test is captured in the `status` and `message` fields of its row, so one bad series can never break (or flood the console of) a large run.
+The rows are accumulated in a columnar `ResultTable`, one numpy array per field, so a large run never holds one Python object per result.
+"""
+
+import warnings
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.regularity import entropy
+from src.seasonality import ch, ocsb, qs
+from src.seasonality import seasonal_strength, spikiness, trend_strength
+from src.stability import lumpiness, stability
+from src.utils.results import ResultTable
+from src.utils.shared import shared_map
+
+
+__all__ = ["run_batch"]
+
+
+# ------------------------------------------------------------------------------#
+# Registry                                                                   ####
+# ------------------------------------------------------------------------------#
+
+
+def _run_qs(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    result = qs(x=x, freq=freq, result_object=True, **kwargs)
+    return result.stat, result.Pval, result.model
+
+
+def _run_ocsb(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return ocsb(x=x, m=freq, **kwargs), np.nan, None
+
+
+def _run_ch(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return ch(x=x, m=freq, **kwargs), np.nan, None
+
+
+def _run_entropy(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return entropy(x=x, **kwargs), np.nan, None
+
+
+def _run_stability(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return stability(data=x, freq=freq, **kwargs), np.nan, None
+
+
+def _run_lumpiness(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return lumpiness(data=x, freq=freq, **kwargs), np.nan, None
+
+
+def _run_seasonal_strength(
+    x: np.ndarray, freq: int, **kwargs
+) -> Tuple[float, float, Any]:
+    return seasonal_strength(x=x, m=freq, **kwargs), np.nan, None
+
+
+def _run_trend_strength(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return trend_strength(x=x, m=freq, **kwargs), np.nan, None
+
+
+def _run_spikiness(x: np.ndarray, freq: int, **kwargs) -> Tuple[float, float, Any]:
+    return spikiness(x=x, m=freq, **kwargs), np.nan, None
+
+
+_TESTS: Dict[str, Callable[..., Tuple[float, float, Any]]] = {
+    "qs": _run_qs,
+    "ocsb": _run_ocsb,
+    "ch": _run_ch,
+    "entropy": _run_entropy,
+    "stability": _run_stability,
+    "lumpiness": _run_lumpiness,
+    "seasonal_strength": _run_seasonal_strength,
+    "trend_strength": _run_trend_strength,
+    "spikiness": _run_spikiness,
+}
+
+_FIELDS = {
+    "series_id": object,
+    "test": object,
+    "stat": np.float64,
+    "pval": np.float64,
+    "status": object,
+    "message": object,
+    "model": object,
+}
+
+
+# ------------------------------------------------------------------------------#
+# Inputs                                                                     ####
+# ------------------------------------------------------------------------------#
+
+
+def _to_panel(
+    data: Union[np.ndarray, pd.DataFrame],
+    id_col: str = "series_id",
+    value_col: str = "value",
+) -> List[Tuple[Hashable, np.ndarray]]:
+    if isinstance(data, pd.DataFrame):
+        if id_col in data.columns:
+            return [
+                (series_id, group[value_col].to_numpy(dtype=np.float64))
+                for series_id, group in data.groupby(id_col, sort=False)
+            ]
+        return [
+            (series_id, data[series_id].to_numpy(dtype=np.float64))
+            for series_id in data.columns
+        ]
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim != 2:
+        raise ValueError(
+            f"Invalid shape for `data`: {data.shape}.\n"
+            f"Must be a 2D array with one series per row, "
+            f"a wide `pd.DataFrame` with one series per column, "
+            f"or a long `pd.DataFrame` with a `{id_col}` column."
+        )
+    return [(idx, row) for idx, row in enumerate(data)]
+
+
+# ------------------------------------------------------------------------------#
+# Execution                                                                  ####
+# ------------------------------------------------------------------------------#
+
+
+def _run_test(
+    test: str, x: np.ndarray, freq: int, params: Dict[str, Dict[str, Any]]
+) -> Tuple[float, float, Any, str, str]:
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            # Every test would fail (or quietly return `NaN`) in its own way, so report a series with no values the same way for all of them.
+            if np.isnan(x).all():
+                raise ValueError("The series has no values.")
+            stat, pval, model = _TESTS[test](x, freq, **params.get(test, {}))
+        except Exception as err:
+            stat, pval, model = np.nan, np.nan, None
+            status, messages = "error", [f"{type(err).__name__}: {err}"]
+        else:
+            status, messages = "ok", []
+    messages += [str(warning.message) for warning in caught]
+    return stat, pval, model, status, "\n".join(messages)
+
+
+def _run_row(
+    x: np.ndarray,
+    out: np.ndarray,
+    tests: Sequence[str],
+    freq: int,
+    params: Dict[str, Dict[str, Any]],
+    keep_models: bool,
+) -> Optional[List[Tuple[str, str, Any]]]:
+    # Write the `stat` and `pval` of every test into the shared `out`, and only send back the status, message and model when any of them is worth sending.
+    extras = []
+    for index, test in enumerate(tests):
+        stat, pval, model, status, message = _run_test(test, x, freq, params)
+        out[2 * index : 2 * index + 2] = stat, pval
+        extras.append((status, message, model if keep_models else None))
+    if all(extra == ("ok", "", None) for extra in extras):
+        return None
+    return extras
+
+
+def _run_shared(
+    panel: List[Tuple[Hashable, np.ndarray]],
+    tests: Sequence[str],
+    freq: int,
+    params: Dict[str, Dict[str, Any]],
+    n_jobs: int,
+    chunksize: Optional[int],
+    keep_models: bool,
+    executor: Optional[Executor] = None,
+) -> ResultTable:
+    # Pad a ragged panel out to a rectangle, and pass the length of each series.
+    lengths = np.array([len(x) for _, x in panel])
+    matrix = np.full((len(panel), lengths.max(initial=0)), np.nan)
+    for row, (_, x) in enumerate(panel):
+        matrix[row, : len(x)] = x
+    results, extras = shared_map(
+        partial(
+            _run_row, tests=tests, freq=freq, params=params, keep_models=keep_models
+        ),
+        matrix,
+        n_outputs=2 * len(tests),
+        n_jobs=n_jobs,
+        chunksize=chunksize,
+        lengths=None if (lengths == matrix.shape[1]).all() else lengths,
+        executor=executor,
+    )
+    table = ResultTable(
+        _FIELDS, keep_models=keep_models, capacity=max(1, len(panel) * len(tests))
+    )
+    for row, (series_id, _) in enumerate(panel):
+        for index, test in enumerate(tests):
+            status, message, model = (
+                extras[row][index] if row in extras else ("ok", "", None)
+            )
+            table.append(
+                series_id=series_id,
+                test=test,
+                stat=results[row, 2 * index],
+                pval=results[row, 2 * index + 1],
+                status=status,
+                message=message,
+                model=model,
+            )
+    return table
+
+
+def _run_chunk(
+    chunk: List[Tuple[Hashable, np.ndarray]],
+    tests: Sequence[str],
+    freq: int,
+    params: Dict[str, Dict[str, Any]],
+    keep_models: bool = False,
+) -> ResultTable:
+    table = ResultTable(
+        _FIELDS, keep_models=keep_models, capacity=max(1, len(chunk) * len(tests))
+    )
+    for series_id, x in chunk:
+        for test in tests:
+            stat, pval, model, status, message = _run_test(test, x, freq, params)
+            table.append(
+                series_id=series_id,
+                test=test,
+                stat=stat,
+                pval=pval,
+                status=status,
+                message=message,
+                model=model,
+            )
+    return table
+
+
+def run_batch(
+    data: Union[np.ndarray, pd.DataFrame],
+    freq: int,
+    tests: Union[str, Sequence[str]] = ("qs", "ocsb", "ch"),
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    n_jobs: int = 1,
+    chunksize: Optional[int] = None,
+    id_col: str = "series_id",
+    value_col: str = "value",
+    keep_models: bool = False,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """
+    Summary:
+        Run one or more tests or features over every series in a panel.
+
+    Params:
+        data (Union[np.ndarray, pd.DataFrame]):
+            The panel of time series. Can be any of:
+            - A 2D `np.ndarray` with one series per row,
+            - A wide `pd.DataFrame` with one series per column, or
+            - A long `pd.DataFrame` with one row per observation, and the series identified by the `id_col` column.
+        freq (int):
+            The frequency of the time series. Passed as `freq` to `qs()`, `stability()` and `lumpiness()`, and as `m` to `ocsb()`, `ch()` and the strength features. Not used by `entropy()`.
+        tests (Union[str, Sequence[str]], optional):
+            The names of the tests to run. Any of `"qs"`, `"ocsb"`, `"ch"`, `"entropy"`, `"stability"`, `"lumpiness"`, `"seasonal_strength"`, `"trend_strength"` and `"spikiness"`. Defaults to `("qs", "ocsb", "ch")`.
+        params (Optional[Dict[str, Dict[str, Any]]], optional):
+            Extra keyword arguments for each test, keyed by test name. For example: `{"qs": {"diff": False}}`. Defaults to `None`.
+        n_jobs (int, optional):
+            The number of worker processes. Use `1` to run in the current process, or `-1` to use every core. Defaults to `1`.
+        chunksize (Optional[int], optional):
+            The number of series handled by a worker in each task. Defaults to `None`, which splits the panel into roughly four chunks per worker.
+        id_col (str, optional):
+            The name of the series identifier column, for long-format data. Defaults to `"series_id"`.
+        value_col (str, optional):
+            The name of the value column, for long-format data. Defaults to `"value"`.
+        keep_models (bool, optional):
+            Whether or not to keep the fitted residual model of each `qs` run (see `qs(residuals=True)`), in an extra `model` column. Defaults to `False`, so that no model outlives its test.
+        executor (Optional[Executor], optional):
+            An existing `ProcessPoolExecutor` to run on, instead of starting a new pool of `n_jobs` workers. Re-using one pool over many calls means its workers only start, and import their dependencies, once. Defaults to `None`.
+
+    Raises:
+        ValueError:
+            If any of the `tests` are not recognised, or if `data` is not a 2D panel.
+
+    Returns:
+        pd.DataFrame:
+            A tidy table with one row per series and test, and the columns:
+            - `series_id`: The row index, column name, or `id_col` value of the series,
+            - `test`: The name of the test,
+            - `stat`: The test statistic (for `qs`), the estimated seasonal differencing term (for `ocsb` and `ch`), or the value of the feature (for the others),
+            - `pval`: The p-value (for `qs`), otherwise `NaN`,
+            - `status`: Either `"ok"` or `"error"`. A series with no values is an `"error"` for every test,
+            - `message`: Any error or warning messages raised while running the test.
+            - `model`: Only when `keep_models` is `True`, the fitted residual model, or `None`.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> import numpy as np
+        >>> from sktime.datasets import load_airline
+        >>> data = np.vstack([load_airline().values] * 3)
+        >>> run_batch(data, freq=12, tests=["qs", "ch"], n_jobs=2)
+           series_id test        stat          pval status message
+        0          0   qs  194.469289  5.909223e-43     ok
+        1          0   ch    0.000000           NaN     ok
+        2          1   qs  194.469289  5.909223e-43     ok
+        3          1   ch    0.000000           NaN     ok
+        4          2   qs  194.469289  5.909223e-43     ok
+        5          2   ch    0.000000           NaN     ok
+        ```
+    """
+    tests = [tests] if isinstance(tests, str) else list(tests)
+    invalid = [test for test in tests if test not in _TESTS]
+    if invalid:
+        raise ValueError(
+            f"Invalid option for `tests` parameter: {invalid}.\n"
+            f"Valid options are: {list(_TESTS)}."
+        )
+    params = params or {}
+    panel = _to_panel(data, id_col=id_col, value_col=value_col)
+    if executor is None and (n_jobs == 1 or len(panel) <= 1):
+        table = _run_chunk(panel, tests, freq, params, keep_models)
+    else:
+        table = _run_shared(
+            panel, tests, freq, params, n_jobs, chunksize, keep_models, executor
+        )
+
+    return table.to_pandas()
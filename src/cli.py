@@ -0,0 +1,370 @@
+"""
+The command-line interface, run as `python -m src`.
+
+The `score` command streams a CSV or Parquet file of time series through `run_batch()`, and writes the results as it goes:
+
+```bash
+python -m src score --tests qs,entropy,stability --freq 12 input.parquet output.parquet
+```
+
+The input is read in chunks of `--chunk-size` rows, every complete series in a chunk is scored (over `--n-jobs` processes), and the results are appended to the output before the next chunk is read.
+Memory is therefore bounded by the chunk size (plus the longest single series), not by the size of the file.
+Parquet files need the optional `pyarrow` package.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO
+
+import numpy as np
+import pandas as pd
+
+from src.batch import _TESTS, run_batch
+
+
+__all__ = ["score", "main"]
+
+
+LAYOUTS = ["long", "rows"]
+_PARQUET_SUFFIXES = [".parquet", ".pq"]
+
+
+# ------------------------------------------------------------------------------#
+# Reading                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+def _is_parquet(path: str) -> bool:
+    return Path(path).suffix.lower() in _PARQUET_SUFFIXES
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            f"Reading or writing Parquet files needs the `pyarrow` package.\n"
+            f"Install it, or use CSV files."
+        ) from error
+    return pyarrow
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if _is_parquet(path):
+        for batch in (
+            _pyarrow().parquet.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        ):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def _long_batches(
+    frames: Iterator[pd.DataFrame], id_col: str
+) -> Iterator[pd.DataFrame]:
+    """
+    Regroup chunks of a long file into batches of complete series, by holding back the trailing series of each chunk until the next one shows whether it continues.
+    """
+    carry: Optional[pd.DataFrame] = None
+    for frame in frames:
+        if id_col not in frame.columns:
+            raise ValueError(
+                f"The input has no `{id_col}` column.\n"
+                f"Use `--id-col` to name the series identifier column."
+            )
+        # A header-only file, or an empty Parquet batch, has no series to regroup.
+        if len(frame) == 0:
+            continue
+        if carry is not None:
+            frame = pd.concat([carry, frame], ignore_index=True)
+        ids = frame[id_col].to_numpy()
+        others = np.nonzero(ids != ids[-1])[0]
+        start = others[-1] + 1 if len(others) else 0
+        carry = frame.iloc[start:]
+        if start > 0:
+            yield frame.iloc[:start]
+    if carry is not None and len(carry):
+        yield carry
+
+
+def _rows_batches(
+    frames: Iterator[pd.DataFrame], id_col: str, value_col: str
+) -> Iterator[pd.DataFrame]:
+    """
+    Reshape each chunk of a file with one series per row into the long layout, numbering the rows across the whole file when there is no `id_col` column.
+    """
+    offset = 0
+    for frame in frames:
+        if len(frame) == 0:
+            continue
+        yield _rows_to_long(frame, id_col, value_col, offset)
+        offset += len(frame)
+
+
+def _rows_to_long(
+    frame: pd.DataFrame, id_col: str, value_col: str, offset: int = 0
+) -> pd.DataFrame:
+    """
+    Reshape a chunk of a file with one series per row into the long layout, dropping the trailing `NaN`s which pad out the shorter series. A row with no values is kept as a single `NaN`, so `run_batch()` still reports it, as an error. Without an `id_col` column, each series is identified by its row number in the file, starting from `offset` for this chunk.
+    """
+    if id_col in frame.columns:
+        ids = frame[id_col].to_numpy()
+        frame = frame.drop(columns=id_col)
+    else:
+        # The index of a Parquet batch restarts at `0`, so it cannot identify the rows.
+        ids = np.arange(offset, offset + len(frame))
+    values = frame.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    lengths = np.where(
+        valid.any(axis=1), values.shape[1] - np.argmax(valid[:, ::-1], axis=1), 1
+    )
+    keep = np.arange(values.shape[1]) < lengths[:, np.newaxis]
+    return pd.DataFrame({id_col: np.repeat(ids, lengths), value_col: values[keep]})
+
+
+# ------------------------------------------------------------------------------#
+# Writing                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+class _Writer:
+    """
+    Append result tables to a CSV or Parquet file, one chunk at a time.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self._writer = None
+        self._started = False
+        if self.parquet:
+            _pyarrow()
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.parquet:
+            pyarrow = _pyarrow()
+            # Keep the identifiers as strings, so every chunk has the same schema.
+            frame = frame.assign(series_id=frame["series_id"].astype(str))
+            table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(
+                self.path,
+                mode="a" if self._started else "w",
+                header=not self._started,
+                index=False,
+            )
+        self._started = True
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+# ------------------------------------------------------------------------------#
+# Scoring                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+def score(
+    input: str,
+    output: str,
+    freq: int,
+    tests: Sequence[str] = ("qs", "ocsb", "ch"),
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    layout: str = "long",
+    id_col: str = "series_id",
+    value_col: str = "value",
+    chunk_size: int = 100_000,
+    n_jobs: int = 1,
+    progress: Optional[TextIO] = None,
+) -> int:
+    """
+    Summary:
+        Stream a file of time series through `run_batch()`, and write the results incrementally.
+
+    Params:
+        input (str):
+            The path of the input CSV or Parquet file.
+        output (str):
+            The path of the output CSV or Parquet file. The format of each file follows its suffix (`.parquet` or `.pq`, or anything else for CSV).
+        freq (int):
+            The frequency of the time series.
+        tests (Sequence[str], optional):
+            The names of the tests to run, as for `run_batch()`. Defaults to `("qs", "ocsb", "ch")`.
+        params (Optional[Dict[str, Dict[str, Any]]], optional):
+            Extra keyword arguments for each test, as for `run_batch()`. Defaults to `None`.
+        layout (str, optional):
+            The layout of the input. One of:
+            - `"long"`: One observation per row, with the series identified by the `id_col` column and the values in the `value_col` column. The rows of each series must be contiguous.
+            - `"rows"`: One series per row, with an optional `id_col` column and every other column holding the values. Shorter series are padded with trailing blanks.
+            Defaults to `"long"`.
+        id_col (str, optional):
+            The name of the series identifier column. Defaults to `"series_id"`.
+        value_col (str, optional):
+            The name of the value column, for the `"long"` layout. Defaults to `"value"`.
+        chunk_size (int, optional):
+            The number of rows of the input to read at once. Defaults to `100_000`.
+        n_jobs (int, optional):
+            The number of worker processes for each chunk. Use `-1` to use every core. Defaults to `1`.
+        progress (Optional[TextIO], optional):
+            Where to write a progress line after every chunk, such as `sys.stderr`. Defaults to `None`, which writes nothing.
+
+    Raises:
+        ValueError:
+            If `layout` or any of `tests` are not valid options, or the input has no `id_col` column in the `"long"` layout.
+        ImportError:
+            If either file is a Parquet file, but `pyarrow` is not installed.
+
+    Returns:
+        int:
+            The number of series scored.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(
+            f"Invalid option for `layout` parameter: {layout}.\n"
+            f"Valid options are: {LAYOUTS}."
+        )
+    invalid = [test for test in tests if test not in _TESTS]
+    if invalid:
+        raise ValueError(
+            f"Invalid option for `tests` parameter: {invalid}.\n"
+            f"Valid options are: {list(_TESTS)}."
+        )
+
+    frames = _read_chunks(input, chunk_size)
+    if layout == "long":
+        batches = _long_batches(frames, id_col)
+    else:
+        batches = _rows_batches(frames, id_col, value_col)
+
+    writer = _Writer(output)
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+    # One pool for the whole file, so the workers only start and import their dependencies once.
+    executor = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    start, count = perf_counter(), 0
+    try:
+        for batch in batches:
+            result = run_batch(
+                batch,
+                freq=freq,
+                tests=tests,
+                params=params,
+                n_jobs=n_jobs,
+                id_col=id_col,
+                value_col=value_col,
+                executor=executor,
+            )
+            writer.write(result)
+            count += batch[id_col].nunique()
+            if progress is not None:
+                rate = count / max(perf_counter() - start, 1e-9)
+                progress.write(f"\r{count:,} series scored ({rate:,.1f} series/s)")
+                progress.flush()
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown()
+    if progress is not None:
+        progress.write("\n")
+    return count
+
+
+# ------------------------------------------------------------------------------#
+# Entry point                                                                ####
+# ------------------------------------------------------------------------------#
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Time series statistical tests.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_score = commands.add_parser(
+        "score",
+        help="Score every series in a CSV or Parquet file.",
+        description="Stream a CSV or Parquet file of time series through the tests, writing the results as it goes.",
+    )
+    parser_score.add_argument("input", help="The input CSV or Parquet file.")
+    parser_score.add_argument("output", help="The output CSV or Parquet file.")
+    parser_score.add_argument(
+        "--tests",
+        default="qs,ocsb,ch",
+        help=f"Comma-separated tests to run, from: {','.join(_TESTS)}. Default: %(default)s.",
+    )
+    parser_score.add_argument(
+        "--freq", type=int, required=True, help="The frequency of the series."
+    )
+    parser_score.add_argument(
+        "--params",
+        type=json.loads,
+        default=None,
+        help='Extra arguments for each test, as JSON. For example: \'{"qs": {"diff": false}}\'.',
+    )
+    parser_score.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="long",
+        help="Either one observation per row (`long`), or one series per row (`rows`). Default: %(default)s.",
+    )
+    parser_score.add_argument("--id-col", default="series_id")
+    parser_score.add_argument("--value-col", default="value")
+    parser_score.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="The number of input rows to read at once. Default: %(default)s.",
+    )
+    parser_score.add_argument(
+        "--n-jobs",
+        type=int,
+        default=1,
+        help="The number of worker processes, or -1 for every core. Default: %(default)s.",
+    )
+    parser_score.add_argument(
+        "--quiet", action="store_true", help="Do not report progress."
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Summary:
+        Run the command-line interface.
+
+    Params:
+        argv (Optional[List[str]], optional):
+            The command-line arguments. Defaults to `None`, which uses `sys.argv`.
+
+    Returns:
+        int:
+            The exit status: `0` on success, or `1` if the command failed.
+    """
+    args = _parser().parse_args(argv)
+    try:
+        score(
+            input=args.input,
+            output=args.output,
+            freq=args.freq,
+            tests=[test.strip() for test in args.tests.split(",") if test.strip()],
+            params=args.params,
+            layout=args.layout,
+            id_col=args.id_col,
+            value_col=args.value_col,
+            chunk_size=args.chunk_size,
+            n_jobs=args.n_jobs,
+            progress=None if args.quiet else sys.stderr,
+        )
+    except (ImportError, OSError, ValueError) as error:
+        sys.stderr.write(f"error: {error}\n")
+        return 1
+    return 0
@@ -1,16 +1,393 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from typing import Union
 
 import numpy as np
-from statsmodels.tools.validation import array_like
-from statsmodels.tsa.api import acf as st_acf
-from statsmodels.tsa.api import ccf as st_ccf
-from statsmodels.tsa.api import pacf as st_pacf
-from typeguard import typechecked
 
+from src.utils.checks import array_like
+from src.utils.checks import typechecked
+from src.utils.chunks import iter_chunks, moments, resolve_chunk_size
+from src.utils.precision import as_precision, resolve_dtype
 
-__all__ = ["acf", "pacf", "ccf"]
+
+__all__ = ["acf", "pacf", "ccf", "ccf_matrix", "OnlineACF"]
+
+
+_PACF_ADJUSTED = (
+    "yw",
+    "ywa",
+    "ywadjusted",
+    "yw_adjusted",
+    "ld",
+    "lda",
+    "ldadjusted",
+    "ld_adjusted",
+)
+_PACF_BIASED = ("ywm", "ywmle", "yw_mle", "ldb", "ldbiased", "ld_biased")
+
+# Relative cost of one `rfft`/`irfft` butterfly against one multiply-add of the direct lag sum, measured with `numpy`'s `pocketfft` backend.
+_FFT_COST = 6.0
+
+# Memory budget, in bytes, for the cross-correlations of one block of pairs in `ccf_matrix()`.
+_CCF_BLOCK_BYTES = 64 * 2**20
+
+# The inputs shared by every block of `ccf_matrix()`. Set once per process, so that each worker of a pool receives the spectra only once.
+_CCF_STATE: Dict[str, Any] = {}
+
+
+# ------------------------------------------------------------------------------#
+# Batch kernels                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+def _as_panel(x: array_like, axis: int, dtype: Any = np.float64) -> np.ndarray:
+    x = np.asarray(x)
+    if x.ndim != 2:
+        raise ValueError(f"Invalid shape for `x`: {x.shape}. Must be 2D.")
+    return np.ascontiguousarray(
+        np.moveaxis(as_precision(x, dtype, axis=axis), axis, -1)
+    )
+
+
+def _acovf_batch(
+    x: np.ndarray, nlags: int, adjusted: bool = False, fft: bool = True
+) -> np.ndarray:
+    # `scipy.fft` keeps a `float32` panel in single precision, where `np.fft` would upcast it. The direct lag sums accumulate in `float64`, since they are not pairwise.
+    nobs = x.shape[-1]
+    xo = x - x.mean(axis=-1, keepdims=True)
+    if fft:
+        from scipy.fft import irfft, next_fast_len, rfft
+
+        nfft = next_fast_len(2 * nobs + 1, real=True)
+        Frf = rfft(xo, n=nfft, axis=-1)
+        acov = irfft(Frf.real**2 + Frf.imag**2, n=nfft, axis=-1)
+        acov = acov[:, : nlags + 1]
+    else:
+        acov = np.empty((x.shape[0], nlags + 1), dtype=x.dtype)
+        for lag in range(nlags + 1):
+            acov[:, lag] = np.einsum(
+                "ij,ij->i", xo[:, lag:], xo[:, : nobs - lag], dtype=np.float64
+            )
+    acov = acov / (nobs - np.arange(nlags + 1) if adjusted else nobs)
+    return acov.astype(x.dtype, copy=False)
+
+
+def _levinson_durbin_batch(acov: np.ndarray, nlags: int) -> np.ndarray:
+    pacf = np.empty((acov.shape[0], nlags + 1), dtype=acov.dtype)
+    pacf[:, 0] = 1.0
+    phi = np.zeros((acov.shape[0], nlags + 1), dtype=acov.dtype)
+    sigma = acov[:, 0].copy()
+    for k in range(1, nlags + 1):
+        reflection = (
+            acov[:, k] - np.einsum("ij,ij->i", phi[:, 1:k], acov[:, k - 1 : 0 : -1])
+        ) / sigma
+        phi[:, 1:k] = phi[:, 1:k] - reflection[:, None] * phi[:, k - 1 : 0 : -1]
+        phi[:, k] = reflection
+        sigma = sigma * (1 - reflection**2)
+        pacf[:, k] = reflection
+    return pacf
+
+
+def _prefer_direct(nobs: int, nlags: int) -> bool:
+    from scipy.fft import next_fast_len
+
+    nfft = next_fast_len(2 * nobs + 1, real=True)
+    return nobs * nlags < _FFT_COST * nfft * np.log2(nfft)
+
+
+def _acf_lags(
+    x: np.ndarray,
+    lags: Union[Sequence[int], np.ndarray],
+    adjusted: bool,
+    missing: str,
+) -> np.ndarray:
+    lags = np.asarray(lags, dtype=np.int64)
+    if lags.ndim != 1 or len(lags) == 0:
+        raise ValueError(f"Invalid value for `lags`: {lags}. Must be a 1D sequence.")
+    if missing not in ("none", "raise", "drop"):
+        raise ValueError(
+            f"Invalid option for `missing` parameter: {missing}.\n"
+            f"When `lags` are given, valid options are: ['none', 'raise', 'drop']."
+        )
+    nan_mask = np.isnan(x)
+    if missing == "raise" and nan_mask.any():
+        raise ValueError("NaNs were encountered in the data")
+    if missing == "drop":
+        if x.ndim != 1:
+            return np.vstack([_acf_lags(row, lags, adjusted, missing) for row in x])
+        x = x[~nan_mask]
+    panel = np.atleast_2d(x)
+    nobs = panel.shape[-1]
+    if lags.min() < 0 or lags.max() > nobs - 1:
+        raise ValueError(
+            f"Invalid value for `lags`: {lags.tolist()}.\n"
+            f"Every lag must be between `0` and `nobs-1` ({nobs - 1})."
+        )
+    unique = np.unique(lags)
+    if _prefer_direct(nobs=nobs, nlags=len(unique)):
+        xo = panel - panel.mean(axis=-1, keepdims=True)
+        acov = np.empty((panel.shape[0], len(unique)))
+        for idx, lag in enumerate(unique):
+            acov[:, idx] = np.einsum(
+                "ij,ij->i", xo[:, lag:], xo[:, : nobs - lag], dtype=np.float64
+            )
+        acov /= nobs - unique if adjusted else nobs
+        acov0 = np.einsum("ij,ij->i", xo, xo, dtype=np.float64) / nobs
+    else:
+        full = _acovf_batch(panel, nlags=int(unique.max()), adjusted=adjusted)
+        acov, acov0 = full[:, unique], full[:, 0]
+    result = (acov / acov0[:, None])[:, np.searchsorted(unique, lags)]
+    result = result.astype(panel.dtype, copy=False)
+    return result if x.ndim == 2 else result[0]
+
+
+def _acf_batch(
+    x: np.ndarray,
+    adjusted: bool,
+    nlags: Optional[int],
+    qstat: bool,
+    fft: bool,
+    alpha: Optional[float],
+    bartlett_confint: bool,
+    missing: str,
+) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+    nobs = x.shape[-1]
+    if nlags is None:
+        nlags = min(int(10 * np.log10(nobs)), nobs - 1)
+    if missing in ("drop", "conservative"):
+        from statsmodels.tsa.stattools import acf as st_acf
+
+        rows = [
+            st_acf(
+                x=row,
+                adjusted=adjusted,
+                nlags=nlags,
+                qstat=qstat,
+                fft=fft,
+                alpha=alpha,
+                bartlett_confint=bartlett_confint,
+                missing=missing,
+            )
+            for row in x
+        ]
+        if not (qstat or alpha is not None):
+            return np.vstack(rows)
+        return tuple(np.stack(part) for part in zip(*rows))
+    if missing == "raise" and np.isnan(x).any():
+        raise ValueError("NaNs were encountered in the data")
+
+    acov = _acovf_batch(x, nlags=nlags, adjusted=adjusted, fft=fft)
+    return _acf_outputs(
+        acov / acov[:, :1],
+        nobs=nobs,
+        qstat=qstat,
+        alpha=alpha,
+        bartlett_confint=bartlett_confint,
+    )
+
+
+def _acf_outputs(
+    acf: np.ndarray,
+    nobs: int,
+    qstat: bool,
+    alpha: Optional[float],
+    bartlett_confint: bool,
+) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+    nlags = acf.shape[-1] - 1
+    result = [acf]
+    if alpha is not None or qstat:
+        from scipy.stats import chi2, norm
+
+    if alpha is not None:
+        if bartlett_confint:
+            varacf = np.ones_like(acf) / nobs
+            varacf[:, 0] = 0
+            varacf[:, 1] = 1.0 / nobs
+            varacf[:, 2:] *= 1 + 2 * np.cumsum(acf[:, 1:-1] ** 2, axis=-1)
+        else:
+            varacf = np.full_like(acf, 1.0 / nobs)
+        interval = norm.ppf(1 - alpha / 2.0) * np.sqrt(varacf)
+        result.append(np.stack([acf - interval, acf + interval], axis=-1))
+    if qstat:
+        lags = np.arange(1, nlags + 1)
+        q = nobs * (nobs + 2) * np.cumsum(acf[:, 1:] ** 2 / (nobs - lags), axis=-1)
+        result += [part.astype(acf.dtype, copy=False) for part in (q, chi2.sf(q, lags))]
+    return result[0] if len(result) == 1 else tuple(result)
+
+
+def _pacf_batch(
+    x: np.ndarray, nlags: Optional[int], method: str, alpha: Optional[float]
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    nobs = x.shape[-1]
+    if nlags is None:
+        nlags = min(int(10 * np.log10(nobs)), nobs // 2 - 1)
+    nlags = max(nlags, 1)
+    if nlags > nobs // 2:
+        raise ValueError(
+            f"Can only compute partial correlations for lags up to 50% of the sample size. "
+            f"The requested nlags {nlags} must be < {nobs // 2}."
+        )
+    if method in _PACF_ADJUSTED + _PACF_BIASED:
+        acov = _acovf_batch(x, nlags=nlags, adjusted=method in _PACF_ADJUSTED)
+        pacf = _levinson_durbin_batch(acov, nlags=nlags)
+    else:
+        from statsmodels.tsa.stattools import pacf as st_pacf
+
+        pacf = np.vstack([st_pacf(x=row, nlags=nlags, method=method) for row in x])
+    if alpha is None:
+        return pacf
+    from scipy.stats import norm
+
+    interval = norm.ppf(1.0 - alpha / 2.0) * np.sqrt(1.0 / nobs)
+    confint = np.stack([pacf - interval, pacf + interval], axis=-1)
+    confint[:, 0] = pacf[:, :1]
+    return pacf, confint
+
+
+def _ccovf_chunked(
+    x: np.ndarray,
+    y: np.ndarray,
+    nlags: int,
+    adjusted: bool,
+    fft: bool,
+    chunk_size: int,
+) -> np.ndarray:
+    """
+    The cross-covariances of `x[t+k]` and `y[t]` for every `k <= nlags`, reading only `chunk_size` values of `y` and `chunk_size+nlags` values of `x` at a time.
+    """
+    from scipy.fft import next_fast_len
+
+    nobs = len(x)
+    xmean = moments(x, chunk_size)[0]
+    ymean = xmean if y is x else moments(y, chunk_size)[0]
+    heads = None if y is x else iter_chunks(y, chunk_size)
+    acov = np.zeros(nlags + 1)
+    for _, tail in iter_chunks(x, chunk_size, overlap=nlags):
+        tail -= xmean
+        head = tail[:chunk_size] if heads is None else next(heads)[1] - ymean
+        if fft and not _prefer_direct(nobs=len(head), nlags=nlags):
+            # Overlap-add: the tail of each chunk only overlaps the next `nlags` values, so the padded transform never wraps around onto lags `<= nlags`.
+            nfft = next_fast_len(len(head) + nlags, real=True)
+            cross = np.fft.rfft(head, n=nfft).conj() * np.fft.rfft(tail, n=nfft)
+            acov += np.fft.irfft(cross, n=nfft)[: nlags + 1]
+        else:
+            for lag in range(min(nlags + 1, len(tail))):
+                size = min(len(head), len(tail) - lag)
+                acov[lag] += head[:size] @ tail[lag : lag + size]
+    return acov / (nobs - np.arange(nlags + 1) if adjusted else nobs)
+
+
+def _acf_chunked(
+    x: np.ndarray,
+    adjusted: bool,
+    nlags: Optional[int],
+    qstat: bool,
+    fft: bool,
+    alpha: Optional[float],
+    bartlett_confint: bool,
+    missing: str,
+    lags: Optional[Union[Sequence[int], np.ndarray]],
+    chunk_size: int,
+) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+    x = np.asarray(x)
+    if x.ndim != 1:
+        raise ValueError(
+            f"Invalid shape for `x`: {x.shape}. "
+            f"Must be 1D when processing in chunks."
+        )
+    if missing not in ("none", "raise"):
+        raise ValueError(
+            f"Invalid option for `missing` parameter: {missing}.\n"
+            f"When processing in chunks, valid options are: ['none', 'raise']."
+        )
+    if missing == "raise" and any(
+        np.isnan(chunk).any() for _, chunk in iter_chunks(x, chunk_size)
+    ):
+        raise ValueError("NaNs were encountered in the data")
+    nobs = len(x)
+    if lags is not None:
+        lags = np.asarray(lags, dtype=np.int64)
+        if lags.ndim != 1 or len(lags) == 0:
+            raise ValueError(
+                f"Invalid value for `lags`: {lags}. Must be a 1D sequence."
+            )
+        if lags.min() < 0 or lags.max() > nobs - 1:
+            raise ValueError(
+                f"Invalid value for `lags`: {lags.tolist()}.\n"
+                f"Every lag must be between `0` and `nobs-1` ({nobs - 1})."
+            )
+        acov = _ccovf_chunked(x, x, int(lags.max()), adjusted, fft, chunk_size)
+        return acov[lags] / acov[0]
+    if nlags is None:
+        nlags = min(int(10 * np.log10(nobs)), nobs - 1)
+    acov = _ccovf_chunked(x, x, nlags, adjusted, fft, chunk_size)
+    result = _acf_outputs(
+        (acov / acov[0])[None, :],
+        nobs=nobs,
+        qstat=qstat,
+        alpha=alpha,
+        bartlett_confint=bartlett_confint,
+    )
+    if isinstance(result, tuple):
+        return tuple(part[0] for part in result)
+    return result[0]
+
+
+def _ccf_init(state: Dict[str, Any]) -> None:
+    _CCF_STATE.clear()
+    _CCF_STATE.update(state)
+
+
+def _ccf_block(
+    bounds: Tuple[int, int, int, int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    row_start, row_stop, col_start, col_stop = bounds
+    series, nobs, nfft = _CCF_STATE["series"], _CCF_STATE["nobs"], _CCF_STATE["nfft"]
+    lags = np.arange(-_CCF_STATE["max_lag"], _CCF_STATE["max_lag"] + 1)
+    rows, cols = series[row_start:row_stop], series[col_start:col_stop]
+    if nfft:
+        from scipy.fft import irfft
+
+        cross = rows[:, None, :] * cols[None, :, :].conj()
+        corr = irfft(cross, n=nfft, axis=-1)[..., lags]
+    else:
+        corr = np.empty((len(rows), len(cols), len(lags)), dtype=rows.dtype)
+        for idx, lag in enumerate(lags):
+            if lag >= 0:
+                corr[..., idx] = rows[:, lag:] @ cols[:, : nobs - lag].T
+            else:
+                corr[..., idx] = rows[:, : nobs + lag] @ cols[:, -lag:].T
+    corr /= nobs - np.abs(lags) if _CCF_STATE["adjusted"] else nobs
+
+    pair_rows, pair_cols = np.nonzero(
+        np.arange(row_start, row_stop)[:, None] < np.arange(col_start, col_stop)
+    )
+    corr = corr[pair_rows, pair_cols]
+    top_k = _CCF_STATE["top_k"]
+    strength = -np.abs(corr)
+    if top_k < len(lags):
+        top = np.argpartition(strength, top_k - 1, axis=-1)[:, :top_k]
+    else:
+        top = np.broadcast_to(np.arange(len(lags)), corr.shape)
+    order = np.argsort(np.take_along_axis(strength, top, axis=-1), axis=-1)
+    top = np.take_along_axis(top, order, axis=-1)
+    return (
+        pair_rows + row_start,
+        pair_cols + col_start,
+        lags[top],
+        np.take_along_axis(corr, top, axis=-1),
+    )
+
+
+# ------------------------------------------------------------------------------#
+# Correlation                                                                ####
+# ------------------------------------------------------------------------------#
 
 
 @typechecked
@@ -23,7 +400,135 @@ def acf(
     alpha: float = None,
     bartlett_confint: bool = True,
     missing: str = "none",
-) -> Union[np.ndarray, Tuple[Union[np.ndarray, Optional[np.ndarray]]]]:
+    axis: int = -1,
+    lags: Optional[Union[Sequence[int], np.ndarray]] = None,
+    chunk_size: Optional[int] = None,
+    dtype: Optional[str] = None,
+) -> Union[np.ndarray, Tuple[Union[np.ndarray, Optional[np.ndarray]], ...]]:
+    """
+    Summary:
+        Calculate the autocorrelation function of one series, or of a whole panel of equal-length series.
+
+    Params:
+        x (array_like):
+            The time series data. Either a 1D series, or a 2D panel of series.
+        adjusted (bool, optional):
+            If `True`, then denominators for the autocovariance are `n-k`, otherwise `n`. Defaults to `False`.
+        nlags (int, optional):
+            The number of lags to return. Defaults to `None`, which uses `min(10*log10(nobs), nobs-1)`.
+        qstat (bool, optional):
+            If `True`, also return the Ljung-Box q statistic and its p-value for each lag. Defaults to `False`.
+        fft (bool, optional):
+            If `True`, compute the autocovariance with an FFT. Defaults to `True`.
+        alpha (float, optional):
+            If a number is given, also return the `1-alpha` confidence intervals. Defaults to `None`.
+        bartlett_confint (bool, optional):
+            If `True`, the confidence intervals use Bartlett's formula. Defaults to `True`.
+        missing (str, optional):
+            How to handle `NaN` values. One of `"none"`, `"raise"`, `"conservative"` or `"drop"`. Defaults to `"none"`.
+        axis (int, optional):
+            For a 2D panel only, the axis along which time runs. Defaults to `-1`, meaning one series per row.
+        lags (Optional[Union[Sequence[int], np.ndarray]], optional):
+            If given, compute the autocorrelation at only these lags, and return them in the same order. Cannot be combined with `qstat` or `alpha`, and `missing` must be one of `"none"`, `"raise"` or `"drop"`. Defaults to `None`.
+        chunk_size (Optional[int], optional):
+            If given, process a 1D series out-of-core, reading only this many values (plus `nlags`) at a time. Then `missing` must be `"none"` or `"raise"`. Defaults to `None`, which processes a 1D `np.memmap` in chunks of `2**20` values, and anything else (including a memory-mapped panel) in memory.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `lags` are given together with `qstat` or `alpha`, or if any lag is outside `[0, nobs-1]`, or `dtype` is not a valid option.
+        ValueError:
+            If processing in chunks, and `x` is not 1D or `missing` is not `"none"` or `"raise"`.
+
+    Returns:
+        Union[np.ndarray, Tuple[Union[np.ndarray, Optional[np.ndarray]], ...]]:
+            The same outputs as `statsmodels.tsa.stattools.acf()`.
+            When `lags` are given, only the autocorrelations are returned, with shape `(len(lags),)` (or `(N, len(lags))` for a panel).
+            For a 2D panel of `N` series, every output gains a leading axis of length `N`. So the autocorrelations have shape `(N, nlags+1)`, the confidence intervals `(N, nlags+1, 2)`, and the q statistics and p-values `(N, nlags)`.
+
+    ???+ Info "Details"
+        A 1D series is passed straight through to `statsmodels`.
+        A 2D panel is processed in one vectorised pass: a single `rfft` over the whole `(N, T)` matrix, then vectorised Bartlett intervals and Ljung-Box statistics.
+        For `missing="drop"` or `missing="conservative"`, the series in a panel may have different numbers of valid observations, so these are processed one row at a time.
+
+        When only a few `lags` are needed, each one is computed directly as a dot product, in `O(n)` time per lag, rather than computing every lag up to `max(lags)` with an FFT.
+        A simple cost model (`n*len(lags)` against `nfft*log2(nfft)`) picks whichever of the two is cheaper.
+
+        When processing in chunks (for example, a `10^8` point `np.memmap`), the mean is found in one pass, and the autocovariances in a second. Each chunk is correlated with itself plus the next `nlags` values, by a padded FFT which is long enough never to wrap around, and the partial sums are added up (overlap-add). Peak memory is therefore a small multiple of `chunk_size+nlags` values, whatever the length of the series, and the results match the in-memory path to floating point precision.
+
+        With `dtype="float32"`, the panel and its spectra are kept in single precision, which halves the memory of a large panel, and every output is `float32`. A 1D series then takes the batched path too, as a panel of one row, rather than `statsmodels`, which only works in `float64`. The autocorrelations are within `1e-6` of `dtype="float64"`.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> import numpy as np
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> acf(np.vstack([data, data[::-1]]), nlags=2)
+        array([[1.        , 0.94804734, 0.87557484],
+               [1.        , 0.94804734, 0.87557484]])
+        >>> acf(data, lags=[12, 24])
+        array([0.76039504, 0.53218983])
+        ```
+    """
+    if lags is not None and (qstat or alpha is not None):
+        raise ValueError(
+            f"The `qstat` and `alpha` parameters cannot be used together with `lags`."
+        )
+    dtype = resolve_dtype(dtype)
+    chunk_size = resolve_chunk_size(x, chunk_size)
+    if chunk_size is not None:
+        return _acf_chunked(
+            x=x,
+            adjusted=adjusted,
+            nlags=nlags,
+            qstat=qstat,
+            fft=fft,
+            alpha=alpha,
+            bartlett_confint=bartlett_confint,
+            missing=missing,
+            lags=lags,
+            chunk_size=chunk_size,
+        )
+    if lags is not None:
+        if np.ndim(x) == 2:
+            x = _as_panel(x, axis=axis, dtype=dtype)
+        else:
+            x = as_precision(x, dtype)
+        return _acf_lags(
+            x=x,
+            lags=lags,
+            adjusted=adjusted,
+            missing=missing,
+        )
+    if np.ndim(x) == 2:
+        return _acf_batch(
+            x=_as_panel(x, axis=axis, dtype=dtype),
+            adjusted=adjusted,
+            nlags=nlags,
+            qstat=qstat,
+            fft=fft,
+            alpha=alpha,
+            bartlett_confint=bartlett_confint,
+            missing=missing,
+        )
+    if dtype == np.float32 and missing in ("none", "raise"):
+        result = _acf_batch(
+            x=as_precision(x, dtype)[np.newaxis],
+            adjusted=adjusted,
+            nlags=nlags,
+            qstat=qstat,
+            fft=fft,
+            alpha=alpha,
+            bartlett_confint=bartlett_confint,
+            missing=missing,
+        )
+        if isinstance(result, tuple):
+            return tuple(part[0] for part in result)
+        return result[0]
+    from statsmodels.tsa.stattools import acf as st_acf
+
     return st_acf(
         x=x,
         adjusted=adjusted,
@@ -38,13 +543,537 @@ def acf(
 
 @typechecked
 def pacf(
-    x: array_like, nlags: int = None, method: str = "ywadjusted", alpha: float = None
-) -> Union[np.ndarray, Tuple[Union[np.ndarray, Optional[np.ndarray]]]]:
+    x: array_like,
+    nlags: int = None,
+    method: str = "ywadjusted",
+    alpha: float = None,
+    axis: int = -1,
+    dtype: Optional[str] = None,
+) -> Union[np.ndarray, Tuple[Union[np.ndarray, Optional[np.ndarray]], ...]]:
+    """
+    Summary:
+        Calculate the partial autocorrelation function of one series, or of a whole panel of equal-length series.
+
+    Params:
+        x (array_like):
+            The time series data. Either a 1D series, or a 2D panel of series.
+        nlags (int, optional):
+            The number of lags to return. Defaults to `None`, which uses `min(10*log10(nobs), nobs//2-1)`.
+        method (str, optional):
+            The estimation method. See `statsmodels.tsa.stattools.pacf()` for the options. Defaults to `"ywadjusted"`.
+        alpha (float, optional):
+            If a number is given, also return the `1-alpha` confidence intervals. Defaults to `None`.
+        axis (int, optional):
+            For a 2D panel only, the axis along which time runs. Defaults to `-1`, meaning one series per row.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `dtype` is not a valid option.
+
+    Returns:
+        Union[np.ndarray, Tuple[Union[np.ndarray, Optional[np.ndarray]], ...]]:
+            The same outputs as `statsmodels.tsa.stattools.pacf()`.
+            For a 2D panel of `N` series, the partial autocorrelations have shape `(N, nlags+1)` and the confidence intervals `(N, nlags+1, 2)`.
+
+    ???+ Info "Details"
+        For a 2D panel, the Yule-Walker and Levinson-Durbin methods share one batched FFT autocovariance, and solve the Durbin-Levinson recursion for every series at once.
+        The Yule-Walker equations and the Durbin-Levinson recursion give the same solution, so `"yw*"` and `"ld*"` methods agree with `statsmodels` to floating point precision.
+        The `"ols*"` and `"burg"` methods are processed one row at a time.
+
+        With `dtype="float32"`, the Yule-Walker and Levinson-Durbin methods work in single precision throughout, including for a 1D series, which takes the batched path as a panel of one row. The partial autocorrelations of a stationary series are within `1e-5` of `dtype="float64"`. But the recursion amplifies the rounding of the autocovariances of a trending or random walk series, by up to `2e-3` at `20,000` points, so keep those in `float64`.
+    """
+    dtype = resolve_dtype(dtype)
+    if np.ndim(x) == 2:
+        return _pacf_batch(
+            x=_as_panel(x, axis=axis, dtype=dtype),
+            nlags=nlags,
+            method=method,
+            alpha=alpha,
+        )
+    if dtype == np.float32 and method in _PACF_ADJUSTED + _PACF_BIASED:
+        result = _pacf_batch(
+            x=as_precision(x, dtype)[np.newaxis],
+            nlags=nlags,
+            method=method,
+            alpha=alpha,
+        )
+        if isinstance(result, tuple):
+            return tuple(part[0] for part in result)
+        return result[0]
+    from statsmodels.tsa.stattools import pacf as st_pacf
+
     return st_pacf(x=x, nlags=nlags, method=method, alpha=alpha)
 
 
 @typechecked
 def ccf(
-    x: array_like, y: array_like, adjusted: bool = True, fft: bool = True
+    x: array_like,
+    y: array_like,
+    adjusted: bool = True,
+    fft: bool = True,
+    nlags: Optional[int] = None,
+    chunk_size: Optional[int] = None,
 ) -> np.ndarray:
-    return st_ccf(x=x, y=y, adjusted=adjusted, fft=fft)
+    """
+    Summary:
+        Calculate the cross-correlation function of two series.
+
+    Params:
+        x (array_like):
+            The first time series.
+        y (array_like):
+            The second time series, of the same length.
+        adjusted (bool, optional):
+            If `True`, then denominators for the cross-covariance are `n-k`, otherwise `n`. Defaults to `True`.
+        fft (bool, optional):
+            If `True`, compute the cross-covariance with an FFT. Defaults to `True`.
+        nlags (Optional[int], optional):
+            The number of lags to return, starting from lag `0`. Required when processing in chunks. Defaults to `None`, which returns every lag.
+        chunk_size (Optional[int], optional):
+            If given, process the series out-of-core, reading only this many values (plus `nlags`) at a time. Defaults to `None`, which processes `np.memmap` inputs in chunks of `2**20` values when `nlags` is given, and anything else in memory.
+
+    Raises:
+        ValueError:
+            If `chunk_size` is given, but `nlags` is not, or `x` and `y` are not 1D series of the same length.
+
+    Returns:
+        np.ndarray:
+            The same output as `statsmodels.tsa.stattools.ccf()`. The element at index `k` is the correlation of `x[t+k]` with `y[t]`.
+
+    ???+ Info "Details"
+        When processing in chunks, see `acf()`: the means and standard deviations are found in two passes, and the cross-covariances in a third, by overlap-add.
+    """
+    # Every lag needs both whole series, so without `nlags`, a memory-mapped series is read into memory rather than chunked.
+    if chunk_size is not None or nlags is not None:
+        chunk_size = resolve_chunk_size(
+            x if isinstance(x, np.memmap) else y, chunk_size
+        )
+    if chunk_size is None:
+        from statsmodels.tsa.stattools import ccf as st_ccf
+
+        return st_ccf(x=x, y=y, adjusted=adjusted, fft=fft, nlags=nlags)
+    if nlags is None:
+        raise ValueError(
+            f"The `nlags` parameter is required when processing in chunks."
+        )
+    if np.ndim(x) != 1 or np.shape(x) != np.shape(y):
+        raise ValueError(
+            f"Invalid shapes for `x` and `y`: {np.shape(x)} and {np.shape(y)}.\n"
+            f"Must be 1D series of the same length when processing in chunks."
+        )
+    x, y = np.asarray(x), np.asarray(y)
+    nlags = min(nlags, len(x))
+    ccov = _ccovf_chunked(x, y, nlags - 1, adjusted, fft, chunk_size)
+    return ccov / np.sqrt(moments(x, chunk_size)[1] * moments(y, chunk_size)[1])
+
+
+@typechecked
+def ccf_matrix(
+    x: array_like,
+    max_lag: int,
+    top_k: int = 1,
+    adjusted: bool = True,
+    fft: bool = True,
+    block: Optional[int] = None,
+    n_jobs: int = 1,
+    axis: int = -1,
+    dtype: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Summary:
+        Find the strongest cross-correlation lags between every pair of series in a panel.
+
+    Params:
+        x (array_like):
+            A 2D panel of equal-length series.
+        max_lag (int):
+            The largest lag, in either direction, to consider. Must be less than the length of the series.
+        top_k (int, optional):
+            The number of lags to keep for each pair, ranked by the absolute value of the cross-correlation. Defaults to `1`.
+        adjusted (bool, optional):
+            If `True`, the denominator for the cross-covariance at lag `k` is `nobs-|k|`, otherwise it is `nobs`. Defaults to `True`.
+        fft (bool, optional):
+            Whether to compute the cross-correlations from the spectra of the series, or directly from one matrix product per lag. The direct method is faster when `max_lag` is small relative to the length of the series. Defaults to `True`.
+        block (Optional[int], optional):
+            The number of series on each side of a block of pairs. Defaults to `None`, which keeps the working memory of each block to about 64 MiB.
+        n_jobs (int, optional):
+            The number of worker processes. Use `1` to run in the current process, or `-1` to use every core. Defaults to `1`.
+        axis (int, optional):
+            The axis along which time runs. Defaults to `-1`, meaning one series per row.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `x` is not 2D, if `max_lag`, `top_k` or `block` are out of range, or if `dtype` is not a valid option.
+
+    Returns:
+        Dict[str, np.ndarray]:
+            One entry per pair `i < j`, with the keys:
+            - `x`: The index `i` of the first series, with shape `(P,)`,
+            - `y`: The index `j` of the second series, with shape `(P,)`,
+            - `lag`: The `top_k` strongest lags, strongest first, with shape `(P, top_k)`,
+            - `ccf`: The cross-correlations at those lags, with shape `(P, top_k)`.
+
+    ???+ Info "Details"
+        For a lag `k >= 0`, the cross-correlation is `ccf(x=series[i], y=series[j])[k]`, which correlates `series[i][t+k]` with `series[j][t]`: a positive lag means that series `j` leads series `i` by `k` steps. A negative lag `-k` is `ccf(x=series[j], y=series[i])[k]`, meaning that series `i` leads series `j`.
+
+        Each series is standardised and transformed once. Every pair then costs one product of spectra and one inverse transform, and only the `2*max_lag+1` lags of interest are kept. The pairs are processed in square blocks of series, so memory stays bounded however large the panel, and only the strongest lags of each pair are returned.
+
+        With `dtype="float32"`, the spectra (which every worker holds a copy of) and the cross-correlations of each block are kept in single precision, so each block holds four times as many pairs in the same memory. The cross-correlations are within `1e-6` of `dtype="float64"`, although two lags whose strengths differ by less than that may swap places.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> import numpy as np
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline().values
+        >>> panel = np.vstack([data[3:], data[:-3], data[::-1][3:]])
+        >>> ccf_matrix(panel, max_lag=6, top_k=2)
+        {'x': array([0, 0, 1]),
+         'y': array([1, 2, 2]),
+         'lag': array([[-3, -2], [ 6,  5], [-1,  0]]),
+         'ccf': array([[ 0.9846,  0.9523], [-0.8789, -0.8755], [-0.84  , -0.8332]])}
+        ```
+    """
+    x = _as_panel(x, axis=axis, dtype=resolve_dtype(dtype))
+    nseries, nobs = x.shape
+    if not 0 <= max_lag < nobs:
+        raise ValueError(
+            f"Invalid option for `max_lag` parameter: {max_lag}.\n"
+            f"Must be between 0 and {nobs - 1}."
+        )
+    if not 1 <= top_k <= 2 * max_lag + 1:
+        raise ValueError(
+            f"Invalid option for `top_k` parameter: {top_k}.\n"
+            f"Must be between 1 and {2 * max_lag + 1}."
+        )
+    if block is not None and block < 1:
+        raise ValueError(
+            f"Invalid option for `block` parameter: {block}.\n"
+            f"Must be a positive integer."
+        )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = x - x.mean(axis=-1, keepdims=True)
+        series = series / series.std(axis=-1, keepdims=True)
+    if fft:
+        from scipy.fft import next_fast_len, rfft
+
+        nfft = next_fast_len(2 * nobs - 1, real=True)
+        series = rfft(series, n=nfft, axis=-1)
+        pair_bytes = 2 * x.itemsize * nfft
+    else:
+        nfft = 0
+        pair_bytes = x.itemsize * (2 * max_lag + 1)
+    block = block or max(1, int(np.sqrt(_CCF_BLOCK_BYTES / pair_bytes)))
+    tasks = [
+        (row, min(row + block, nseries), col, min(col + block, nseries))
+        for row in range(0, nseries, block)
+        for col in range(row, nseries, block)
+    ]
+    state = dict(
+        series=series,
+        nobs=nobs,
+        nfft=nfft,
+        max_lag=max_lag,
+        top_k=top_k,
+        adjusted=adjusted,
+    )
+
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+    results: List[Tuple[np.ndarray, ...]] = []
+    if n_jobs == 1 or len(tasks) <= 1:
+        _ccf_init(state)
+        try:
+            results = [_ccf_block(task) for task in tasks]
+        finally:
+            _CCF_STATE.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_ccf_init, initargs=(state,)
+        ) as executor:
+            chunksize = max(1, len(tasks) // (n_jobs * 4))
+            results = list(executor.map(_ccf_block, tasks, chunksize=chunksize))
+
+    if not results:
+        return {
+            "x": np.empty(0, dtype=np.intp),
+            "y": np.empty(0, dtype=np.intp),
+            "lag": np.empty((0, top_k), dtype=np.intp),
+            "ccf": np.empty((0, top_k), dtype=x.dtype),
+        }
+    first, second, lag, corr = (np.concatenate(parts) for parts in zip(*results))
+    order = np.lexsort((second, first))
+    return {
+        "x": first[order],
+        "y": second[order],
+        "lag": lag[order],
+        "ccf": corr[order],
+    }
+
+
+# ------------------------------------------------------------------------------#
+# Streaming                                                                  ####
+# ------------------------------------------------------------------------------#
+
+
+class OnlineACF:
+    """
+    Summary:
+        Maintain the autocorrelation function of a live series, as new values arrive.
+
+    Params:
+        nlags (int):
+            The number of lags to track.
+        window (Optional[int], optional):
+            If given, only the most recent `window` values are used. Must be greater than `nlags`. Defaults to `None`.
+        forgetting (Optional[float], optional):
+            If given, a forgetting factor in `(0, 1)`. Each value is down-weighted by this factor for every value that arrives after it. Cannot be combined with `window`. Defaults to `None`.
+        diff (bool, optional):
+            Whether or not to track the differences of the incoming values, rather than the values themselves. Use `True` to reproduce the default behaviour of `qs()`. Defaults to `False`.
+
+    Raises:
+        ValueError:
+            If `nlags`, `window` or `forgetting` are invalid.
+
+    ???+ Info "Details"
+        Only running sums are stored: the sum of the values, the sum of the lagged cross-products `x[t]*x[t-k]` for every `k <= nlags`, and the first and last `nlags` values (or the last `window` values, or the weighted lead and lag sums for every `k`).
+        Memory is therefore constant however long the history gets, and each new value costs `O(nlags)`.
+
+        Without a `window` or a `forgetting` factor, `acf()` is identical to `acf(x=history, nlags=nlags)` on the full history.
+        With a `window`, it is identical to the same call on the last `window` values.
+        With a `forgetting` factor, every term of the same estimator is weighted by `forgetting**age`, where `age` is the number of values which arrived after `x[t]`. The effective number of observations tends to `1/(1-forgetting)`.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> online = OnlineACF(nlags=24, diff=True)
+        >>> for start in range(0, len(data), 12):
+        ...     online.update(data.values[start : start + 12])
+        >>> online.qs(freq=12)
+        {'stat': 194.4692892087745,
+         'Pval': 5.90922325801522e-43,
+         'test': 'QS',
+         'model': None}
+        ```
+    """
+
+    def __init__(
+        self,
+        nlags: int,
+        window: Optional[int] = None,
+        forgetting: Optional[float] = None,
+        diff: bool = False,
+    ) -> None:
+        if nlags < 1:
+            raise ValueError(f"Invalid value for `nlags`: {nlags}. Must be `>=1`.")
+        if window is not None and window <= nlags:
+            raise ValueError(
+                f"Invalid value for `window`: {window}. Must be greater than `nlags` ({nlags})."
+            )
+        if forgetting is not None and not 0 < forgetting < 1:
+            raise ValueError(
+                f"Invalid value for `forgetting`: {forgetting}. Must be in `(0, 1)`."
+            )
+        if window is not None and forgetting is not None:
+            raise ValueError(
+                f"The `window` and `forgetting` parameters cannot be used together."
+            )
+        self.nlags = nlags
+        self.window = window
+        self.forgetting = forgetting
+        self.diff = diff
+        self.n = 0
+        self._shift = None
+        self._last = None
+        self._sum = 0.0
+        self._weight = 0.0
+        self._products = np.zeros(nlags + 1)
+        self._leads = np.zeros(nlags + 1)
+        self._lags = np.zeros(nlags + 1)
+        self._lag_weights = np.zeros(nlags + 1)
+        self._head = np.empty(0)
+        self._keep = window or nlags
+        self._buffer = np.empty(2 * self._keep)
+        self._start = self._end = 0
+
+    @property
+    def nobs(self) -> float:
+        """
+        The number of observations behind the current estimate. For a `forgetting` factor, this is the effective number of observations.
+        """
+        if self.forgetting is not None:
+            return self._weight
+        return min(self.n, self.window) if self.window else self.n
+
+    def _tail(self) -> np.ndarray:
+        return self._buffer[self._start : self._end]
+
+    def _append(self, values: np.ndarray) -> None:
+        # A ring buffer of twice the needed length, compacted only when full, so appending costs amortised `O(1)` per value.
+        if len(values) >= self._keep:
+            self._buffer[: self._keep] = values[-self._keep :]
+            self._start, self._end = 0, self._keep
+            return
+        if self._end + len(values) > len(self._buffer):
+            retained = self._tail()[len(values) - self._keep :].copy()
+            self._buffer[: len(retained)] = retained
+            self._start, self._end = 0, len(retained)
+        self._buffer[self._end : self._end + len(values)] = values
+        self._end += len(values)
+        self._start = max(self._start, self._end - self._keep)
+
+    def update(self, values: array_like) -> "OnlineACF":
+        """
+        Summary:
+            Add one or more new values to the end of the series.
+
+        Params:
+            values (array_like):
+                The new value, or a batch of new values, in time order.
+
+        Raises:
+            ValueError:
+                If any of the values are `NaN`.
+
+        Returns:
+            OnlineACF:
+                The updated accumulator, to allow chaining.
+        """
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64)).ravel()
+        if np.isnan(values).any():
+            raise ValueError("NaNs were encountered in the data")
+        if self.diff:
+            if self._last is None:
+                self._last, values = values[0], values[1:]
+            if len(values) == 0:
+                return self
+            values, self._last = np.diff(values, prepend=self._last), values[-1]
+        if len(values) == 0:
+            return self
+        if self._shift is None:
+            # The ACF does not depend on the level of the series, so shift it to keep the running sums small and precise.
+            self._shift = values[0]
+        values = values - self._shift
+
+        # Only the values which leave the window, and the last `nlags` values, are ever touched.
+        tail = self._tail()
+        old = len(tail)
+        recent = tail[max(0, old - self.nlags) :]
+        ext = np.concatenate([recent, values])
+        offset = old - len(recent)
+        cut = 0
+        if self.window is not None:
+            cut = max(0, old + len(values) - self.window)
+            removed = min(cut, old)
+            for lag in range(self.nlags + 1):
+                size = min(removed, old - lag)
+                if size > 0:
+                    self._products[lag] -= tail[:size].dot(tail[lag : lag + size])
+            self._sum -= tail[:removed].sum() + values[: max(0, cut - old)].sum()
+
+        if self.forgetting is not None:
+            decay = self.forgetting ** np.arange(len(values) - 1, -1, -1)
+            self._sum = self.forgetting ** len(values) * self._sum + decay.dot(values)
+            self._weight = self.forgetting ** len(values) * self._weight + decay.sum()
+            self._products *= self.forgetting ** len(values)
+            self._leads *= self.forgetting ** len(values)
+            self._lags *= self.forgetting ** len(values)
+            self._lag_weights *= self.forgetting ** len(values)
+        else:
+            self._sum += values.sum()
+            decay = None
+
+        for lag in range(self.nlags + 1):
+            first = max(len(recent), cut - offset + lag, lag)
+            if first >= len(ext):
+                continue
+            products = ext[first:] * ext[first - lag : len(ext) - lag]
+            if decay is not None:
+                weights = decay[first - len(recent) :]
+                products = products * weights
+                self._leads[lag] += weights.dot(ext[first:])
+                self._lags[lag] += weights.dot(ext[first - lag : len(ext) - lag])
+                self._lag_weights[lag] += weights.sum()
+            self._products[lag] += products.sum()
+
+        if self.window is None and len(self._head) < self.nlags:
+            self._head = np.concatenate([self._head, values])[: self.nlags]
+        self.n += len(values)
+        self._append(values)
+        return self
+
+    def acf(self) -> np.ndarray:
+        """
+        Summary:
+            The autocorrelation function of the series so far.
+
+        Raises:
+            ValueError:
+                If fewer than `nlags+1` values have been seen, or if the series is constant.
+
+        Returns:
+            np.ndarray:
+                The autocorrelations at lags `0` to `nlags`.
+        """
+        nobs = self.nobs
+        if min(self.n, self.window or self.n) <= self.nlags:
+            raise ValueError(
+                f"At least `nlags+1` ({self.nlags + 1}) observations are needed, but only {self.n} have been seen."
+            )
+        lags = np.arange(self.nlags + 1)
+        if self.forgetting is not None:
+            mean = self._sum / self._weight
+            acov = (
+                self._products
+                - mean * (self._leads + self._lags)
+                + mean**2 * self._lag_weights
+            ) / self._weight
+        else:
+            mean = self._sum / nobs
+            tail = self._tail()
+            head = tail[: self.nlags] if self.window else self._head
+            head_sums = np.concatenate([[0.0], np.cumsum(head)])
+            tail_sums = np.concatenate([[0.0], np.cumsum(tail[::-1][: self.nlags])])
+            acov = (
+                self._products
+                - mean * (2 * self._sum - head_sums - tail_sums)
+                + (nobs - lags) * mean**2
+            ) / nobs
+        if acov[0] <= 0:
+            raise ValueError(f"The autocorrelation of a constant series is undefined.")
+        return acov / acov[0]
+
+    def qs(self, freq: int) -> Dict[str, Union[str, float, None]]:
+        """
+        Summary:
+            The `QS` seasonality test statistic for the series so far.
+
+        Params:
+            freq (int):
+                The frequency of the time series. Both `freq` and `2*freq` must be tracked, so `2*freq <= nlags`.
+
+        Raises:
+            ValueError:
+                If `freq` is too small, or `2*freq` is greater than `nlags`.
+
+        Returns:
+            Dict[str, Union[str, float, None]]:
+                The same dictionary as `qs()`, with `model` always `None`.
+        """
+        if freq < 2 or 2 * freq > self.nlags:
+            raise ValueError(
+                f"Invalid value for `freq`: {freq}. Must be between `2` and `nlags/2` ({self.nlags // 2})."
+            )
+        rho = self.acf()[[freq, 2 * freq]]
+        rho = np.array([0, 0]) if any(rho <= 0) else rho
+        N = self.nobs
+        QS = N * (N + 2) * (rho[0] ** 2 / (N - freq) + rho[1] ** 2 / (N - freq * 2))
+        from scipy.stats import chi2
+
+        return {"stat": QS, "Pval": chi2.sf(QS, 2), "test": "QS", "model": None}
@@ -0,0 +1,251 @@
+"""
+Compute many statistics of one time series in a single call, sharing every intermediate result between them.
+
+Calling each public function in turn repeats a lot of work: the differences and `NaN` masks of `qs()`, the standard deviation of `is_regular()`, the `STL` decomposition behind each of the strength features, and the tiles behind both `stability()` and `lumpiness()`.
+Here, each statistic declares the intermediates it depends on. `profile()` walks that small dependency graph, computes every intermediate which is needed exactly once, and never computes one which is not needed by any requested statistic.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.correlation import acf, pacf
+from src.regularity import entropy
+from src.seasonality import _get_stlfit, _get_stlvar, _qs_stat
+from src.seasonality import _seasonal_strength, _spikiness, _trend_strength
+from src.seasonality import ch, ocsb
+from src.stability import _tile_width
+from src.utils.checks import array_like, typechecked
+from src.utils.kernels import _tile_stats, _tile_variance
+from src.utils.prepared import PreparedSeries, prepare
+
+
+__all__ = ["profile"]
+
+
+# ------------------------------------------------------------------------------#
+# Graph                                                                      ####
+# ------------------------------------------------------------------------------#
+
+
+# Every node of the graph: its name, the names of the nodes it depends on, and a function of `freq` and the values of those dependencies.
+_GRAPH: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = {}
+
+
+def _node(name: str, *depends: str) -> Callable[[Callable], Callable]:
+    def register(func: Callable) -> Callable:
+        _GRAPH[name] = (depends, func)
+        return func
+
+    return register
+
+
+def _resolve(name: str, freq: int, values: Dict[str, Any]) -> Any:
+    if name not in values:
+        depends, func = _GRAPH[name]
+        values[name] = func(freq, *(_resolve(dep, freq, values) for dep in depends))
+    return values[name]
+
+
+# ------------------------------------------------------------------------------#
+# Intermediates                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+@_node("values", "series")
+def _values(freq: int, series: PreparedSeries) -> np.ndarray:
+    return series.values
+
+
+@_node("diff", "values")
+def _diff(freq: int, values: np.ndarray) -> np.ndarray:
+    diff = np.diff(values)
+    return diff[~np.isnan(diff)]
+
+
+@_node("diff_acf", "diff")
+def _diff_acf(freq: int, diff: np.ndarray) -> np.ndarray:
+    return acf(x=diff, lags=[freq, 2 * freq])
+
+
+@_node("stlfit", "series")
+def _stlfit(freq: int, series: PreparedSeries) -> Optional[Dict[str, Any]]:
+    # Like `seasonal_strength()` and `trend_strength()`, skip the decomposition when there is no seasonal period.
+    return _get_stlfit(x=series, m=freq) if freq > 1 else None
+
+
+@_node("stlvar", "series", "stlfit")
+def _stlvar(
+    freq: int, series: PreparedSeries, stlfit: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, np.ndarray]]:
+    return None if stlfit is None else _get_stlvar(x=series, m=freq, stlfit=stlfit)
+
+
+@_node("tile_means", "values")
+def _tile_means(freq: int, values: np.ndarray) -> np.ndarray:
+    return _tile_stats(values, _tile_width(freq), "mean")
+
+
+@_node("tile_vars", "values")
+def _tile_vars(freq: int, values: np.ndarray) -> np.ndarray:
+    return _tile_stats(values, _tile_width(freq), "var")
+
+
+# ------------------------------------------------------------------------------#
+# Statistics                                                                 ####
+# ------------------------------------------------------------------------------#
+
+
+@_node("acf", "values")
+def _acf(freq: int, values: np.ndarray) -> np.ndarray:
+    return acf(x=values)
+
+
+@_node("pacf", "values")
+def _pacf(freq: int, values: np.ndarray) -> np.ndarray:
+    return pacf(x=values)
+
+
+@_node("entropy", "values")
+def _entropy(freq: int, values: np.ndarray) -> float:
+    return entropy(x=values)
+
+
+@_node("is_regular", "series", "entropy")
+def _is_regular(freq: int, series: PreparedSeries, value: float) -> Dict[str, Any]:
+    tolerance = 0.2 * np.std(series.values)
+    return {"result": value < tolerance, "entropy": value, "tolerance": tolerance}
+
+
+@_node("qs", "series", "diff", "diff_acf")
+def _qs(freq: int, series: PreparedSeries, diff: np.ndarray, rho: np.ndarray) -> Dict:
+    if freq < 2:
+        raise AttributeError(
+            f"The number of observations per cycle is '{freq}', which is too small."
+        )
+    if np.var(diff) == 0:
+        raise ValueError(
+            f"The Series is a constant (possibly after transformations)."
+            f"QS-Test cannot be computed on constants."
+        )
+    stat, pval = _qs_stat(rho[0], rho[1], N=len(diff), freq=freq)
+    return {"stat": stat, "Pval": pval, "test": "QS", "model": None}
+
+
+@_node("ocsb", "values")
+def _ocsb(freq: int, values: np.ndarray) -> int:
+    return ocsb(x=values, m=freq)
+
+
+@_node("ch", "values")
+def _ch(freq: int, values: np.ndarray) -> int:
+    return ch(x=values, m=freq)
+
+
+@_node("seasonal_strength", "stlvar")
+def _seasonal(freq: int, stlvar: Optional[Dict[str, np.ndarray]]) -> float:
+    return 0 if stlvar is None else _seasonal_strength(stlvar)
+
+
+@_node("trend_strength", "stlvar")
+def _trend(freq: int, stlvar: Optional[Dict[str, np.ndarray]]) -> float:
+    return 0 if stlvar is None else _trend_strength(stlvar)
+
+
+@_node("spikiness", "series", "stlfit")
+def _spiky(freq: int, series: PreparedSeries, stlfit: Optional[Dict]) -> float:
+    stlfit = stlfit or _get_stlfit(x=series, m=freq)
+    return _spikiness(stlfit=stlfit)
+
+
+@_node("stability", "values", "tile_means")
+def _stability(freq: int, values: np.ndarray, means: np.ndarray) -> float:
+    return _tile_variance(values, _tile_width(freq), means)
+
+
+@_node("lumpiness", "values", "tile_vars")
+def _lumpiness(freq: int, values: np.ndarray, variances: np.ndarray) -> float:
+    return _tile_variance(values, _tile_width(freq), variances)
+
+
+STATISTICS = [
+    "acf",
+    "pacf",
+    "entropy",
+    "is_regular",
+    "qs",
+    "ocsb",
+    "ch",
+    "seasonal_strength",
+    "trend_strength",
+    "spikiness",
+    "stability",
+    "lumpiness",
+]
+
+# The statistics which need a seasonal period, so are left out by default when `freq < 2`.
+_SEASONAL = ["qs", "ocsb", "ch", "seasonal_strength", "trend_strength", "spikiness"]
+
+
+# ------------------------------------------------------------------------------#
+# Profile                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+@typechecked
+def profile(
+    x: array_like,
+    freq: int = 1,
+    include: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Summary:
+        Compute the statistics of the `correlation`, `regularity`, `seasonality` and `stability` modules for one series, sharing every intermediate result between them.
+
+    Params:
+        x (array_like):
+            The univariate time series data.
+        freq (int, optional):
+            The frequency of the time series data. Passed as `freq` or `m` to every statistic which takes one. Defaults to `1`.
+        include (Optional[Sequence[str]], optional):
+            The names of the statistics to compute, from `STATISTICS`. Any intermediate result which is only needed by other statistics is skipped. Defaults to `None`, which computes all of them (except the seasonal statistics, when `freq < 2`).
+
+    Raises:
+        ValueError:
+            If any of the names in `include` are not recognised.
+
+    Returns:
+        Dict[str, Any]:
+            The value of each statistic, keyed by name, in the order requested. Each is the same as calling the public function of the same name with its default parameters, and `x` and `freq` (or `m`):
+            - `acf`, `pacf`: from the `correlation` module,
+            - `entropy`, `is_regular`: from the `regularity` module,
+            - `qs`, `ocsb`, `ch`, `seasonal_strength`, `trend_strength`, `spikiness`: from the `seasonality` module,
+            - `stability`, `lumpiness`: from the `stability` module.
+
+    ???+ Info "Details"
+        The shared intermediates are: the validated series (see `PreparedSeries`), its `NaN`-free differences and their seasonal autocorrelations (for `qs`), one `STL` decomposition (for the three strength features), and the tile means and variances (for `stability` and `lumpiness`).
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> profile(x=data, freq=12, include=["qs", "seasonal_strength", "stability"])
+        {'qs': {'stat': 194.46928920877446,
+          'Pval': 5.909223258015391e-43,
+          'test': 'QS',
+          'model': None},
+         'seasonal_strength': 0.9815304216549953,
+         'stability': 13428.672295875418}
+        ```
+    """
+    if include is None:
+        include = [name for name in STATISTICS if freq >= 2 or name not in _SEASONAL]
+    invalid = [name for name in include if name not in STATISTICS]
+    if invalid:
+        raise ValueError(
+            f"Invalid option for `include` parameter: {invalid}.\n"
+            f"Valid options are: {STATISTICS}."
+        )
+    values: Dict[str, Any] = {"series": prepare(x)}
+    return {name: _resolve(name, freq, values) for name in include}
@@ -8,36 +8,258 @@ As quoted from: https://www.machinelearningplus.com/time-series/time-series-anal
 >   Sample Entropy is similar to approximate entropy but is more consistent in estimating the complexity even for smaller time series.
 >   For example, a random time series with fewer data points can have a lower 'approximate entropy' than a more 'regular' time series, whereas, a longer random time series will have a higher 'approximate entropy'.
 
-As such, the [`antropy`](https://raphaelvallat.com/antropy/build/html/index.html) package will be used to calculate these values
+The values are calculated by a native engine, which gives the same results as the [`antropy`](https://raphaelvallat.com/antropy/build/html/index.html) package, but scales to much longer series.
+For any metric other than `"chebyshev"`, or when `engine="antropy"`, the calculation is delegated to `antropy` directly.
 """
 
-from typing import Union
-from antropy import app_entropy as a_app_entropy, sample_entropy as a_sample_entropy
+from functools import partial
+from importlib.util import find_spec
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 import numpy as np
-from statsmodels.tools.validation import array_like
-from typeguard import typechecked
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
+from src.utils.cache import disk_cached
+from src.utils.checks import array_like, typechecked
+from src.utils.precision import as_precision, resolve_dtype
+from src.utils.prepared import unwrap
+from src.utils.resampling import pvalue, resample_statistic
+from src.utils.results import RegularityResult
 
-__all__ = ["entropy", "is_regular"]
 
+__all__ = ["entropy", "entropy_profile", "multiscale_entropy", "is_regular"]
 
-def approx_entropy(x: array_like, order: int = 2, metric: str = "chebyshev") -> float:
-    return a_app_entropy(x=x, order=order, metric=metric)
 
+ENGINES = ["native", "antropy"]
+# A block bootstrap keeps the short patterns which entropy measures, so is no use as the null of `is_regular()`.
+REGULARITY_RESAMPLE_METHODS = ["permutation", "phase"]
 
-def sample_entropy(x: array_like, order: int = 2, metric: str = "chebyshev") -> float:
-    return a_sample_entropy(x=x, order=order, metric=metric)
 
+# ------------------------------------------------------------------------------#
+# Native engine                                                              ####
+# ------------------------------------------------------------------------------#
 
+
+def _embed(x: np.ndarray, order: int) -> np.ndarray:
+    if order < 1 or order >= len(x):
+        raise ValueError(
+            f"Invalid value for `order`: {order}. Must be between `1` and `len(x)-1`."
+        )
+    return sliding_window_view(x, order)
+
+
+def _default_tolerance(x: np.ndarray) -> float:
+    return 0.2 * np.std(x, ddof=0)
+
+
+# The most matching pairs of templates to hold in memory at once (two `int64` indices each).
+_PAIR_BUDGET = 2_000_000
+
+
+def _template_counts(templates: np.ndarray, r: float) -> np.ndarray:
+    # The number of templates within `r` of each template (including itself).
+    # `sklearn` answers these count queries about twice as fast as `scipy`, but is optional, since it only comes with `sktime`.
+    if find_spec("sklearn") is None:
+        from scipy.spatial import cKDTree
+
+        tree = cKDTree(templates, balanced_tree=False)
+        return tree.query_ball_point(templates, r, p=np.inf, return_length=True)
+    from sklearn.neighbors import KDTree
+
+    return KDTree(templates, metric="chebyshev").query_radius(
+        templates, r, count_only=True
+    )
+
+
+def _match_counts(
+    x: np.ndarray, dims: Sequence[int], r: float, per_template: bool
+) -> Dict[int, Union[np.ndarray, Tuple[int, int]]]:
+    # Count the templates within `r` of each other, at every embedding dimension in `dims`.
+    # With `per_template`, return the number of matches of every template (including itself).
+    # Otherwise, return the number of matching pairs of distinct templates, first among all templates, then among all but the last one.
+    # While there are many matches, a KD-tree counts them without listing them. Once there are few enough to hold in memory, the matching pairs are listed once, and every higher dimension just filters that list on one extra coordinate, because a match at dimension `d+1` must also be a match at dimension `d`.
+    from scipy.spatial import cKDTree
+
+    counts, pairs = {}, None
+    for dim in range(min(dims), max(dims) + 1):
+        n_templates = len(x) - dim + 1
+        if pairs is not None:
+            i, j = pairs[:, 0], pairs[:, 1]
+            keep = np.maximum(i, j) < n_templates
+            keep[keep] = np.abs(x[i[keep] + dim - 1] - x[j[keep] + dim - 1]) <= r
+            pairs = pairs[keep]
+            if dim not in dims:
+                continue
+            if per_template:
+                counts[dim] = 1 + np.bincount(pairs.ravel(), minlength=n_templates)
+            else:
+                last = np.count_nonzero(pairs[:, 1] == n_templates - 1)
+                counts[dim] = (len(pairs), len(pairs) - last)
+            continue
+        if dim not in dims:
+            continue
+        templates = _embed(x, dim)
+        if per_template:
+            counts[dim] = _template_counts(templates, r)
+            total = (int(counts[dim].sum()) - n_templates) // 2
+            tree = None
+        else:
+            tree = cKDTree(templates, balanced_tree=False)
+            total = (int(tree.count_neighbors(tree, r, p=np.inf)) - n_templates) // 2
+            last = tree.query_ball_point(templates[-1], r, p=np.inf, return_length=True)
+            counts[dim] = (total, total - (int(last) - 1))
+        if total <= _PAIR_BUDGET and dim < max(dims):
+            if tree is None:
+                tree = cKDTree(templates, balanced_tree=False)
+            pairs = tree.query_pairs(r, p=np.inf, output_type="ndarray")
+    return counts
+
+
+def _pair_counts(
+    x: np.ndarray, dims: Sequence[int], r: float
+) -> Dict[int, Tuple[int, int]]:
+    # Sample entropy counts matches strictly closer than `r`.
+    return _match_counts(x=x, dims=dims, r=np.nextafter(r, -np.inf), per_template=False)
+
+
+def _phis(x: np.ndarray, dims: Sequence[int], r: float) -> Dict[int, float]:
+    # For each embedding dimension, the mean log-proportion of templates within `r` of every template.
+    counts = _match_counts(x=x, dims=dims, r=r, per_template=True)
+    return {dim: np.mean(np.log(count / len(count))) for dim, count in counts.items()}
+
+
+def _sample_entropy_from_counts(
+    counts: Dict[int, Tuple[int, int]], order: int
+) -> float:
+    # Sample entropy compares the `n-order` templates of length `order` and `order+1`, so the last length-`order` template is left out.
+    matches, matches_next = counts[order][1], counts[order + 1][0]
+    if matches == 0:
+        return np.nan
+    if matches_next == 0:
+        return np.inf
+    return -np.log(matches_next / matches)
+
+
+def _native_sample_entropy(x: np.ndarray, order: int, r: float) -> float:
+    counts = _pair_counts(x=x, dims=[order, order + 1], r=r)
+    return _sample_entropy_from_counts(counts=counts, order=order)
+
+
+def _native_approx_entropy(x: np.ndarray, order: int, r: float) -> float:
+    phis = _phis(x=x, dims=[order, order + 1], r=r)
+    return np.subtract(phis[order], phis[order + 1])
+
+
+def _coarse_grain(cumsum: np.ndarray, scale: int) -> np.ndarray:
+    length = (len(cumsum) - 1) // scale * scale
+    return (cumsum[scale : length + 1 : scale] - cumsum[0:length:scale]) / scale
+
+
+def _validate_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Invalid option for `engine` parameter: {engine}.\n"
+            f"Valid options are: {ENGINES}."
+        )
+
+
+# ------------------------------------------------------------------------------#
+# Entropy                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+def approx_entropy(
+    x: array_like, order: int = 2, metric: str = "chebyshev", engine: str = "native"
+) -> float:
+    _validate_engine(engine)
+    if engine == "native" and metric == "chebyshev":
+        x = np.asarray(x, dtype=np.float64)
+        return _native_approx_entropy(x=x, order=order, r=_default_tolerance(x))
+    # `antropy` compiles its `numba` kernels when it is imported, which takes several seconds.
+    from antropy import app_entropy as a_app_entropy
+
+    return a_app_entropy(x=unwrap(x), order=order, metric=metric)
+
+
+def sample_entropy(
+    x: array_like, order: int = 2, metric: str = "chebyshev", engine: str = "native"
+) -> float:
+    _validate_engine(engine)
+    if engine == "native" and metric == "chebyshev":
+        x = np.asarray(x, dtype=np.float64)
+        return _native_sample_entropy(x=x, order=order, r=_default_tolerance(x))
+    from antropy import sample_entropy as a_sample_entropy
+
+    return a_sample_entropy(x=unwrap(x), order=order, metric=metric)
+
+
+@disk_cached
 def entropy(
-    x: array_like, order: int = 2, metric: str = "chebyshev", algorithm: str = "sample"
+    x: array_like,
+    order: int = 2,
+    metric: str = "chebyshev",
+    algorithm: str = "sample",
+    engine: str = "native",
+    dtype: Optional[str] = None,
 ) -> float:
+    """
+    Summary:
+        Calculate the sample entropy or approximate entropy of a univariate time series.
+
+    Params:
+        x (array_like):
+            The time series data.
+        order (int, optional):
+            The embedding dimension. Defaults to `2`.
+        metric (str, optional):
+            The distance metric between templates. Defaults to `"chebyshev"`.
+        algorithm (str, optional):
+            Either `"sample"` or `"approx"` (or any of their aliases). Defaults to `"sample"`.
+        engine (str, optional):
+            Either `"native"` or `"antropy"`. Defaults to `"native"`.
+        dtype (Optional[str], optional):
+            The floating point precision of the series, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `algorithm`, `engine` or `dtype` are not valid options.
+
+    Returns:
+        float:
+            The entropy value.
+
+    ???+ Info "Details"
+        The tolerance `r` is `0.2*std(x)`, as in `antropy`.
+
+        The `"native"` engine embeds the series into templates, then counts matching templates with a KD-tree under the Chebyshev metric.
+        Sample entropy uses a dual-tree traversal, which counts entire blocks of matching templates at once without listing the pairs, and approximate entropy uses one count query per template.
+        Once the matches at length `order` are few enough to hold in memory, they are listed once, and the matches at length `order+1` are found by checking one extra coordinate of each, rather than searching again.
+        Memory is bounded by the series length and a fixed budget of listed pairs, and run time grows well below the quadratic cost of comparing every pair of templates (roughly `n^1.5` on white noise), which makes series of `10^6` points practical.
+        Run `python -m src.tests.benchmarks.bench_regularity` to measure the scaling on your own machine.
+        Templates whose distance is exactly `r` are treated as non-matching for sample entropy, as in the `antropy` `numba` kernel, and as matching for approximate entropy, as in the `antropy` KD-tree code.
+
+        The native engine only supports the `"chebyshev"` metric. For any other metric, `antropy` is used.
+
+        The KD-trees of both engines only work in `float64`. So with `dtype="float32"`, the series is centred on its mean and rounded to single precision, and then upcast just before the templates are counted. The result is the exact entropy of the rounded series, which is what `is_regular()` compares against its single precision surrogates.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> entropy(x=data, algorithm="sample")
+        0.6177074729583698
+        >>> entropy(x=data, algorithm="approx")
+        0.6451264780416452
+        ```
+    """
     sampl_options = ["sample", "sampl", "samp"]
     aprox_options = ["app", "aprox", "approx"]
+    x = as_precision(unwrap(x), resolve_dtype(dtype))
     if algorithm in sampl_options:
-        return sample_entropy(x=x, order=order, metric=metric)
+        return sample_entropy(x=x, order=order, metric=metric, engine=engine)
     elif algorithm in aprox_options:
-        return approx_entropy(x=x, order=order, metric=metric)
+        return approx_entropy(x=x, order=order, metric=metric, engine=engine)
     else:
         raise ValueError(
             f"Invalid option for `algorithm` parameter: {algorithm}.\n"
@@ -46,6 +268,145 @@ def entropy(
         )
 
 
+def entropy_profile(
+    x: array_like,
+    orders: Sequence[int] = (2,),
+    scales: Sequence[int] = (1,),
+    algorithm: str = "sample",
+    tolerance: Union[float, None] = None,
+) -> pd.DataFrame:
+    """
+    Summary:
+        Calculate the entropy of a univariate time series over several embedding orders and coarse-graining scales at once.
+
+    Params:
+        x (array_like):
+            The time series data.
+        orders (Sequence[int], optional):
+            The embedding dimensions. Defaults to `(2,)`.
+        scales (Sequence[int], optional):
+            The coarse-graining scales. At scale `s`, the series is replaced by the means of its consecutive, non-overlapping windows of length `s`. Scale `1` is the original series. Defaults to `(1,)`.
+        algorithm (str, optional):
+            Either `"sample"` or `"approx"` (or any of their aliases). Defaults to `"sample"`.
+        tolerance (Union[float, None], optional):
+            The tolerance `r`. Defaults to `None`, which uses `0.2*std(x)` of the original series at every scale.
+
+    Raises:
+        ValueError:
+            If `algorithm` is not a valid option.
+
+    Returns:
+        pd.DataFrame:
+            The entropy values, with one row per scale and one column per order. Any scale which leaves too few points for an order is `NaN`.
+
+    ???+ Info "Details"
+        Looping over `entropy()` repeats the same work for every combination. Here:
+        - The running sum of the series is computed once, and every coarse-grained series is read off it,
+        - The templates at every embedding dimension are views of the same coarse-grained array, and
+        - Each embedding dimension is counted only once per scale. For sample entropy, the matches of length `m+1` are the numerator for order `m` and the denominator for order `m+1`, so orders `2..5` need five KD-tree counts instead of eight.
+
+        At scale `1` with the default tolerance, the values are identical to `entropy()` with the native engine.
+        The tolerance is fixed from the original series, following the multiscale entropy method of Costa et al. (2002).
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> entropy_profile(x=data, orders=[2, 3], scales=[1, 2])
+        order         2         3
+        scale
+        1      0.617707  0.579818
+        2      0.325422  0.330241
+        ```
+    """
+    sampl_options = ["sample", "sampl", "samp"]
+    aprox_options = ["app", "aprox", "approx"]
+    if algorithm not in sampl_options + aprox_options:
+        raise ValueError(
+            f"Invalid option for `algorithm` parameter: {algorithm}.\n"
+            f"For running the 'Sample Entropy' algorithm, use one of: {sampl_options}.\n"
+            f"Fur running the 'Approximate Entropy' algorithm, use one of: {aprox_options}. "
+        )
+    x = np.asarray(x, dtype=np.float64)
+    r = _default_tolerance(x) if tolerance is None else tolerance
+    cumsum = np.concatenate([[0.0], np.cumsum(x)])
+    values = np.full((len(scales), len(orders)), np.nan)
+    for row, scale in enumerate(scales):
+        y = x if scale == 1 else _coarse_grain(cumsum=cumsum, scale=scale)
+        valid = [order for order in orders if order + 1 < len(y)]
+        if not valid:
+            continue
+        dims = [dim for order in valid for dim in (order, order + 1)]
+        if algorithm in sampl_options:
+            counts = _pair_counts(x=y, dims=dims, r=r)
+            results = {o: _sample_entropy_from_counts(counts, o) for o in valid}
+        else:
+            phis = _phis(x=y, dims=dims, r=r)
+            results = {o: phis[o] - phis[o + 1] for o in valid}
+        for col, order in enumerate(orders):
+            values[row, col] = results.get(order, np.nan)
+    return pd.DataFrame(
+        values,
+        index=pd.Index(scales, name="scale"),
+        columns=pd.Index(orders, name="order"),
+    )
+
+
+def multiscale_entropy(
+    x: array_like,
+    scales: Sequence[int] = tuple(range(1, 11)),
+    order: int = 2,
+    tolerance: Union[float, None] = None,
+) -> np.ndarray:
+    """
+    Summary:
+        Calculate the multiscale sample entropy of a univariate time series.
+
+    Params:
+        x (array_like):
+            The time series data.
+        scales (Sequence[int], optional):
+            The coarse-graining scales. Defaults to `1` to `10`.
+        order (int, optional):
+            The embedding dimension. Defaults to `2`.
+        tolerance (Union[float, None], optional):
+            The tolerance `r`. Defaults to `None`, which uses `0.2*std(x)` of the original series at every scale.
+
+    Returns:
+        np.ndarray:
+            The sample entropy at each scale.
+
+    ???+ Info "Details"
+        This is a shortcut for a single order of `entropy_profile()`.
+    """
+    profile = entropy_profile(
+        x=x, orders=[order], scales=scales, algorithm="sample", tolerance=tolerance
+    )
+    return profile[order].to_numpy()
+
+
+def _entropy_rows(
+    panel: np.ndarray, order: int, metric: str, algorithm: str, engine: str
+) -> np.ndarray:
+    # The entropy of every row of a panel of surrogates, at the precision of the panel, skipping the disk cache.
+    func = entropy.__wrapped__
+    return np.array(
+        [
+            func(
+                row,
+                order=order,
+                metric=metric,
+                algorithm=algorithm,
+                engine=engine,
+                dtype=panel.dtype.name,
+            )
+            for row in panel
+        ]
+    )
+
+
+@disk_cached
 @typechecked
 def is_regular(
     x: array_like,
@@ -53,7 +414,20 @@ def is_regular(
     metric: str = "chebyshev",
     algorithm: str = "sample",
     tolerance: Union[str, float, None] = "default",
-):
+    engine: str = "native",
+    result_object: bool = False,
+    resample: Optional[str] = None,
+    n_resamples: int = 999,
+    seed: Optional[int] = None,
+    n_jobs: int = 1,
+    dtype: Optional[str] = None,
+) -> Union[Dict[str, Any], RegularityResult]:
+    dtype = resolve_dtype(dtype).name
+    if resample is not None and resample not in REGULARITY_RESAMPLE_METHODS:
+        raise ValueError(
+            f"Invalid option for `resample` parameter: {resample}.\n"
+            f"Valid options are: {REGULARITY_RESAMPLE_METHODS}."
+        )
     if isinstance(tolerance, (float, int)):
         pass
     elif tolerance in ["default", None]:
@@ -66,6 +440,38 @@ def is_regular(
             f"- String with value `default`,\n"
             f"- The value `None`."
         )
-    value = entropy(x=x, order=order, metric=metric, algorithm=algorithm)
+    value = entropy(
+        x=x,
+        order=order,
+        metric=metric,
+        algorithm=algorithm,
+        engine=engine,
+        dtype=dtype,
+    )
     result = True if value < tolerance else False
-    return {"result": result, "entropy": value, "tolerance": tolerance}
+    if resample is None:
+        if result_object:
+            return RegularityResult(result=result, entropy=value, tolerance=tolerance)
+        return {"result": result, "entropy": value, "tolerance": tolerance}
+
+    # A regular series has a lower entropy than its surrogates, which keep its values (or its spectrum) but not its patterns.
+    replicates = resample_statistic(
+        x=as_precision(unwrap(x), dtype),
+        statistic=partial(
+            _entropy_rows,
+            order=order,
+            metric=metric,
+            algorithm=algorithm,
+            engine=engine,
+        ),
+        n_resamples=n_resamples,
+        method=resample,
+        seed=seed,
+        n_jobs=n_jobs,
+    )
+    Pval = pvalue(value, replicates, alternative="less")
+    if result_object:
+        return RegularityResult(
+            result=result, entropy=value, tolerance=tolerance, Pval=Pval
+        )
+    return {"result": result, "entropy": value, "tolerance": tolerance, "Pval": Pval}
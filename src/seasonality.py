@@ -1,13 +1,23 @@
-from typing import Dict, Union
-from pmdarima.arima.arima import ARIMA
-from pmdarima.arima.auto import auto_arima
-from pmdarima.arima.seasonality import CHTest, OCSBTest
-from statsmodels.tools.validation import array_like, bool_like
-from statsmodels.tsa.seasonal import STL
-from typeguard import typechecked
+import warnings
+from copy import deepcopy
+from functools import partial
+from math import ceil
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
 import numpy as np
-from scipy.stats import chi2
 from src.correlation import acf
+from src.utils.cache import LRUCache, disk_cached
+from src.utils.checks import array_like, bool_like, typechecked
+from src.utils.kernels import get_kernel
+from src.utils.precision import as_precision, precision_offset, resolve_dtype
+from src.utils.prepared import PreparedSeries, prepare, unwrap
+from src.utils.resampling import pvalue, resample_statistic
+from src.utils.results import QSResult
+
+# `pmdarima` and `statsmodels` take seconds to import, so they are only imported by the functions which use them.
+if TYPE_CHECKING:
+    from pmdarima.arima.arima import ARIMA
+    from statsmodels.tsa.seasonal import STL
 
 
 """
@@ -15,9 +25,157 @@ For a really good article on CH & OCSB tests, check: [When A Time Series Only Qu
 """
 
 
-__all__ = ["qs", "ocsb", "ch", "seasonal_strength", "trend_strength", "spikiness"]
+__all__ = [
+    "qs",
+    "detect_seasonality",
+    "clear_arima_cache",
+    "ocsb",
+    "ch",
+    "seasonal_strength",
+    "trend_strength",
+    "spikiness",
+    "stl_features",
+    "decompose",
+    "clear_stl_cache",
+]
+
+
+RESIDUAL_BACKENDS = ["exhaustive", "stepwise", "budget", "fixed"]
+# Phase-randomised surrogates keep the seasonal autocorrelations, so are no use as the null of the `QS` test.
+QS_RESAMPLE_METHODS = ["permutation", "block"]
+_ARIMA_CACHE = LRUCache(maxsize=128)
+
+
+def _prepare(x: array_like, dtype: Any) -> PreparedSeries:
+    """
+    Prepare `x` at the precision of `dtype`, centring a `float32` series before it is rounded (see `as_precision()`). A `PreparedSeries` which is already at that precision is used as it is.
+    """
+    if isinstance(x, PreparedSeries) and x.dtype == np.dtype(dtype):
+        return x
+    return PreparedSeries(as_precision(unwrap(x), dtype), dtype=dtype)
+
+
+def _budget_arima(
+    x: array_like, max_order: int, time_budget: float
+) -> Optional["ARIMA"]:
+    """
+    Fit the candidate orders of the exhaustive search from the simplest upwards, and keep the best (by AIC) found before `time_budget` seconds have elapsed.
+    """
+    from pmdarima.arima.arima import ARIMA
+    from pmdarima.arima.utils import ndiffs
+
+    start = perf_counter()
+    d = ndiffs(x, test="kpss", max_d=2)
+    orders = sorted(
+        [(p, q) for p in range(4) for q in range(4) if p + q <= max_order],
+        key=lambda order: (sum(order), order),
+    )
+    best = None
+    for p, q in orders:
+        if best is not None and perf_counter() - start > time_budget:
+            break
+        try:
+            model = ARIMA(order=(p, d, q), suppress_warnings=True).fit(y=x)
+        except Exception:
+            continue
+        if best is None or model.aic() < best.aic():
+            best = model
+    return best
+
+
+def _fit_residual_model(
+    x: array_like, freq: int, backend: str, time_budget: float
+) -> Optional["ARIMA"]:
+    from pmdarima.arima.arima import ARIMA
+    from pmdarima.arima.auto import auto_arima
+
+    max_order = 1 if freq < 8 else 3
+    allow_drift = True if freq < 8 else False
+    if backend in ["exhaustive", "stepwise"]:
+        try:
+            return auto_arima(
+                y=x,
+                max_P=1,
+                max_Q=1,
+                max_p=3,
+                max_q=3,
+                seasonal=False,
+                stepwise=backend == "stepwise",
+                max_order=max_order,
+                allow_drift=allow_drift,
+            )
+        except Exception:
+            pass
+    elif backend == "budget":
+        model = _budget_arima(x=x, max_order=max_order, time_budget=time_budget)
+        if model is not None:
+            return model
+    try:
+        return ARIMA(order=(0, 1, 1)).fit(y=x)
+    except Exception:
+        return None
+
+
+def _get_residual_model(
+    x: PreparedSeries, freq: int, backend: str, time_budget: float
+) -> Dict[str, Optional[Union["ARIMA", np.ndarray]]]:
+    # Only the `freq < 8` bucket changes the search, so every `freq` in the same bucket shares one fit.
+    key = (
+        x.key,
+        backend,
+        freq < 8,
+        time_budget if backend == "budget" else None,
+    )
+    fit = _ARIMA_CACHE.get(key)
+    if fit is None:
+        model = _fit_residual_model(
+            x=x.values.astype(np.float64, copy=False),
+            freq=freq,
+            backend=backend,
+            time_budget=time_budget,
+        )
+        fit = {
+            "model": model,
+            "residuals": None if model is None else np.array(model.resid()),
+        }
+        if model is not None:
+            fit["residuals"].flags.writeable = False
+        _ARIMA_CACHE.put(key, fit)
+    return fit
+
+
+def clear_arima_cache() -> None:
+    """
+    Summary:
+        Empty the cache of fitted ARIMA models used by `qs(residuals=True)`, and reset its hit and miss counters.
+    """
+    _ARIMA_CACHE.clear()
+
+
+def _qs_stat(
+    first: Union[float, np.ndarray],
+    second: Union[float, np.ndarray],
+    N: int,
+    freq: Union[int, np.ndarray],
+) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+    """
+    The `QS` statistic and its p-value, from the autocorrelations at `freq` and `2*freq` of `N` observations. Vectorised over `freq`.
+    """
+    positive = (first > 0) & (second > 0)
+    first, second = np.where(positive, first, 0), np.where(positive, second, 0)
+    QS = N * (N + 2) * (first**2 / (N - freq) + second**2 / (N - 2 * freq))
+    from scipy.stats import chi2
+
+    return QS, chi2.sf(QS, 2)
+
 
+def _qs_panel(panel: np.ndarray, freq: int) -> np.ndarray:
+    # The `QS` statistic of every row of a `NaN`-free panel, with one batched `acf()` at the precision of the panel.
+    rho = acf(x=panel, lags=[freq, freq * 2], dtype=panel.dtype.name)
+    return _qs_stat(rho[:, 0], rho[:, 1], N=panel.shape[1], freq=freq)[0]
 
+
+@disk_cached
 @typechecked
 def qs(
     x: array_like,
@@ -25,7 +183,16 @@ def qs(
     diff: bool_like = True,
     residuals: bool_like = False,
     autoarima: bool_like = True,
-) -> Dict[str, Union[str, float, ARIMA, None]]:
+    backend: str = "exhaustive",
+    time_budget: float = 1.0,
+    result_object: bool = False,
+    resample: Optional[str] = None,
+    n_resamples: int = 999,
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    n_jobs: int = 1,
+    dtype: Optional[str] = None,
+) -> Union[Dict[str, Any], QSResult]:
     """
     Summary:
         Implement the `QS` Seasonality test.
@@ -41,10 +208,35 @@ def qs(
             Whether or not to run & return the residuals from the function. Defaults to `False`.
         autoarima (bool_like, optional):
             Whether or not to run the `AutoARIMA()` algorithm over the data. Defaults to `True`.
+        backend (str, optional):
+            How to search for the residual model when `residuals` and `autoarima` are both `True`. Must be one of:
+            - `"exhaustive"`: Fit every candidate order with `auto_arima(stepwise=False)`,
+            - `"stepwise"`: Use the stepwise search of `auto_arima(stepwise=True)`,
+            - `"budget"`: Fit the candidate orders from the simplest upwards, and keep the best found within `time_budget` seconds,
+            - `"fixed"`: Fit an `ARIMA(0,1,1)` model only.
+            Defaults to `"exhaustive"`.
+        time_budget (float, optional):
+            The number of seconds the `"budget"` backend may spend searching. At least one model is always fitted. The deadline is only checked between fits, so a single slow fit can overrun it by as long as that fit takes. Defaults to `1.0`.
+        result_object (bool, optional):
+            Whether to return a compact, read-only `QSResult` with the same fields, rather than a `dict`. Defaults to `False`.
+        resample (Optional[str], optional):
+            How to compute the p-value. Use `None` for the asymptotic chi-squared (2 degrees of freedom) p-value, or either `"permutation"` or `"block"` for a Monte-Carlo p-value from `n_resamples` resampled copies of the (differenced) series. See `src.utils.resampling.surrogates()`. Defaults to `None`.
+        n_resamples (int, optional):
+            The number of resampled copies, when `resample` is given. Defaults to `999`.
+        block_size (Optional[int], optional):
+            The block length for `resample="block"`. Defaults to `None`, which uses `max(2, freq // 2)`, so that no block spans a whole season.
+        seed (Optional[int], optional):
+            The random seed for `resample`. Without one, the p-value is random, so the call is never stored in the disk cache. Defaults to `None`.
+        n_jobs (int, optional):
+            The number of worker processes for `resample`. Use `-1` for every core. The p-value is the same for any value, given a `seed`. Defaults to `1`.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
 
     Raises:
         AttributeError:
             If `x` is empty, or `freq` is too low for the data to be adequately tested.
+        ValueError:
+            If `backend`, `resample` or `dtype` are not one of the valid options.
         ValueError:
             If, after differencing the data (by using `np.diff()`), any of the values are `None` (or `Null` or `np.nan`), then it cannot be used for QS Testing.
 
@@ -61,6 +253,12 @@ def qs(
             - [Machine Learning Mastery/How to Identify and Remove Seasonality from Time Series Data with Python](https://machinelearningmastery.com/time-series-seasonality-with-python)
             - [StackOverflow/Simple tests for seasonality in Python](https://stackoverflow.com/questions/62754218/simple-tests-for-seasonality-in-python)
 
+        The fitted residual models are cached by the content of `x` and the search settings (which only depend on whether `freq < 8`). Repeated calls on the same series, including at different `freq` values, therefore reuse the residuals rather than refitting. The returned `model` is a copy, so changing it does not change the cached fit. Use `clear_arima_cache()` to release them.
+
+        The asymptotic p-value can be badly calibrated on short series. With `resample`, the resampled copies are built as `(B, N)` matrices, whose statistics each come from one batched `acf()`, so `n_resamples=999` costs a few milliseconds. The p-value is `(1 + k) / (1 + n_resamples)`, where `k` of the copies have a statistic at least as large as the observed one.
+
+        With `dtype="float32"`, the series, its differences and the resampled copies are kept in single precision, and the statistic is within `1e-5` of `dtype="float64"`, relative to the larger of the statistic and `1`. The residual models are always fitted in `float64`, as `pmdarima` requires, and their residuals are then rounded to single precision. Without `residuals`, the series is centred on its mean before it is rounded, as the statistic does not depend on its level. The residual models do, so with `residuals=True` the series is rounded as it is, and the bound only holds for a series whose level is small against its variation.
+
     ???+ Example "Examples"
         Basic usage:
         ```python linenums="1"
@@ -82,10 +280,25 @@ def qs(
          'test': 'QS',
          'model': ARIMA(order=(1, 1, 1), scoring_args={}, suppress_warnings=True)}
     """
-    if x.isnull().all():
+    # The residual models depend on the level of the series, so it is only centred without them.
+    if residuals:
+        x = prepare(x, dtype=resolve_dtype(dtype))
+    else:
+        x = _prepare(x, dtype=resolve_dtype(dtype))
+    if x.mask.all():
         raise AttributeError(f"All observations are NaN.")
+    if backend not in RESIDUAL_BACKENDS:
+        raise ValueError(
+            f"Invalid option for `backend` parameter: {backend}.\n"
+            f"Valid options are: {RESIDUAL_BACKENDS}."
+        )
+    if resample is not None and resample not in QS_RESAMPLE_METHODS:
+        raise ValueError(
+            f"Invalid option for `resample` parameter: {resample}.\n"
+            f"Valid options are: {QS_RESAMPLE_METHODS}."
+        )
     if diff and residuals:
-        print(
+        warnings.warn(
             f"The differences of the residuals of a non-seasonal ARIMA model are computed and used."
             f"It may be better to either only take the differences or use the residuals."
         )
@@ -94,99 +307,306 @@ def qs(
             f"The number of observations per cycle is '{freq}', which is too small."
         )
 
+    model = None
+    y = x.values
     if residuals:
-        if autoarima:
-            max_order = 1 if freq < 8 else 3
-            allow_drift = True if freq < 8 else False
-            try:
-                model = auto_arima(
-                    y=x,
-                    max_P=1,
-                    max_Q=1,
-                    max_p=3,
-                    max_q=3,
-                    seasonal=False,
-                    stepwise=False,
-                    max_order=max_order,
-                    allow_drift=allow_drift,
-                )
-            except:
-                try:
-                    model = ARIMA(order=(0, 1, 1)).fit(y=x)
-                except:
-                    x = x
-                    print(
-                        f"Could not estimate any ARIMA model, original data series is used."
-                    )
-            else:
-                x = model.resid()
+        fit = _get_residual_model(
+            x=x,
+            freq=freq,
+            backend=backend if autoarima else "fixed",
+            time_budget=time_budget,
+        )
+        if fit["model"] is None:
+            warnings.warn(
+                f"Could not estimate any ARIMA model, original data series is used."
+            )
         else:
-            try:
-                model = ARIMA(order=(0, 1, 1)).fit(y=x)
-            except:
-                x = x
-                print(
-                    f"Could not estimate any ARIMA model, original data series is used."
-                )
-            else:
-                x = model.resid()
-    else:
-        model = None
+            # The cached model is shared by every later call, so each caller gets its own copy.
+            model = deepcopy(fit["model"])
+            y = fit["residuals"].astype(x.dtype, copy=False)
 
     # Do diff
-    y = np.diff(x) if diff else x
+    y = np.diff(y) if diff else y
 
     # Pre-check
-    if np.var(y[~np.isnan(y)]) == 0:
+    var = x.var if y is x.values else np.var(y[~np.isnan(y)])
+    if var == 0:
         raise ValueError(
             f"The Series is a constant (possibly after transformations)."
             f"QS-Test cannot be computed on constants."
         )
 
     # Test Statistic
-    rho = acf(x=y, nlags=freq * 2, missing="drop")[[freq, freq * 2]]
-    rho = np.array([0, 0]) if any(rho <= 0) else rho
-    N = len(y[~np.isnan(y)])
-    QS = N * (N + 2) * (rho[0] ** 2 / (N - freq) + rho[1] ** 2 / (N - freq * 2))
-    Pval = chi2.sf(QS, 2)
+    rho = acf(x=y, lags=[freq, freq * 2], missing="drop", dtype=x.dtype.name)
+    QS, Pval = _qs_stat(rho[0], rho[1], N=len(y[~np.isnan(y)]), freq=freq)
+    if resample is not None:
+        replicates = resample_statistic(
+            x=y[~np.isnan(y)],
+            statistic=partial(_qs_panel, freq=freq),
+            n_resamples=n_resamples,
+            method=resample,
+            block_size=max(2, freq // 2) if block_size is None else block_size,
+            seed=seed,
+            n_jobs=n_jobs,
+        )
+        Pval = pvalue(QS, replicates, alternative="greater")
 
+    if result_object:
+        return QSResult(stat=QS, Pval=Pval, test="QS", model=model)
     return {"stat": QS, "Pval": Pval, "test": "QS", "model": model}
 
 
+@typechecked
+def detect_seasonality(
+    x: array_like,
+    candidates: Optional[array_like] = None,
+    diff: bool_like = True,
+) -> Dict[str, np.ndarray]:
+    """
+    Summary:
+        Find the seasonal period of a series, by running the `QS` test for many candidate periods at once.
+
+    Params:
+        x (array_like):
+            The univariate time series data to test.
+        candidates (Optional[array_like], optional):
+            The periods to test. Each must be at least `2`, and short enough that the series covers two full cycles. Defaults to `None`, which tests the period of every peak in the periodogram.
+        diff (bool_like, optional):
+            Whether or not to run `np.diff()` over the data. Defaults to `True`.
+
+    Raises:
+        AttributeError:
+            If `x` is empty.
+        ValueError:
+            If any of the `candidates` are out of range, or if the series is constant.
+
+    Returns:
+        Dict[str, np.ndarray]:
+            One entry per candidate, ranked from the most to the least significant, with the keys:
+            - `period`: The candidate period,
+            - `stat`: The `QS` test statistic, as returned by `qs(x=x, freq=period, diff=diff)`,
+            - `Pval`: The p-value of the `QS` test statistic,
+            - `power`: The periodogram of the (differenced) series at the frequency closest to `1/period`.
+
+    ???+ Info "Details"
+        Calling `qs()` once per candidate repeats the differencing, the `NaN` filtering and the autocorrelations every time.
+        Here, the periodogram and the autocorrelations up to twice the largest candidate are computed once, and the `QS` statistic of every candidate is then read off those in one vectorised step.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> result = detect_seasonality(x=data)
+        >>> result["period"][0], result["Pval"][0]
+        (12, 5.90922325801522e-43)
+        ```
+    """
+    x = prepare(x)
+    if x.mask.all():
+        raise AttributeError(f"All observations are NaN.")
+    y = np.diff(x.values) if diff else x.values
+    y = y[~np.isnan(y)]
+    N = len(y)
+    if np.var(y) == 0:
+        raise ValueError(
+            f"The Series is a constant (possibly after transformations)."
+            f"QS-Test cannot be computed on constants."
+        )
+    longest = (N - 1) // 2
+
+    # Periodogram
+    power = np.abs(np.fft.rfft(y - y.mean())) ** 2 / N
+    if candidates is None:
+        peaks = 1 + np.flatnonzero(
+            (power[1:-1] > power[:-2]) & (power[1:-1] >= power[2:])
+        )
+        candidates = np.unique(np.round(N / peaks).astype(int))
+        candidates = candidates[(candidates >= 2) & (candidates <= longest)]
+        if len(candidates) == 0:
+            candidates = np.arange(2, longest + 1)
+    periods = np.asarray(candidates, dtype=int)
+    invalid = periods[(periods < 2) | (periods > longest)]
+    if len(invalid) or len(periods) == 0:
+        raise ValueError(
+            f"Invalid option for `candidates` parameter: {list(invalid)}.\n"
+            f"Must be between 2 and {longest}."
+        )
+
+    # Test Statistic
+    rho = acf(x=y, nlags=2 * int(periods.max()))
+    QS, Pval = _qs_stat(rho[periods], rho[2 * periods], N=N, freq=periods)
+    bins = np.minimum(np.round(N / periods).astype(int), len(power) - 1)
+    order = np.argsort(-QS, kind="stable")
+    return {
+        "period": periods[order],
+        "stat": QS[order],
+        "Pval": Pval[order],
+        "power": power[bins][order],
+    }
+
+
+@disk_cached
 @typechecked
 def ocsb(x: array_like, m: int, lag_method: str = "aic", max_lag: int = 3):
+    from pmdarima.arima.seasonality import OCSBTest
+
     return OCSBTest(
         m=m, lag_method=lag_method, max_lag=max_lag
-    ).estimate_seasonal_differencing_term(x)
+    ).estimate_seasonal_differencing_term(unwrap(x))
 
 
+@disk_cached
 @typechecked
 def ch(x: array_like, m: int):
-    return CHTest(m=m).estimate_seasonal_differencing_term(x)
+    from pmdarima.arima.seasonality import CHTest
+
+    return CHTest(m=m).estimate_seasonal_differencing_term(unwrap(x))
 
 
-def _get_stlfit(x: array_like, m: int) -> Dict[str, Union[np.ndarray, STL]]:
-    stlfit = STL(x, m, 13).fit()
+_STL_SEASONAL = 13
+_STL_CACHE = LRUCache(maxsize=256)
+DECOMPOSITIONS = ["stl", "stl_fast", "classical"]
+
+# Memory budget, in bytes, for the `float64` prefix sums of one block of rows in `_classical()`.
+_CLASSICAL_BLOCK_BYTES = 32 * 2**20
+
+
+def _validate_decomposition(decomposition: str) -> None:
+    if decomposition not in DECOMPOSITIONS:
+        raise ValueError(
+            f"Invalid option for `decomposition` parameter: {decomposition}.\n"
+            f"Valid options are: {DECOMPOSITIONS}."
+        )
+
+
+def _classical(panel: np.ndarray, m: int) -> Dict[str, np.ndarray]:
+    """
+    The classical additive decomposition of every row of a `(N, T)` panel at once: a centred moving average of length `m` (or `2*m` when `m` is even) for the trend, and the mean of the detrended values at each phase of the cycle for the seasonal component. The first and last `m//2` values of the trend and residuals are `NaN`. The components have the same dtype as the panel.
+    """
+    N, T = panel.shape
+    trend = np.full((N, T), np.nan, dtype=panel.dtype)
+    # The differences of prefix sums lose too many digits in single precision, so they are accumulated in `float64`, one block of rows at a time.
+    rows = max(1, _CLASSICAL_BLOCK_BYTES // (8 * (T + 1)))
+    for start in range(0, N, rows):
+        block = panel[start : start + rows]
+        cumsum = np.zeros((len(block), T + 1))
+        np.cumsum(block, axis=1, dtype=np.float64, out=cumsum[:, 1:])
+        average = (cumsum[:, m:] - cumsum[:, :-m]) / m
+        if m % 2 == 0:
+            average = (average[:, :-1] + average[:, 1:]) / 2
+        trend[start : start + rows, m // 2 : m // 2 + average.shape[1]] = average
+
+    # Pad to whole cycles, so the values at each phase of the cycle form one column.
+    cycles = np.full((N, -(-T // m) * m), np.nan, dtype=panel.dtype)
+    cycles[:, :T] = panel - trend
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        figure = np.nanmean(cycles.reshape(N, -1, m), axis=1)
+    figure -= figure.mean(axis=1, keepdims=True)
+    seasonal = np.tile(figure, -(-T // m))[:, :T]
+    return {"trend": trend, "seasonal": seasonal, "residuals": panel - trend - seasonal}
+
+
+def _stl(x: np.ndarray, m: int, decomposition: str) -> Dict[str, Any]:
+    from statsmodels.tsa.seasonal import STL
+
+    if decomposition == "stl":
+        model = STL(x, m, _STL_SEASONAL).fit()
+    else:
+        # Fit each LOESS smoother at every `ceil(window/10)`-th point only and interpolate between them, as the `R` `stl()` does by default, and skip the second inner iteration.
+        config = STL(x, m, _STL_SEASONAL).config
+        jumps = {
+            f"{name}_jump": ceil(config[name] / 10)
+            for name in ["seasonal", "trend", "low_pass"]
+        }
+        model = STL(x, m, _STL_SEASONAL, **jumps).fit(inner_iter=1, outer_iter=0)
+    # `STL` only works in `float64`, so a `float32` series is upcast for the fit, and its components are rounded back.
     return {
-        "model": stlfit,
-        "trend": stlfit.trend,
-        "seasonal": stlfit.seasonal,
-        "residuals": stlfit.resid,
+        "model": model,
+        "trend": np.asarray(model.trend, dtype=x.dtype),
+        "seasonal": np.asarray(model.seasonal, dtype=x.dtype),
+        "residuals": np.asarray(model.resid, dtype=x.dtype),
     }
 
 
-def _get_stlvar(x: array_like, m: int) -> Dict[str, np.ndarray]:
-    stlfit = _get_stlfit(x=x, m=m)
+def _get_stlfit(
+    x: array_like, m: int, decomposition: str = "stl", dtype: Any = np.float64
+) -> Dict[str, Union[np.ndarray, "STL"]]:
+    x = _prepare(x, dtype=dtype)
+    key = (x.key, m, decomposition, x.dtype.name, _STL_SEASONAL)
+    stlfit = _STL_CACHE.get(key)
+    if stlfit is None:
+        if decomposition == "classical":
+            parts = _classical(x.values[np.newaxis], m)
+            stlfit = {"model": None, **{name: part[0] for name, part in parts.items()}}
+        else:
+            stlfit = _stl(x.values, m, decomposition)
+        # The same arrays are shared by every later call, so they must never change.
+        for name in ["trend", "seasonal", "residuals"]:
+            stlfit[name].flags.writeable = False
+        _STL_CACHE.put(key, stlfit)
+    return stlfit
+
+
+def _get_stlvar(
+    x: array_like,
+    m: int,
+    stlfit: Optional[Dict[str, Any]] = None,
+    decomposition: str = "stl",
+    dtype: Any = np.float64,
+) -> Dict[str, np.ndarray]:
+    x = _prepare(x, dtype=dtype)
+    stlfit = stlfit or _get_stlfit(x=x, m=m, decomposition=decomposition, dtype=dtype)
     return {
-        "varx": np.nanvar(x, ddof=1),
+        # A series with fewer than two values has no sample variance, so it scores `0` on both strengths.
+        "varx": x.var * x.n_valid / (x.n_valid - 1) if x.n_valid > 1 else 0.0,
         "vare": np.nanvar(stlfit.get("residuals"), ddof=1),
         "vara": np.nanvar(stlfit.get("residuals") + stlfit.get("seasonal"), ddof=1),
-        "vardeseason": np.nanvar(x - stlfit.get("seasonal")),
-        "vardetrend": np.nanvar(x - stlfit.get("trend")),
+        "vardeseason": np.nanvar(x.values - stlfit.get("seasonal")),
+        "vardetrend": np.nanvar(x.values - stlfit.get("trend")),
     }
 
 
-def seasonal_strength(x: array_like, m: int) -> float:
+def _seasonal_strength(stlvar: Dict[str, np.ndarray]) -> float:
+    if (
+        stlvar.get("varx") < np.finfo(float).eps
+        or stlvar.get("vara") < np.finfo(float).eps
+    ):
+        return 0
+    else:
+        return max(0, min(1, 1 - stlvar.get("vare") / stlvar.get("vara")))
+
+
+def _trend_strength(stlvar: Dict[str, np.ndarray]) -> float:
+    if (
+        stlvar.get("varx") < np.finfo(float).eps
+        or stlvar.get("vardeseason") / stlvar.get("varx") < 1e-10
+    ):
+        return 0
+    else:
+        return max(0, min(1, 1 - stlvar.get("vare") / stlvar.get("vardeseason")))
+
+
+def _spikiness(stlfit: Dict[str, np.ndarray], backend: str = "numpy") -> float:
+    # The classical residuals are `NaN` at both ends, so the leave-one-out variances only count the valid ones.
+    residuals = np.ascontiguousarray(stlfit.get("residuals"))
+    n = int(np.count_nonzero(~np.isnan(residuals)))
+    return get_kernel("loo_variance", backend)(residuals, n)
+
+
+def clear_stl_cache() -> None:
+    """
+    Summary:
+        Empty the in-memory cache of `STL` decompositions used by the strength features.
+    """
+    _STL_CACHE.clear()
+
+
+@disk_cached
+def seasonal_strength(
+    x: array_like, m: int, decomposition: str = "stl", dtype: Optional[str] = None
+) -> float:
     """
     Summary:
         The seasonal strength of a univariate timeseries data set.
@@ -196,6 +616,14 @@ def seasonal_strength(x: array_like, m: int) -> float:
             The time series data set.
         m (int):
             The frequency of the time series data set.
+        decomposition (str, optional):
+            How to decompose the series, either `"stl"`, `"stl_fast"` or `"classical"`. See `decompose()` for the options. Defaults to `"stl"`.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `decomposition` or `dtype` are not one of the valid options.
 
     Returns:
         float:
@@ -211,20 +639,21 @@ def seasonal_strength(x: array_like, m: int) -> float:
         >>> _description_
         ```
     """
+    _validate_decomposition(decomposition)
     if not m > 1:
         return 0
     else:
-        stlvar = _get_stlvar(x=x, m=m)
-        if (
-            stlvar.get("varx") < np.finfo(float).eps
-            or stlvar.get("vara") < np.finfo(float).eps
-        ):
-            return 0
-        else:
-            return max(0, min(1, 1 - stlvar.get("vare") / stlvar.get("vara")))
+        return _seasonal_strength(
+            _get_stlvar(
+                x=x, m=m, decomposition=decomposition, dtype=resolve_dtype(dtype)
+            )
+        )
 
 
-def trend_strength(x: array_like, m: int) -> float:
+@disk_cached
+def trend_strength(
+    x: array_like, m: int, decomposition: str = "stl", dtype: Optional[str] = None
+) -> float:
     """
     Summary:
         The trend strength of a univariate timeseries data set.
@@ -234,6 +663,14 @@ def trend_strength(x: array_like, m: int) -> float:
             The time series data set.
         m (int):
             The frequency of the time series data set.
+        decomposition (str, optional):
+            How to decompose the series, either `"stl"`, `"stl_fast"` or `"classical"`. See `decompose()` for the options. Defaults to `"stl"`.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `decomposition` or `dtype` are not one of the valid options.
 
     Returns:
         float:
@@ -249,20 +686,25 @@ def trend_strength(x: array_like, m: int) -> float:
         >>> _description_
         ```
     """
+    _validate_decomposition(decomposition)
     if not m > 1:
         return 0
     else:
-        stlvar = _get_stlvar(x=x, m=m)
-        if (
-            stlvar.get("varx") < np.finfo(float).eps
-            or stlvar.get("vardeseason") / stlvar.get("varx") < 1e-10
-        ):
-            return 0
-        else:
-            return max(0, min(1, 1 - stlvar.get("vare") / stlvar.get("vardeseason")))
+        return _trend_strength(
+            _get_stlvar(
+                x=x, m=m, decomposition=decomposition, dtype=resolve_dtype(dtype)
+            )
+        )
 
 
-def spikiness(x: array_like, m: int) -> float:
+@disk_cached
+def spikiness(
+    x: array_like,
+    m: int,
+    backend: str = "numpy",
+    decomposition: str = "stl",
+    dtype: Optional[str] = None,
+) -> float:
     """
     Summary:
         The spikiness of a univariate timeseries data set.
@@ -272,6 +714,18 @@ def spikiness(x: array_like, m: int) -> float:
             The time series data set.
         m (int):
             The frequency of the time series data set.
+        backend (str, optional):
+            The `src.utils.kernels` backend for the variance of the leave-one-out variances of the residuals. One of `"numpy"`, `"numba"` or `"auto"`. Defaults to `"numpy"`.
+        decomposition (str, optional):
+            How to decompose the series, either `"stl"`, `"stl_fast"` or `"classical"`. See `decompose()` for the options. The `"classical"` residuals keep more of the variance of the series than the `STL` ones, and spikiness grows with the square of that variance, so a `"classical"` spikiness is typically one and a half to two times the `"stl"` one, and the two should not be compared. Defaults to `"stl"`.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `backend`, `decomposition` or `dtype` are not one of the valid options.
+        ImportError:
+            If `backend="numba"`, but `numba` is not installed.
 
     Returns:
         float:
@@ -287,8 +741,158 @@ def spikiness(x: array_like, m: int) -> float:
         >>> _description_
         ```
     """
-    n = len(x)
-    stlfit = _get_stlfit(x=x, m=m)
-    d = (stlfit.get("residuals") - np.nanmean(stlfit.get("residuals"))) ** 2
-    varloo = (np.nanvar(stlfit.get("residuals"), ddof=1) * (n - 1) - d) / (n - 2)
-    return np.nanvar(varloo, ddof=1)
+    _validate_decomposition(decomposition)
+    stlfit = _get_stlfit(
+        x=x, m=m, decomposition=decomposition, dtype=resolve_dtype(dtype)
+    )
+    return _spikiness(stlfit=stlfit, backend=backend)
+
+
+def stl_features(
+    x: array_like, m: int, decomposition: str = "stl", dtype: Optional[str] = None
+) -> Dict[str, float]:
+    """
+    Summary:
+        The seasonal strength, trend strength and spikiness of a univariate timeseries data set, all from a single `STL` decomposition.
+
+    Params:
+        x (array_like):
+            The time series data set.
+        m (int):
+            The frequency of the time series data set.
+        decomposition (str, optional):
+            How to decompose the series, either `"stl"`, `"stl_fast"` or `"classical"`. See `decompose()` for the options. Defaults to `"stl"`.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `decomposition` or `dtype` are not one of the valid options.
+
+    Returns:
+        Dict[str, float]:
+            The `seasonal_strength`, `trend_strength` and `spikiness` scores.
+
+    ???+ Info "Details"
+        Calling `seasonal_strength()`, `trend_strength()` and `spikiness()` separately will fit the same `STL` model three times.
+        This function fits it once, and re-uses the decomposition for all three scores.
+        The decomposition is also kept in a bounded, content-addressed cache, so the individual functions will re-use it too.
+        Use `clear_stl_cache()` to release that memory.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> stl_features(x=data, m=12)
+        {'seasonal_strength': 0.9815304216549953,
+         'trend_strength': 0.9971375301013928,
+         'spikiness': 0.16276032794671697}
+        ```
+    """
+    _validate_decomposition(decomposition)
+    if not m > 1:
+        return {
+            "seasonal_strength": 0,
+            "trend_strength": 0,
+            "spikiness": spikiness(x=x, m=m, decomposition=decomposition, dtype=dtype),
+        }
+    dtype = resolve_dtype(dtype)
+    stlfit = _get_stlfit(x=x, m=m, decomposition=decomposition, dtype=dtype)
+    stlvar = _get_stlvar(x=x, m=m, stlfit=stlfit, dtype=dtype)
+    return {
+        "seasonal_strength": _seasonal_strength(stlvar),
+        "trend_strength": _trend_strength(stlvar),
+        "spikiness": _spikiness(stlfit=stlfit),
+    }
+
+
+@typechecked
+def decompose(
+    x: array_like,
+    m: int,
+    decomposition: str = "classical",
+    dtype: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Summary:
+        Decompose one series, or every row of a `(N, T)` panel, into its trend, seasonal and residual components.
+
+    Params:
+        x (array_like):
+            The univariate time series data, or a 2D panel with one series per row.
+        m (int):
+            The frequency of the time series data.
+        decomposition (str, optional):
+            How to decompose the series. One of:
+            - `"stl"`: The `statsmodels` `STL` decomposition, as `tsfeatures` uses,
+            - `"stl_fast"`: The same `STL`, with the interpolated LOESS fits of the `R` `stl()` and a single inner iteration, which is about ten times faster,
+            - `"classical"`: The classical moving-average decomposition, which is faster again, but is only close to `"stl"` when the seasonal pattern is additive and does not change.
+            Defaults to `"classical"`.
+        dtype (Optional[str], optional):
+            The floating point precision, either `"float64"` or `"float32"`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `decomposition` or `dtype` are not one of the valid options, `m < 2`, or `x` has more than two dimensions.
+
+    Returns:
+        Dict[str, np.ndarray]:
+            The `trend`, `seasonal` and `residuals` components, each with the same shape as `x`, and the precision of `dtype`.
+
+    ???+ Info "Details"
+        The `"classical"` decomposition is fully vectorised: the trend of every row comes from one set of prefix sums, and the seasonal figure of every row from one `np.nanmean()` over the phases of the cycle. It matches `statsmodels.tsa.seasonal.seasonal_decompose()`, including the `NaN`s in the first and last `m//2` values of the trend and residuals.
+        The `"stl"` and `"stl_fast"` decompositions fit one `STL` model per row.
+        Single series are kept in the same cache as the strength features, so `seasonal_strength()` and friends re-use them.
+
+        With `dtype="float32"`, the panel and all three components are kept in single precision, which halves their memory. The `"classical"` trend is still accumulated in `float64`, one block of rows at a time, and is within `1e-6` of `dtype="float64"`, relative to the scale of the series. Each series is decomposed around its mean, which is added back to the single precision trend. `STL` only works in `float64`, so each series is upcast for its fit, and its components are rounded back to single precision.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> import numpy as np
+        >>> from sktime.datasets import load_airline
+        >>> panel = np.vstack([load_airline().values, load_airline().values[::-1]])
+        >>> parts = decompose(x=panel, m=12)
+        >>> parts["seasonal"].shape
+        (2, 144)
+        >>> parts["seasonal"][0, :3]
+        array([-24.74873737, -36.18813131,  -2.24116162])
+        ```
+    """
+    _validate_decomposition(decomposition)
+    if m < 2:
+        raise ValueError(
+            f"Invalid option for `m` parameter: {m}.\n" f"Must be at least `2`."
+        )
+    dtype = resolve_dtype(dtype)
+    values = np.asarray(unwrap(x))
+    if values.ndim > 2:
+        raise ValueError(
+            f"Invalid shape for `x`: {values.shape}.\n"
+            f"Must be a 1D series or a 2D panel with one series per row."
+        )
+    # A `float32` series is decomposed around its mean, which is added back to the trend.
+    offset = precision_offset(values, dtype)
+    values = as_precision(values, dtype)
+    if values.ndim == 1:
+        stlfit = _get_stlfit(
+            x=values if dtype == np.float32 else x,
+            m=m,
+            decomposition=decomposition,
+            dtype=dtype,
+        )
+        parts = {
+            name: stlfit[name].copy() for name in ["trend", "seasonal", "residuals"]
+        }
+    elif decomposition == "classical":
+        parts = _classical(values, m)
+    else:
+        fits = [_stl(row, m, decomposition) for row in values]
+        parts = {
+            name: np.vstack([fit[name] for fit in fits])
+            for name in ["trend", "seasonal", "residuals"]
+        }
+    if dtype == np.float32:
+        parts["trend"] += offset
+    return parts
@@ -1,13 +1,174 @@
-from typing import Union
+import warnings
+from types import ModuleType
+from typing import Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from tsfeatures import lumpiness as ts_lumpiness
-from tsfeatures import stability as ts_stability
-from typeguard import typechecked
 
+from src.utils.cache import disk_cached
+from src.utils.checks import typechecked
+from src.utils.chunks import iter_chunks, resolve_chunk_size
+from src.utils.kernels import KERNEL_BACKENDS, _tile_stats, get_kernel
+from src.utils.precision import as_precision, resolve_dtype
+from src.utils.prepared import PreparedSeries, unwrap
 
-__all__ = ["stability", "is_stable", "lumpiness", "is_lumpy"]
+
+def _tsfeatures() -> ModuleType:
+    """
+    Import `tsfeatures` on first use, because it takes several seconds to load.
+    """
+    # `tsfeatures` replaces `warnings.warn()` with a no-op when it is imported. Keep its import-time warnings quiet, but put back whatever `warnings.warn()` was before, so the rest of the process still warns.
+    warn = warnings.warn
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            import tsfeatures
+    finally:
+        warnings.warn = warn
+    return tsfeatures
+
+
+__all__ = [
+    "TILE_BACKENDS",
+    "stability",
+    "is_stable",
+    "rolling_stability",
+    "lumpiness",
+    "is_lumpy",
+    "rolling_lumpiness",
+]
+
+
+TILE_BACKENDS = ["tsfeatures", *KERNEL_BACKENDS]
+
+
+# ------------------------------------------------------------------------------#
+# Rolling tiles                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+def _tile_width(freq: int) -> int:
+    return 10 if freq == 1 else freq
+
+
+def _prefix(x: np.ndarray) -> np.ndarray:
+    return np.concatenate([[0.0], np.cumsum(x)])
+
+
+def _block_stats(x: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and variance (`ddof=1`) of every block `x[s:s+width]`, ignoring `NaN`s, from prefix sums in `O(n)`.
+    """
+    valid = ~np.isnan(x)
+    x = np.where(valid, x - np.nanmean(x), 0.0)
+    counts = _prefix(valid.astype(np.float64))
+    sums, squares = _prefix(x), _prefix(x**2)
+    count = counts[width:] - counts[:-width]
+    total = sums[width:] - sums[:-width]
+    total_sq = squares[width:] - squares[:-width]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, np.nan)
+        var = (total_sq - total * mean) / (count - 1)
+    var = np.where(count > 1, np.maximum(var, 0.0), np.nan)
+    return mean, var
+
+
+def _rolling_tile_var(blocks: np.ndarray, width: int, window: int) -> np.ndarray:
+    """
+    For every window `[i, i+window)`, the variance (`ddof=1`) of the `window // width` non-overlapping block statistics `blocks[i + j*width]`, ignoring `NaN`s.
+    """
+    ntiles = window // width
+    nwindows = len(blocks) + width - window
+    valid = ~np.isnan(blocks)
+    blocks = np.where(valid, blocks - np.nanmean(blocks), 0.0)
+
+    # Cumulative sums along each stride-`width` sub-sequence, so the sum over the tiles of any window is the difference of two entries.
+    def _strided(values: np.ndarray) -> np.ndarray:
+        padded = np.zeros(-(-len(values) // width) * width)
+        padded[: len(values)] = values
+        cumsum = np.cumsum(padded.reshape(-1, width), axis=0)
+        cumsum = np.vstack([np.zeros((1, width)), cumsum]).ravel()
+        idx = np.arange(nwindows)
+        return cumsum[idx + ntiles * width] - cumsum[idx]
+
+    count = _strided(valid.astype(np.float64))
+    total = _strided(blocks)
+    total_sq = _strided(blocks**2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (total_sq - total**2 / count) / (count - 1)
+    return np.where(count > 1, np.maximum(var, 0.0), np.nan)
+
+
+def _rolling_tiles(
+    data: Union[np.ndarray, pd.Series, PreparedSeries],
+    window: int,
+    freq: int,
+    stat: str,
+) -> np.ndarray:
+    x = np.asarray(data, dtype=np.float64).ravel()
+    width = _tile_width(freq)
+    if not 1 <= window <= len(x):
+        raise ValueError(
+            f"Invalid value for `window`: {window}.\n"
+            f"Must be between `1` and the length of `data` ({len(x)})."
+        )
+    nwindows = len(x) - window + 1
+    if window < 2 * width:
+        return np.zeros(nwindows)
+    mean, var = _block_stats(x, width)
+    return _rolling_tile_var(mean if stat == "mean" else var, width, window)
+
+
+def _chunked_tiles(x: np.ndarray, freq: int, stat: str, chunk_size: int) -> float:
+    """
+    Variance (`ddof=1`) of the mean or variance (`ddof=1`) of every full tile, ignoring `NaN`s, reading `chunk_size` values (rounded down to whole tiles) at a time.
+    """
+    width = _tile_width(freq)
+    if len(x) < 2 * width:
+        return 0.0
+    chunk_size = max(1, chunk_size // width) * width
+    count, mean, squares = 0, 0.0, 0.0
+    for _, chunk in iter_chunks(x[: len(x) // width * width], chunk_size):
+        values = _tile_stats(chunk, width, stat)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            continue
+        # Merge the running moments with those of this chunk (Chan, Golub & LeVeque), so only one chunk of tiles is ever held in memory.
+        delta = values.mean() - mean
+        total = count + len(values)
+        squares += ((values - values.mean()) ** 2).sum()
+        squares += delta**2 * count * len(values) / total
+        mean += delta * len(values) / total
+        count = total
+    return squares / (count - 1) if count > 1 else np.nan
+
+
+def _tiles(
+    data: Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries],
+    freq: int,
+    stat: str,
+    chunk_size: Optional[int],
+    backend: str,
+    dtype: Optional[str] = None,
+) -> float:
+    """
+    The `stability` (with `stat="mean"`) or `lumpiness` (with `stat="var"`) of `data`, out-of-core, with `tsfeatures`, or with a registered kernel at the precision of `dtype`.
+    """
+    if backend not in TILE_BACKENDS:
+        raise ValueError(
+            f"Invalid option for `backend` parameter: {backend}.\n"
+            f"Valid options are: {TILE_BACKENDS}."
+        )
+    dtype = resolve_dtype(dtype)
+    chunk_size = resolve_chunk_size(data, chunk_size)
+    if chunk_size is not None:
+        return _chunked_tiles(np.asarray(unwrap(data)).ravel(), freq, stat, chunk_size)
+    if backend == "tsfeatures":
+        name = "stability" if stat == "mean" else "lumpiness"
+        return getattr(_tsfeatures(), name)(x=unwrap(data), freq=freq)[name]
+    x = as_precision(np.ravel(unwrap(data)), dtype)
+    kernel = get_kernel("tile_variance", backend)
+    return float(kernel(x, _tile_width(freq), stat == "var"))
 
 
 # ------------------------------------------------------------------------------#
@@ -15,17 +176,36 @@ __all__ = ["stability", "is_stable", "lumpiness", "is_lumpy"]
 # ------------------------------------------------------------------------------#
 
 
+@disk_cached
 @typechecked
-def stability(data: Union[np.ndarray, pd.DataFrame, pd.Series], freq: int = 1) -> float:
+def stability(
+    data: Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries],
+    freq: int = 1,
+    chunk_size: Optional[int] = None,
+    backend: str = "tsfeatures",
+    dtype: Optional[str] = None,
+) -> float:
     """
     !!! Summary
         Test for stability.
 
     Params:
-        data (Union[np.ndarray, pd.DataFrame, pd.Series]):
+        data (Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries]):
             The time series.
         freq (int, optional):
             Frequency of the time series
+        chunk_size (Optional[int], optional):
+            If given, process the series out-of-core, reading only this many values (rounded down to whole tiles) at a time. Defaults to `None`, which processes a 1D `np.memmap` in chunks of `2**20` values, and anything else in memory.
+        backend (str, optional):
+            How to process the series in memory. One of `"tsfeatures"`, or the `"numpy"`, `"numba"` or `"auto"` kernels of `src.utils.kernels`. The kernels skip the `pandas` objects which `tsfeatures` builds on every call, and the `"numba"` kernel makes a single pass with no temporary arrays. Defaults to `"tsfeatures"`.
+        dtype (Optional[str], optional):
+            The floating point precision of the series for the kernels, either `"float64"` or `"float32"`. The `"numba"` kernel reads single precision values, but always accumulates in double precision. The `"tsfeatures"` backend and the out-of-core path always work in `float64`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `backend` or `dtype` are not one of the valid options.
+        ImportError:
+            If `backend="numba"`, but `numba` is not installed.
 
     Returns:
         (float):
@@ -46,19 +226,21 @@ def stability(data: Union[np.ndarray, pd.DataFrame, pd.Series], freq: int = 1) -
         12702.672087912088
         ```
     """
-    return ts_stability(x=data, freq=freq)["stability"]
+    return _tiles(data, freq, "mean", chunk_size, backend, dtype)
 
 
 @typechecked
 def is_stable(
-    data: Union[np.ndarray, pd.DataFrame, pd.Series], freq: int = 1, alpha: float = 0.5
+    data: Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries],
+    freq: int = 1,
+    alpha: float = 0.5,
 ) -> bool:
     """
     !!! Summary
         Check whether a data series is stable or not.
 
     Params:
-        data (Union[np.ndarray, pd.DataFrame, pd.Series]):
+        data (Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries]):
             The time series.
         freq (int, optional):
             The frequency of the time series. Defaults to `1`.
@@ -87,22 +269,80 @@ def is_stable(
     return True if stability(data=data, freq=freq) > alpha else False
 
 
+@typechecked
+def rolling_stability(
+    data: Union[np.ndarray, pd.Series, PreparedSeries], window: int, freq: int = 1
+) -> np.ndarray:
+    """
+    !!! Summary
+        Compute the stability of every rolling window of a time series.
+
+    Params:
+        data (Union[np.ndarray, pd.Series, PreparedSeries]):
+            The time series.
+        window (int):
+            The length of each rolling window.
+        freq (int, optional):
+            Frequency of the time series. Defaults to `1`.
+
+    Raises:
+        ValueError:
+            If `window` is not between `1` and the length of `data`.
+
+    Returns:
+        (np.ndarray):
+            An array of length `len(data) - window + 1`, where element `i` is equal to `stability(data[i:i+window], freq)`.
+
+    ??? Info "Details"
+        Rather than re-tiling every window, the mean of every tile-sized block is computed once from prefix sums, and the variance of the tile means in every window is then computed from strided prefix sums of those block means. The whole rolling series therefore costs `O(n)`, regardless of the `window` size.
+
+    ??? Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline().values
+        >>> print(rolling_stability(data, window=60, freq=12)[:3])
+        [1634.36666667 1632.16458333 1585.81736111]
+        ```
+    """
+    return _rolling_tiles(data=data, window=window, freq=freq, stat="mean")
+
+
 # ------------------------------------------------------------------------------#
 # Lumpiness                                                                  ####
 # ------------------------------------------------------------------------------#
 
 
+@disk_cached
 @typechecked
-def lumpiness(data: Union[np.ndarray, pd.DataFrame, pd.Series], freq: int = 1) -> float:
+def lumpiness(
+    data: Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries],
+    freq: int = 1,
+    chunk_size: Optional[int] = None,
+    backend: str = "tsfeatures",
+    dtype: Optional[str] = None,
+) -> float:
     """
     !!! Summary
         Test for lumpiness.
 
     Params:
-        data (Union[np.ndarray, pd.DataFrame, pd.Series]):
+        data (Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries]):
             The time series.
         freq (int, optional):
             Frequency of the time series
+        chunk_size (Optional[int], optional):
+            If given, process the series out-of-core, reading only this many values (rounded down to whole tiles) at a time. Defaults to `None`, which processes a 1D `np.memmap` in chunks of `2**20` values, and anything else in memory.
+        backend (str, optional):
+            How to process the series in memory. One of `"tsfeatures"`, or the `"numpy"`, `"numba"` or `"auto"` kernels of `src.utils.kernels`. The kernels skip the `pandas` objects which `tsfeatures` builds on every call, and the `"numba"` kernel makes a single pass with no temporary arrays. Defaults to `"tsfeatures"`.
+        dtype (Optional[str], optional):
+            The floating point precision of the series for the kernels, either `"float64"` or `"float32"`. The `"numba"` kernel reads single precision values, but always accumulates in double precision. The `"tsfeatures"` backend and the out-of-core path always work in `float64`. See `src.utils.precision`. Defaults to `None`, which uses the precision set by `set_precision()`.
+
+    Raises:
+        ValueError:
+            If `backend` or `dtype` are not one of the valid options.
+        ImportError:
+            If `backend="numba"`, but `numba` is not installed.
 
     Returns:
         (float):
@@ -123,19 +363,21 @@ def lumpiness(data: Union[np.ndarray, pd.DataFrame, pd.Series], freq: int = 1) -
         5558930.856730431
         ```
     """
-    return ts_lumpiness(x=data, freq=freq)["lumpiness"]
+    return _tiles(data, freq, "var", chunk_size, backend, dtype)
 
 
 @typechecked
 def is_lumpy(
-    data: Union[np.ndarray, pd.DataFrame, pd.Series], freq: int = 1, alpha: float = 0.5
+    data: Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries],
+    freq: int = 1,
+    alpha: float = 0.5,
 ) -> bool:
     """
     !!! Summary
         Check whether a data series is lumpy or not.
 
     Params:
-        data (Union[np.ndarray, pd.DataFrame, pd.Series]):
+        data (Union[np.ndarray, pd.DataFrame, pd.Series, PreparedSeries]):
             The time series.
         freq (int, optional):
             The frequency of the time series. Defaults to `1`.
@@ -162,3 +404,42 @@ def is_lumpy(
         ```
     """
     return True if lumpiness(data=data, freq=freq) > alpha else False
+
+
+@typechecked
+def rolling_lumpiness(
+    data: Union[np.ndarray, pd.Series, PreparedSeries], window: int, freq: int = 1
+) -> np.ndarray:
+    """
+    !!! Summary
+        Compute the lumpiness of every rolling window of a time series.
+
+    Params:
+        data (Union[np.ndarray, pd.Series, PreparedSeries]):
+            The time series.
+        window (int):
+            The length of each rolling window.
+        freq (int, optional):
+            Frequency of the time series. Defaults to `1`.
+
+    Raises:
+        ValueError:
+            If `window` is not between `1` and the length of `data`.
+
+    Returns:
+        (np.ndarray):
+            An array of length `len(data) - window + 1`, where element `i` is equal to `lumpiness(data[i:i+window], freq)`.
+
+    ??? Info "Details"
+        The variance of every tile-sized block is computed once from prefix sums and prefix sums-of-squares, and the variance of the tile variances in every window is then computed from strided prefix sums of those block variances. The whole rolling series therefore costs `O(n)`, regardless of the `window` size.
+
+    ??? Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline().values
+        >>> print(rolling_lumpiness(data, window=60, freq=12)[:3])
+        [55962.71735537 53868.77246901 68019.51714302]
+        ```
+    """
+    return _rolling_tiles(data=data, window=window, freq=freq, stat="var")
@@ -1,4 +1,8 @@
 """
+Test whether time series are stationary, with the Augmented Dickey-Fuller (`adf()`), Kwiatkowski-Phillips-Schmidt-Shin (`kpss()`) and Phillips-Perron (`pp()`) tests.
+
+Every test accepts either a single series, or a 2D panel of equal-length series. A panel is never looped over in Python: the regressions for every series are solved together as one stacked least-squares problem, and the p-values come from response-surface and look-up tables which are prepared once, on first use.
+
 There are actually three really good libraries which implements these tests:
 
 | library     | category     | algorithm                                     | short | import script                                      | url |
@@ -21,9 +25,547 @@ There are actually three really good libraries which implements these tests:
 
 """
 
-# from pmdarima.arima.stationarity import PPTest, ADFTest, KPSSTest
-# from statsmodels.tsa.api import adfuller, kpss
+import warnings
+from functools import lru_cache
+from math import ceil
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils.checks import array_like, typechecked
+
+
+"""
+For a really good article on ADF & KPSS tests, check: [When A Time Series Only Quacks Like A Duck: Testing for Stationarity Before Running Forecast Models. With Python. And A Duckling Picture.](https://towardsdatascience.com/when-a-time-series-only-quacks-like-a-duck-10de9e165e)
+"""
+
+
+__all__ = ["adf", "kpss", "pp"]
+
+
+ADF_REGRESSIONS = ["c", "ct", "ctt", "n"]
+ADF_AUTOLAGS = ["aic", "bic", "t-stat", None]
+KPSS_REGRESSIONS = ["c", "ct"]
+PP_REGRESSIONS = ["c", "ct", "n"]
+
+_KPSS_CRIT = {
+    "c": np.array([0.347, 0.463, 0.574, 0.739]),
+    "ct": np.array([0.119, 0.146, 0.176, 0.216]),
+}
+_KPSS_PVALS = np.array([0.10, 0.05, 0.025, 0.01])
+
+# The one-sided 5% normal quantile used by the `"t-stat"` lag selection.
+_TSTAT_STOP = 1.6448536269514722
+
+
+# ------------------------------------------------------------------------------#
+# Batch kernels                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+def _as_panel(x: array_like, axis: int) -> Tuple[np.ndarray, bool]:
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        return x[None, :], True
+    if x.ndim != 2:
+        raise ValueError(f"Invalid shape for `x`: {x.shape}. Must be 1D or 2D.")
+    return np.ascontiguousarray(np.moveaxis(x, axis, -1)), False
+
+
+def _check_panel(x: np.ndarray) -> None:
+    if np.isnan(x).any():
+        raise ValueError("Invalid values in `x`: missing values are not supported.")
+    if np.any(x.max(axis=-1) == x.min(axis=-1)):
+        raise ValueError("Invalid values in `x`: at least one series is constant.")
+
+
+def _check_option(name: str, value: Optional[str], options: list) -> None:
+    if value not in options:
+        raise ValueError(
+            f"Invalid option for `{name}` parameter: {value}.\n"
+            f"Valid options are: {options}."
+        )
+
+
+def _trend(regression: str, nobs: int) -> np.ndarray:
+    """
+    The deterministic regressors, in the same column order as `statsmodels.tsa.tsatools.add_trend()`.
+    """
+    trend = np.arange(1, nobs + 1, dtype=np.float64)
+    columns = {
+        "n": [],
+        "c": [np.ones(nobs)],
+        "ct": [np.ones(nobs), trend],
+        "ctt": [np.ones(nobs), trend, trend**2],
+    }[regression]
+    return np.column_stack(columns) if columns else np.empty((nobs, 0))
+
+
+def _stack_trend(X: np.ndarray, trend: np.ndarray, prepend: bool) -> np.ndarray:
+    trend = np.broadcast_to(trend, (X.shape[0],) + trend.shape)
+    return np.concatenate([trend, X] if prepend else [X, trend], axis=-1)
+
+
+def _ols_batch(X: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Solve the least-squares problems `y[i] ~ X[i]` for every series `i` at once, with a single stacked QR decomposition.
+
+    Because the fits for every leading subset of the columns of `X` share the same QR factors, the residual sum of squares and the t-value of the last coefficient are also returned for every nested model `X[i, :, :k]`.
+    """
+    nobs, ncols = X.shape[1], X.shape[2]
+    Q, R = np.linalg.qr(X)
+    qty = np.einsum("ntk,nt->nk", Q, y)
+    ssr = np.einsum("nt,nt->n", y, y)[:, None] - np.cumsum(qty**2, axis=-1)
+    ssr = np.maximum(ssr, 0.0)
+    k = np.arange(1, ncols + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tlast = qty / np.sqrt(ssr / (nobs - k))
+        params = np.linalg.solve(R, qty[..., None])[..., 0]
+        Rinv = np.linalg.inv(R)
+        bse = np.sqrt(ssr[:, -1:] / (nobs - ncols) * np.sum(Rinv**2, axis=-1))
+    return {
+        "params": params,
+        "bse": bse,
+        "ssr": ssr,
+        "tlast": np.abs(tlast),
+        "resid": y - np.einsum("ntk,nk->nt", X, params),
+    }
+
+
+@lru_cache(maxsize=None)
+def _mackinnon_table(regression: str) -> Dict[str, Union[float, np.ndarray]]:
+    """
+    The MacKinnon (1994) response-surface coefficients for a single series, reversed once into `np.polyval()` order.
+    """
+    from statsmodels.tsa.adfvalues import (
+        _tau_largeps,
+        _tau_maxs,
+        _tau_mins,
+        _tau_smallps,
+        _tau_stars,
+    )
+
+    return {
+        "max": _tau_maxs[regression][0],
+        "min": _tau_mins[regression][0],
+        "star": _tau_stars[regression][0],
+        "small": np.asarray(_tau_smallps[regression][0])[::-1],
+        "large": np.asarray(_tau_largeps[regression][0])[::-1],
+    }
+
+
+def _mackinnonp(stat: np.ndarray, regression: str) -> np.ndarray:
+    """
+    A vectorised `statsmodels.tsa.adfvalues.mackinnonp()` for a single series (`N=1`).
+    """
+    from scipy.stats import norm
+
+    table = _mackinnon_table(regression)
+    stat = np.asarray(stat, dtype=np.float64)
+    small = norm.cdf(np.polyval(table["small"], stat))
+    large = norm.cdf(np.polyval(table["large"], stat))
+    pvalue = np.where(stat <= table["star"], small, large)
+    pvalue = np.where(stat > table["max"], 1.0, pvalue)
+    return np.where(stat < table["min"], 0.0, pvalue)
+
+
+def _mackinnoncrit(regression: str, nobs: np.ndarray) -> Dict[str, np.ndarray]:
+    from statsmodels.tsa.adfvalues import mackinnoncrit
+
+    crit = {
+        nob: mackinnoncrit(N=1, regression=regression, nobs=nob)
+        for nob in set(nobs.tolist())
+    }
+    values = np.array([crit[nob] for nob in nobs.tolist()])
+    return {"1%": values[:, 0], "5%": values[:, 1], "10%": values[:, 2]}
+
+
+def _adf_design(x: np.ndarray, lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The lagged level and the first `lag` lagged differences (the columns of `lagmat(original="in")`), and the differences they explain.
+    """
+    xdiff = np.diff(x, axis=-1)
+    nobs = xdiff.shape[-1] - lag
+    columns = [x[:, lag:-1]] + [
+        xdiff[:, lag - j : lag - j + nobs] for j in range(1, lag + 1)
+    ]
+    return np.stack(columns, axis=-1), xdiff[:, lag:]
+
+
+def _adf_batch(
+    x: np.ndarray, maxlag: int, regression: str, autolag: Optional[str]
+) -> Dict[str, np.ndarray]:
+    nseries = x.shape[0]
+    if autolag is None:
+        usedlag = np.full(nseries, maxlag)
+        icbest = None
+    else:
+        # Every candidate lag is fitted on the same rows, so one decomposition of the widest design covers them all.
+        X, y = _adf_design(x, maxlag)
+        nobs = y.shape[-1]
+        trend = _trend(regression, nobs)
+        startlag = trend.shape[1] + 1
+        fit = _ols_batch(_stack_trend(X, trend, prepend=True), y)
+        k = np.arange(startlag, startlag + maxlag + 1)
+        if autolag == "t-stat":
+            tlast = fit["tlast"][:, k - 1]
+            significant = tlast >= _TSTAT_STOP
+            # The highest lag with a significant last coefficient, else the lowest lag.
+            best = np.where(
+                significant.any(axis=-1),
+                maxlag - np.argmax(significant[:, ::-1], axis=-1),
+                0,
+            )
+            icbest = tlast[np.arange(nseries), best]
+        else:
+            llf = (
+                -nobs
+                / 2
+                * (np.log(2 * np.pi) + np.log(fit["ssr"][:, k - 1] / nobs) + 1)
+            )
+            penalty = 2 * k if autolag == "aic" else np.log(nobs) * k
+            ic = -2 * llf + penalty
+            best = np.argmin(ic, axis=-1)
+            icbest = ic[np.arange(nseries), best]
+        usedlag = best
+
+    stat = np.empty(nseries)
+    nobs = np.empty(nseries, dtype=int)
+    for lag in np.unique(usedlag):
+        rows = usedlag == lag
+        X, y = _adf_design(x[rows], int(lag))
+        fit = _ols_batch(
+            _stack_trend(X, _trend(regression, y.shape[-1]), prepend=False), y
+        )
+        stat[rows] = fit["params"][:, 0] / fit["bse"][:, 0]
+        nobs[rows] = y.shape[-1]
+
+    return {
+        "stat": stat,
+        "pvalue": _mackinnonp(stat, regression),
+        "usedlag": usedlag,
+        "nobs": nobs,
+        "crit": _mackinnoncrit(regression, nobs),
+        "icbest": icbest,
+    }
+
+
+def _autocov_products(resid: np.ndarray, nlags: int) -> np.ndarray:
+    """
+    The raw lagged cross-products `sum(resid[t] * resid[t-i])` for `i = 0, ..., nlags`.
+    """
+    nobs = resid.shape[-1]
+    return np.stack(
+        [
+            np.einsum("nt,nt->n", resid[:, i:], resid[:, : nobs - i])
+            for i in range(nlags + 1)
+        ],
+        axis=-1,
+    )
+
+
+def _newey_west(products: np.ndarray, lags: np.ndarray, nobs: int) -> np.ndarray:
+    """
+    The Bartlett-kernel long-run variance from the lagged cross-products, with a (possibly different) bandwidth for every series.
+    """
+    i = np.arange(products.shape[-1])
+    weights = np.clip(1 - i / (lags[:, None] + 1.0), 0.0, None)
+    weights[:, 0] = 0.5
+    return 2 * np.sum(weights * products, axis=-1) / nobs
+
+
+def _warn_interpolation(pvalue: np.ndarray, smallest: float, largest: float) -> None:
+    from statsmodels.tools.sm_exceptions import InterpolationWarning
+
+    message = (
+        "The test statistic is outside of the range of p-values available in the "
+        "look-up table. The actual p-value is {direction} than the p-value returned."
+    )
+    if np.any(pvalue == smallest):
+        warnings.warn(message.format(direction="smaller"), InterpolationWarning)
+    if np.any(pvalue == largest):
+        warnings.warn(message.format(direction="greater"), InterpolationWarning)
+
+
+def _kpss_batch(
+    x: np.ndarray, regression: str, nlags: Union[str, int]
+) -> Dict[str, np.ndarray]:
+    nseries, nobs = x.shape
+    if regression == "ct":
+        # The same design for every series, so a single projection detrends them all.
+        trend = _trend("ct", nobs)
+        resid = x - (trend @ np.linalg.lstsq(trend, x.T, rcond=None)[0]).T
+    else:
+        resid = x - x.mean(axis=-1, keepdims=True)
+
+    if nlags == "auto":
+        # The bandwidth selection of Hobijn et al. (1998).
+        covlags = int(np.power(nobs, 2.0 / 9.0))
+        products = _autocov_products(resid, covlags) / nobs
+        i = np.arange(1, covlags + 1)
+        s0 = products[:, 0] + 2 * products[:, 1:].sum(axis=-1)
+        s1 = 2 * (i * products[:, 1:]).sum(axis=-1)
+        gamma = 1.1447 * np.power((s1 / s0) ** 2, 1.0 / 3.0)
+        lags = np.minimum((gamma * np.power(nobs, 1.0 / 3.0)).astype(int), nobs - 1)
+    elif nlags == "legacy":
+        lags = np.full(
+            nseries, min(int(ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0))), nobs - 1)
+        )
+    else:
+        if nlags >= nobs:
+            raise ValueError(
+                f"Invalid value for `nlags`: {nlags}.\n"
+                f"Must be less than the number of observations ({nobs})."
+            )
+        lags = np.full(nseries, nlags)
+
+    eta = np.sum(np.cumsum(resid, axis=-1) ** 2, axis=-1) / nobs**2
+    s_hat = _newey_west(_autocov_products(resid, int(lags.max())), lags, nobs)
+    stat = eta / s_hat
+    pvalue = np.interp(stat, _KPSS_CRIT[regression], _KPSS_PVALS)
+    crit = _KPSS_CRIT[regression]
+    return {
+        "stat": stat,
+        "pvalue": pvalue,
+        "lags": lags,
+        "crit": {"10%": crit[0], "5%": crit[1], "2.5%": crit[2], "1%": crit[3]},
+    }
+
+
+def _pp_batch(
+    x: np.ndarray, lags: Optional[int], regression: str
+) -> Dict[str, np.ndarray]:
+    nseries, length = x.shape
+    if lags is None:
+        lags = int(ceil(12.0 * np.power(length / 100.0, 1 / 4.0)))
+    nobs = length - 1
+    if lags > nobs:
+        raise ValueError(
+            f"Invalid value for `lags`: {lags}.\n"
+            f"Must not exceed the number of observations ({nobs})."
+        )
+    X = _stack_trend(x[:, :-1, None], _trend(regression, nobs), prepend=False)
+    fit = _ols_batch(X, x[:, 1:])
+    k = X.shape[-1]
+    u = fit["resid"]
+    lam2 = _newey_west(_autocov_products(u, lags), np.full(nseries, lags), nobs)
+    lam = np.sqrt(lam2)
+    s2 = np.einsum("nt,nt->n", u, u) / (nobs - k)
+    gamma0 = s2 * (nobs - k) / nobs
+    rho, sigma = fit["params"][:, 0], fit["bse"][:, 0]
+    stat = np.sqrt(gamma0 / lam2) * ((rho - 1) / sigma) - 0.5 * (
+        (lam2 - gamma0) / lam
+    ) * (nobs * sigma / np.sqrt(s2))
+    return {
+        "stat": stat,
+        "pvalue": _mackinnonp(stat, regression),
+        "lags": np.full(nseries, lags),
+        "nobs": np.full(nseries, nobs),
+        "crit": _mackinnoncrit(regression, np.full(nseries, nobs)),
+    }
+
+
+# ------------------------------------------------------------------------------#
+# Tests                                                                      ####
+# ------------------------------------------------------------------------------#
+
+
+def _unpack(result: Dict, keys: Tuple[str, ...], single: bool) -> tuple:
+    values = []
+    for key in keys:
+        value = result[key]
+        if single and isinstance(value, dict):
+            value = {name: float(np.ravel(crit)[0]) for name, crit in value.items()}
+        elif single:
+            value = value[0].item()
+        values.append(value)
+    return tuple(values)
+
+
+@typechecked
+def adf(
+    x: array_like,
+    maxlag: Optional[int] = None,
+    regression: str = "c",
+    autolag: Optional[str] = "AIC",
+    axis: int = -1,
+) -> Tuple[Union[float, np.ndarray, int, Dict], ...]:
+    """
+    Summary:
+        Implement the Augmented Dickey-Fuller unit root test.
+
+    Params:
+        x (array_like):
+            The time series data to test. Either a single series, or a 2D panel of equal-length series.
+        maxlag (Optional[int], optional):
+            The maximum number of lagged differences to include in the regression. Defaults to `None`, which uses `12*(nobs/100)^{1/4}`.
+        regression (str, optional):
+            The deterministic terms to include in the regression. Must be one of `"c"` (constant), `"ct"` (constant and trend), `"ctt"` (constant, linear and quadratic trend) or `"n"` (none). Defaults to `"c"`.
+        autolag (Optional[str], optional):
+            How to choose the number of lagged differences. Must be one of `"AIC"`, `"BIC"`, `"t-stat"`, or `None` to always use `maxlag`. Defaults to `"AIC"`.
+        axis (int, optional):
+            The axis of a 2D `x` along which the observations lie. Defaults to `-1`.
+
+    Raises:
+        ValueError:
+            If any of the options are not recognised, if `maxlag` is too large for the length of the series, or if any series is constant or contains missing values.
+
+    Returns:
+        Tuple[Union[float, np.ndarray, int, Dict], ...]:
+            The same values as `statsmodels.tsa.stattools.adfuller()`: the test statistic, the p-value, the number of lags used, the number of observations used in the regression, the critical values, and (only when `autolag` is not `None`) the best information criterion.
+            When `x` is 2D, each of these is an array with one value per series, and the critical values are a dictionary of arrays.
+
+    ???+ Info "Details"
+        The null hypothesis is that the series has a unit root. This is a vectorised re-implementation of `statsmodels.tsa.stattools.adfuller()`, and returns the same results for a single series.
+        When selecting the number of lags, every candidate regression is fitted on the same observations, so the fits for all candidate lags (and all series) come from one stacked QR decomposition of the widest design. The final regressions are then solved together for all series which selected the same number of lags.
+        For more details, see:
+            - [statsmodels/adfuller](https://www.statsmodels.org/stable/generated/statsmodels.tsa.stattools.adfuller.html)
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> adf(x=data)[:2]
+        (0.8153688792060229, 0.9918802434376406)
+        ```
+        Panel usage:
+        ```python linenums="1"
+        >>> import numpy as np
+        >>> panel = np.vstack([data.values, np.diff(data.values, prepend=data.values[0])])
+        >>> adf(x=panel, autolag=None)[0]
+        array([ 0.89398365, -2.71309615])
+        ```
+    """
+    autolag = autolag.lower() if isinstance(autolag, str) else autolag
+    _check_option("regression", regression, ADF_REGRESSIONS)
+    _check_option("autolag", autolag, ADF_AUTOLAGS)
+    x, single = _as_panel(x, axis=axis)
+    _check_panel(x)
+    nobs = x.shape[-1]
+    ntrend = len(regression) if regression != "n" else 0
+    if maxlag is None:
+        maxlag = min(
+            nobs // 2 - ntrend - 1, int(ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+        )
+        if maxlag < 0:
+            raise ValueError(
+                f"The sample size ({nobs}) is too short to use the `{regression}` regression."
+            )
+    elif not 0 <= maxlag <= nobs // 2 - ntrend - 1:
+        raise ValueError(
+            f"Invalid value for `maxlag`: {maxlag}.\n"
+            f"Must be between `0` and `nobs/2 - 1 - ntrend` ({nobs // 2 - ntrend - 1})."
+        )
+    result = _adf_batch(x, maxlag=maxlag, regression=regression, autolag=autolag)
+    keys = ("stat", "pvalue", "usedlag", "nobs", "crit")
+    if autolag is not None:
+        keys += ("icbest",)
+    return _unpack(result, keys, single)
+
+
+@typechecked
+def kpss(
+    x: array_like,
+    regression: str = "c",
+    nlags: Union[str, int] = "auto",
+    axis: int = -1,
+) -> Tuple[Union[float, np.ndarray, int, Dict], ...]:
+    """
+    Summary:
+        Implement the Kwiatkowski-Phillips-Schmidt-Shin test for stationarity.
+
+    Params:
+        x (array_like):
+            The time series data to test. Either a single series, or a 2D panel of equal-length series.
+        regression (str, optional):
+            The null hypothesis. Must be one of `"c"` (the data is stationary around a constant) or `"ct"` (the data is stationary around a trend). Defaults to `"c"`.
+        nlags (Union[str, int], optional):
+            The number of lags in the long-run variance estimate. Either an integer, `"auto"` (the data-dependent bandwidth of Hobijn et al. (1998), chosen separately for every series) or `"legacy"` (`12*(nobs/100)^{1/4}`). Defaults to `"auto"`.
+        axis (int, optional):
+            The axis of a 2D `x` along which the observations lie. Defaults to `-1`.
+
+    Raises:
+        ValueError:
+            If any of the options are not recognised, if `nlags` is not less than the number of observations, or if any series is constant or contains missing values.
+
+    Returns:
+        Tuple[Union[float, np.ndarray, int, Dict], ...]:
+            The same values as `statsmodels.tsa.stattools.kpss()`: the test statistic, the p-value, the number of lags used, and the critical values.
+            When `x` is 2D, the first three are arrays with one value per series.
+
+    ???+ Info "Details"
+        The null hypothesis is that the series is stationary, which is the opposite of `adf()` and `pp()`. This is a vectorised re-implementation of `statsmodels.tsa.stattools.kpss()`, and returns the same results for a single series.
+        The p-values are interpolated from the table of Kwiatkowski et al. (1992), so they are bounded between `0.01` and `0.1`. An `InterpolationWarning` is raised (once per call) if any statistic falls outside of the table.
+        For more details, see:
+            - [statsmodels/kpss](https://www.statsmodels.org/stable/generated/statsmodels.tsa.stattools.kpss.html)
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> kpss(x=data)[:3]
+        (1.6513122354165206, 0.01, 8)
+        ```
+    """
+    _check_option("regression", regression, KPSS_REGRESSIONS)
+    if isinstance(nlags, str):
+        _check_option("nlags", nlags, ["auto", "legacy"])
+    x, single = _as_panel(x, axis=axis)
+    _check_panel(x)
+    result = _kpss_batch(x, regression=regression, nlags=nlags)
+    _warn_interpolation(result["pvalue"], _KPSS_PVALS[-1], _KPSS_PVALS[0])
+    return _unpack(result, ("stat", "pvalue", "lags", "crit"), single)
+
+
+@typechecked
+def pp(
+    x: array_like,
+    lags: Optional[int] = None,
+    regression: str = "c",
+    axis: int = -1,
+) -> Tuple[Union[float, np.ndarray, int, Dict], ...]:
+    """
+    Summary:
+        Implement the Phillips-Perron unit root test.
+
+    Params:
+        x (array_like):
+            The time series data to test. Either a single series, or a 2D panel of equal-length series.
+        lags (Optional[int], optional):
+            The number of lags in the Newey-West long-run variance estimate. Defaults to `None`, which uses `12*(nobs/100)^{1/4}`.
+        regression (str, optional):
+            The deterministic terms to include in the regression. Must be one of `"c"` (constant), `"ct"` (constant and trend) or `"n"` (none). Defaults to `"c"`.
+        axis (int, optional):
+            The axis of a 2D `x` along which the observations lie. Defaults to `-1`.
+
+    Raises:
+        ValueError:
+            If any of the options are not recognised, if `lags` exceeds the number of observations, or if any series is constant or contains missing values.
+
+    Returns:
+        Tuple[Union[float, np.ndarray, int, Dict], ...]:
+            The test statistic, the p-value, the number of lags used, the number of observations used in the regression, and the critical values.
+            When `x` is 2D, each of these is an array with one value per series, and the critical values are a dictionary of arrays.
+
+    ???+ Info "Details"
+        The null hypothesis is that the series has a unit root. Unlike `adf()`, the serial correlation in the errors is handled by a non-parametric (Newey-West) correction of the `Z-tau` statistic, rather than by adding lagged differences to the regression.
+        This follows the `PhillipsPerron` test of the `arch` package, and uses the same MacKinnon (1994) p-values and MacKinnon (2010) critical values as `adf()`.
+        For more details, see:
+            - [arch/PhillipsPerron](https://arch.readthedocs.io/en/latest/unitroot/generated/arch.unitroot.PhillipsPerron.html)
 
-# """
-# For a really good article on ADF & KPSS tests, check: [When A Time Series Only Quacks Like A Duck: Testing for Stationarity Before Running Forecast Models. With Python. And A Duckling Picture.](https://towardsdatascience.com/when-a-time-series-only-quacks-like-a-duck-10de9e165e)
-# """
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> data = load_airline()
+        >>> pp(x=data)[:3]
+        (-1.3511383338496277, 0.6054641645706575, 14)
+        ```
+    """
+    _check_option("regression", regression, PP_REGRESSIONS)
+    x, single = _as_panel(x, axis=axis)
+    _check_panel(x)
+    result = _pp_batch(x, lags=lags, regression=regression)
+    return _unpack(result, ("stat", "pvalue", "lags", "nobs", "crit"), single)
@@ -0,0 +1,65 @@
+"""
+Benchmark the native entropy engine in `src.regularity` against `antropy`.
+
+Usage:
+    python -m src.tests.benchmarks.bench_regularity
+    python -m src.tests.benchmarks.bench_regularity --lengths 1000 10000 100000 1000000 --antropy-max 50000
+"""
+
+import argparse
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+from antropy import app_entropy as a_app_entropy
+from antropy import sample_entropy as a_sample_entropy
+
+from src.regularity import approx_entropy
+from src.regularity import sample_entropy
+
+
+def _time(func: Callable[[], float]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(lengths: List[int], antropy_max: int, seed: Optional[int] = 42) -> None:
+    rng = np.random.default_rng(seed)
+    print(
+        f"{'algorithm':<10}{'length':>10}{'native (s)':>14}{'antropy (s)':>14}{'abs diff':>12}"
+    )
+    for length in lengths:
+        x = rng.normal(size=length)
+        for name, native, reference in [
+            ("sample", sample_entropy, a_sample_entropy),
+            ("approx", approx_entropy, a_app_entropy),
+        ]:
+            native_value = native(x)
+            native_time = _time(lambda: native(x))
+            if length <= antropy_max:
+                reference_value = reference(x)
+                reference_time = f"{_time(lambda: reference(x)):>14.4f}"
+                diff = f"{abs(native_value - reference_value):>12.2e}"
+            else:
+                reference_time, diff = f"{'-':>14}", f"{'-':>12}"
+            print(f"{name:<10}{length:>10}{native_time:>14.4f}{reference_time}{diff}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[10**3, 10**4, 10**5, 10**6],
+        help="The series lengths to benchmark.",
+    )
+    parser.add_argument(
+        "--antropy-max",
+        type=int,
+        default=50_000,
+        help="The longest series to also run through `antropy`, which slows down quickly.",
+    )
+    args = parser.parse_args()
+    run(lengths=args.lengths, antropy_max=args.antropy_max)
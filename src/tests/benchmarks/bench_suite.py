@@ -0,0 +1,390 @@
+"""
+Benchmark every public test across series length and batch size, and compare the results between commits.
+
+Usage:
+    python -m src.tests.benchmarks.bench_suite
+    python -m src.tests.benchmarks.bench_suite --functions acf qs --lengths 100 10000 --batches 1 100
+    python -m src.tests.benchmarks.bench_suite --output before.json
+    python -m src.tests.benchmarks.bench_suite --compare before.json
+    python -m src.tests.benchmarks.bench_suite --compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.correlation import acf, ccf, pacf
+from src.regularity import entropy, is_regular
+from src.seasonality import (
+    ch,
+    clear_stl_cache,
+    ocsb,
+    qs,
+    seasonal_strength,
+    spikiness,
+    trend_strength,
+)
+from src.stability import lumpiness, stability
+from src.tests.benchmarks.generators import make_panel
+
+
+FREQ = 12
+
+# Each case runs one function over a `(batch, length)` panel. `single` runs on one series, `panel` (if given) runs on the whole panel at once, and otherwise `single` is looped over the rows. Cases are skipped for series longer than `max_length`.
+CASES: Dict[str, Dict[str, Any]] = {
+    "acf": {
+        "single": lambda x: acf(x, nlags=min(40, len(x) - 1)),
+        "panel": lambda x: acf(x, nlags=min(40, x.shape[-1] - 1)),
+        "max_length": 10**6,
+    },
+    "pacf": {
+        "single": lambda x: pacf(x, nlags=min(40, len(x) // 2 - 1)),
+        "panel": lambda x: pacf(x, nlags=min(40, x.shape[-1] // 2 - 1)),
+        "max_length": 10**6,
+    },
+    "ccf": {
+        "single": lambda x: ccf(x, np.roll(x, FREQ)),
+        "max_length": 10**6,
+    },
+    "entropy": {
+        "single": lambda x: entropy(x),
+        "max_length": 10**5,
+    },
+    "is_regular": {
+        "single": lambda x: is_regular(x),
+        "max_length": 10**5,
+    },
+    "qs": {
+        "single": lambda x: qs(x, freq=FREQ),
+        "max_length": 10**6,
+    },
+    "ocsb": {
+        "single": lambda x: ocsb(x, m=FREQ),
+        "max_length": 10**4,
+    },
+    "ch": {
+        "single": lambda x: ch(x, m=FREQ),
+        "max_length": 10**4,
+    },
+    "seasonal_strength": {
+        "single": lambda x: seasonal_strength(x, m=FREQ),
+        "setup": clear_stl_cache,
+        "max_length": 10**5,
+    },
+    "trend_strength": {
+        "single": lambda x: trend_strength(x, m=FREQ),
+        "setup": clear_stl_cache,
+        "max_length": 10**5,
+    },
+    "spikiness": {
+        "single": lambda x: spikiness(x, m=FREQ),
+        "setup": clear_stl_cache,
+        "max_length": 10**5,
+    },
+    "stability": {
+        "single": lambda x: stability(x, freq=FREQ),
+        "max_length": 10**6,
+    },
+    "lumpiness": {
+        "single": lambda x: lumpiness(x, freq=FREQ),
+        "max_length": 10**6,
+    },
+}
+
+LENGTHS = [10**2, 10**3, 10**4, 10**5, 10**6]
+BATCHES = [1, 10, 10**2, 10**3, 10**4]
+
+# Timings shorter than this are dominated by noise, so are never reported as regressions.
+MIN_SECONDS = 1e-3
+
+
+# ------------------------------------------------------------------------------#
+# Running                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+def _runner(case: Dict[str, Any], panel: np.ndarray) -> Callable[[], None]:
+    if panel.shape[0] == 1:
+        return lambda: case["single"](panel[0])
+    if "panel" in case:
+        return lambda: case["panel"](panel)
+    return lambda: [case["single"](row) for row in panel]
+
+
+def _measure(case: Dict[str, Any], panel: np.ndarray, repeat: int) -> Dict[str, Any]:
+    run, setup = _runner(case, panel), case.get("setup", lambda: None)
+
+    # Time without `tracemalloc`, which slows down every allocation, and keep the best of `repeat` runs. A slow first run is not repeated.
+    timings = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        if timings[0] > 1.0:
+            break
+
+    setup()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mib": peak / 2**20}
+
+
+def run(
+    functions: Sequence[str] = tuple(CASES),
+    lengths: Sequence[int] = LENGTHS,
+    batches: Sequence[int] = BATCHES,
+    max_points: int = 10**6,
+    repeat: int = 3,
+    seed: int = 42,
+    verbose: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Summary:
+        Time every function on every combination of series length and batch size.
+
+    Params:
+        functions (Sequence[str], optional):
+            The names of the functions to benchmark, from `CASES`. Defaults to all of them.
+        lengths (Sequence[int], optional):
+            The series lengths. Defaults to `10^2` to `10^6`.
+        batches (Sequence[int], optional):
+            The number of series in each batch. Defaults to `1` to `10^4`.
+        max_points (int, optional):
+            Skip any combination where `length * batch` is larger than this. Defaults to `10^6`.
+        repeat (int, optional):
+            The number of timed runs, of which the fastest is kept. Defaults to `3`.
+        seed (int, optional):
+            The random seed of the generated panels. Defaults to `42`.
+        verbose (bool, optional):
+            Whether or not to print each result as it completes. Defaults to `True`.
+
+    Returns:
+        List[Dict[str, Any]]:
+            One record per function, length and batch size, with the best time in `seconds`, the peak traced memory in `peak_mib`, and a `status` of `"ok"`, `"skipped"` or `"error"`.
+    """
+    invalid = [name for name in functions if name not in CASES]
+    if invalid:
+        raise ValueError(
+            f"Invalid option for `functions` parameter: {invalid}.\n"
+            f"Valid options are: {list(CASES)}."
+        )
+    # The first call of each function pays for its lazy imports and any `numba` compilation, which is not what is being measured.
+    warmup = make_panel(1, 10**2, freq=FREQ, seed=seed)[0]
+    for name in functions:
+        CASES[name]["single"](warmup)
+
+    if verbose:
+        print(_header())
+    results = []
+    for length in lengths:
+        for batch in batches:
+            panel = None
+            for name in functions:
+                record = {"function": name, "length": length, "batch": batch}
+                case = CASES[name]
+                if length > case["max_length"] or length * batch > max_points:
+                    record.update(seconds=None, peak_mib=None, status="skipped")
+                    results.append(record)
+                    continue
+                if panel is None:
+                    panel = make_panel(batch, length, freq=FREQ, seed=seed)
+                try:
+                    record.update(_measure(case, panel, repeat=repeat), status="ok")
+                except Exception as err:
+                    record.update(
+                        seconds=None,
+                        peak_mib=None,
+                        status="error",
+                        message=f"{type(err).__name__}: {err}",
+                    )
+                results.append(record)
+                if verbose:
+                    print(_row(record))
+    return results
+
+
+# ------------------------------------------------------------------------------#
+# Baselines                                                                  ####
+# ------------------------------------------------------------------------------#
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results: List[Dict[str, Any]], path: Optional[str] = None) -> Path:
+    """
+    Summary:
+        Save the results as a JSON baseline, along with the commit and environment they were measured on.
+
+    Params:
+        results (List[Dict[str, Any]]):
+            The output of `run()`.
+        path (Optional[str], optional):
+            Where to save the baseline. Defaults to `None`, which uses `.benchmarks/<commit>.json`.
+
+    Returns:
+        Path:
+            The path of the saved file.
+    """
+    commit = _commit()
+    path = Path(path or Path(".benchmarks") / f"{commit or 'local'}.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    return path
+
+
+def load(path: str) -> List[Dict[str, Any]]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def compare(
+    baseline: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+    threshold: float = 1.25,
+    verbose: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Summary:
+        Compare two sets of results, matched on function, length and batch size.
+
+    Params:
+        baseline (List[Dict[str, Any]]):
+            The reference results.
+        current (List[Dict[str, Any]]):
+            The new results.
+        threshold (float, optional):
+            The ratio of current to baseline time above which a result is a regression. Defaults to `1.25`.
+        verbose (bool, optional):
+            Whether or not to print the comparison. Defaults to `True`.
+
+    Returns:
+        List[Dict[str, Any]]:
+            The matched results which regressed.
+    """
+    key = lambda record: (record["function"], record["length"], record["batch"])
+    reference = {key(record): record for record in baseline if record["status"] == "ok"}
+    regressions = []
+    if verbose:
+        print(
+            f"{'function':<18}{'length':>9}{'batch':>7}{'before (s)':>12}{'after (s)':>12}{'ratio':>8}{'memory':>8}"
+        )
+    for record in current:
+        before = reference.get(key(record))
+        if before is None or record["status"] != "ok":
+            continue
+        ratio = record["seconds"] / max(before["seconds"], 1e-12)
+        memory = record["peak_mib"] / max(before["peak_mib"], 1e-12)
+        regressed = ratio > threshold and record["seconds"] > MIN_SECONDS
+        if regressed:
+            regressions.append({**record, "baseline_seconds": before["seconds"]})
+        if verbose:
+            print(
+                f"{record['function']:<18}{record['length']:>9}{record['batch']:>7}"
+                f"{before['seconds']:>12.4f}{record['seconds']:>12.4f}{ratio:>8.2f}{memory:>8.2f}"
+                + ("  REGRESSION" if regressed else "")
+            )
+    return regressions
+
+
+def _header() -> str:
+    return f"{'function':<18}{'length':>9}{'batch':>7}{'seconds':>12}{'peak MiB':>10}  status"
+
+
+def _row(record: Dict[str, Any]) -> str:
+    if record["status"] != "ok":
+        return f"{record['function']:<18}{record['length']:>9}{record['batch']:>7}{'-':>12}{'-':>10}  {record['status']}: {record.get('message', '')}"
+    return f"{record['function']:<18}{record['length']:>9}{record['batch']:>7}{record['seconds']:>12.4f}{record['peak_mib']:>10.2f}  ok"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--functions",
+        nargs="+",
+        default=list(CASES),
+        choices=list(CASES),
+        help="The functions to benchmark.",
+    )
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=LENGTHS, help="The series lengths."
+    )
+    parser.add_argument(
+        "--batches", type=int, nargs="+", default=BATCHES, help="The batch sizes."
+    )
+    parser.add_argument(
+        "--max-points",
+        type=int,
+        default=10**6,
+        help="Skip any combination where `length * batch` is larger than this.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="The number of timed runs to keep the best of.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Where to save the JSON baseline. Defaults to `.benchmarks/<commit>.json`.",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="BASELINE",
+        default=None,
+        help="Compare against a saved baseline. With two files, compare them without running anything.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="The slow-down ratio which counts as a regression.",
+    )
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        current = load(args.compare[1])
+    else:
+        current = run(
+            functions=args.functions,
+            lengths=args.lengths,
+            batches=args.batches,
+            max_points=args.max_points,
+            repeat=args.repeat,
+        )
+        print(f"Saved to {save(current, args.output)}")
+    if args.compare:
+        regressions = compare(load(args.compare[0]), current, threshold=args.threshold)
+        print(f"{len(regressions)} regression(s) above {args.threshold}x.")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,99 @@
+"""
+Synthetic time series for the benchmarks.
+
+Every series is the sum of a linear trend, a sinusoidal seasonal pattern and Gaussian noise, so each test has something to find whatever the length.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+__all__ = ["trend", "seasonal", "noise", "seasonal_series", "make_panel"]
+
+
+def trend(length: int, slope: float = 0.01, intercept: float = 10.0) -> np.ndarray:
+    return intercept + slope * np.arange(length, dtype=np.float64)
+
+
+def seasonal(length: int, freq: int = 12, amplitude: float = 1.0) -> np.ndarray:
+    return amplitude * np.sin(2 * np.pi * np.arange(length) / freq)
+
+
+def noise(
+    length: int, scale: float = 0.5, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    rng = rng if rng is not None else np.random.default_rng()
+    return rng.normal(scale=scale, size=length)
+
+
+def seasonal_series(
+    length: int,
+    freq: int = 12,
+    slope: float = 0.01,
+    amplitude: float = 1.0,
+    scale: float = 0.5,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Summary:
+        Generate one trend + seasonal + noise series.
+
+    Params:
+        length (int):
+            The number of observations.
+        freq (int, optional):
+            The period of the seasonal pattern. Defaults to `12`.
+        slope (float, optional):
+            The slope of the linear trend. Defaults to `0.01`.
+        amplitude (float, optional):
+            The amplitude of the seasonal pattern. Defaults to `1.0`.
+        scale (float, optional):
+            The standard deviation of the noise. Defaults to `0.5`.
+        seed (Optional[int], optional):
+            The random seed. Defaults to `None`.
+
+    Returns:
+        np.ndarray:
+            The series, with shape `(length,)`.
+    """
+    rng = np.random.default_rng(seed)
+    return (
+        trend(length, slope=slope)
+        + seasonal(length, freq=freq, amplitude=amplitude)
+        + noise(length, scale=scale, rng=rng)
+    )
+
+
+def make_panel(
+    batch: int, length: int, freq: int = 12, seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Summary:
+        Generate a panel of trend + seasonal + noise series, with a random slope, amplitude and noise level for every series.
+
+    Params:
+        batch (int):
+            The number of series.
+        length (int):
+            The number of observations in each series.
+        freq (int, optional):
+            The period of the seasonal patterns. Defaults to `12`.
+        seed (Optional[int], optional):
+            The random seed. Defaults to `None`.
+
+    Returns:
+        np.ndarray:
+            The panel, with shape `(batch, length)` and one series per row.
+    """
+    rng = np.random.default_rng(seed)
+    slopes = rng.uniform(-0.02, 0.02, size=(batch, 1))
+    amplitudes = rng.uniform(0.0, 2.0, size=(batch, 1))
+    scales = rng.uniform(0.1, 1.0, size=(batch, 1))
+    time = np.arange(length, dtype=np.float64)
+    return (
+        10.0
+        + slopes * time
+        + amplitudes * np.sin(2 * np.pi * time / freq)
+        + scales * rng.standard_normal((batch, length))
+    )
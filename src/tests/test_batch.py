@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from src.batch import run_batch
+from src.seasonality import ch
+from src.seasonality import qs
+from src.tests.test_base import BaseTester
+
+
+class BatchTests(BaseTester):
+    def setUp(self) -> None:
+        self.panel = np.vstack([self.data.values, self.data.values[::-1], np.ones(144)])
+
+    def test_run_batch_array(self) -> None:
+        result = run_batch(self.panel, freq=12, tests=["qs", "ch"])
+        self.assertListEqual(
+            list(result.columns),
+            ["series_id", "test", "stat", "pval", "status", "message"],
+        )
+        self.assertEqual(len(result), 6)
+        self.assertListEqual(list(result["series_id"]), [0, 0, 1, 1, 2, 2])
+        self.assertAlmostEqual(result["stat"][0], qs(self.data, 12)["stat"])
+        self.assertAlmostEqual(result["pval"][0], qs(self.data, 12)["Pval"])
+        self.assertEqual(result["stat"][1], ch(self.data, 12))
+        self.assertListEqual(list(result["status"][:4]), ["ok"] * 4)
+
+    def test_run_batch_errors(self) -> None:
+        result = run_batch(self.panel, freq=12, tests="qs")
+        self.assertEqual(result["status"][2], "error")
+        self.assertTrue(result["message"][2].startswith("ValueError"))
+        self.assertTrue(np.isnan(result["stat"][2]))
+        result = run_batch(
+            self.panel[:1], freq=12, tests="qs", params={"qs": {"residuals": True}}
+        )
+        self.assertEqual(result["status"][0], "ok")
+        self.assertIn("residuals", result["message"][0])
+        missing = np.full((1, 50), np.nan)
+        result = run_batch(missing, freq=12, tests=["qs", "stability"])
+        self.assertListEqual(list(result["status"]), ["error", "error"])
+        self.assertListEqual(
+            list(result["message"]), ["ValueError: The series has no values."] * 2
+        )
+        with self.assertRaises(ValueError):
+            run_batch(self.panel, freq=12, tests=["error"])
+        with self.assertRaises(ValueError):
+            run_batch(self.data.values, freq=12)
+
+    def test_run_batch_frames(self) -> None:
+        expected = run_batch(self.panel[:2], freq=12, tests=["qs"])
+        wide = pd.DataFrame(self.panel[:2].T, columns=["a", "b"])
+        result = run_batch(wide, freq=12, tests=["qs"])
+        self.assertListEqual(list(result["series_id"]), ["a", "b"])
+        np.testing.assert_array_almost_equal(result["stat"], expected["stat"])
+        long = wide.melt(var_name="series_id", value_name="value")
+        result = run_batch(long, freq=12, tests=["qs"])
+        self.assertListEqual(list(result["series_id"]), ["a", "b"])
+        np.testing.assert_array_almost_equal(result["stat"], expected["stat"])
+
+    def test_run_batch_parallel(self) -> None:
+        expected = run_batch(self.panel, freq=12, tests=["qs", "ocsb"])
+        result = run_batch(self.panel, freq=12, tests=["qs", "ocsb"], n_jobs=2)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_run_batch_parallel_ragged(self) -> None:
+        long = pd.DataFrame(
+            {
+                "series_id": ["a"] * 144 + ["b"] * 100,
+                "value": np.concatenate([self.data.values, self.data.values[:100]]),
+            }
+        )
+        params = {"qs": {"residuals": True}}
+        expected = run_batch(long, freq=12, tests="qs", params=params, keep_models=True)
+        result = run_batch(
+            long, freq=12, tests="qs", params=params, keep_models=True, n_jobs=2
+        )
+        pd.testing.assert_frame_equal(
+            result.drop(columns="model"), expected.drop(columns="model")
+        )
+        self.assertEqual(str(result["model"][1]), str(expected["model"][1]))
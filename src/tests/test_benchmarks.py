@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.tests.benchmarks import bench_suite
+from src.tests.benchmarks.generators import make_panel, seasonal_series
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_generators(self) -> None:
+        series = seasonal_series(120, freq=12, seed=1)
+        self.assertEqual(series.shape, (120,))
+        np.testing.assert_array_equal(series, seasonal_series(120, freq=12, seed=1))
+        panel = make_panel(5, 48, seed=1)
+        self.assertEqual(panel.shape, (5, 48))
+        self.assertFalse(np.isnan(panel).any())
+
+    def test_run_save_compare(self) -> None:
+        results = bench_suite.run(
+            functions=["acf", "qs"],
+            lengths=[100, 1000],
+            batches=[1, 3],
+            max_points=1000,
+            repeat=1,
+            verbose=False,
+        )
+        self.assertEqual(len(results), 8)
+        statuses = {
+            (r["function"], r["length"], r["batch"]): r["status"] for r in results
+        }
+        self.assertEqual(statuses[("acf", 100, 3)], "ok")
+        self.assertEqual(statuses[("qs", 1000, 3)], "skipped")
+        ok = [r for r in results if r["status"] == "ok"]
+        self.assertTrue(all(r["seconds"] > 0 and r["peak_mib"] >= 0 for r in ok))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = bench_suite.save(results, str(Path(folder) / "baseline.json"))
+            baseline = bench_suite.load(str(path))
+        self.assertEqual(baseline, results)
+
+        slower = [dict(r, seconds=r["seconds"] * 2 + 1) for r in ok]
+        regressions = bench_suite.compare(baseline, slower, verbose=False)
+        self.assertEqual(len(regressions), len(ok))
+        self.assertListEqual(bench_suite.compare(baseline, ok, verbose=False), [])
+        with self.assertRaises(ValueError):
+            bench_suite.run(functions=["adf"], verbose=False)
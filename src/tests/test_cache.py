@@ -0,0 +1,83 @@
+import os
+import pickle
+import tempfile
+
+from src.regularity import is_regular
+from src.seasonality import qs
+from src.stability import stability
+from src.tests.test_base import BaseTester
+from src.utils.cache import DiskCache, disk_cache, get_disk_cache, set_disk_cache
+from src.utils.prepared import PreparedSeries
+
+
+class DiskCacheTests(BaseTester):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "cache.sqlite")
+
+    def tearDown(self) -> None:
+        set_disk_cache(None)
+        self.folder.cleanup()
+
+    def test_disk_cache(self) -> None:
+        cache = DiskCache(self.path, maxsize=3)
+        self.assertIsNone(cache.get("a"))
+        for key in "abc":
+            cache.put(key, {"value": key})
+        self.assertEqual(cache.get("a"), {"value": "a"})
+        cache.put("d", None)
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIsNone(cache.get("d", "missing"))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache.close()
+
+        reopened = pickle.loads(pickle.dumps(DiskCache(self.path)))
+        self.assertEqual(reopened.get("c"), {"value": "c"})
+        reopened.clear()
+        self.assertEqual(len(reopened), 0)
+        self.assertEqual(reopened.hits, 0)
+        with self.assertRaises(ValueError):
+            DiskCache(self.path, maxsize=0)
+
+    def test_disk_cache_bytes(self) -> None:
+        cache = DiskCache(self.path, max_bytes=1000)
+        for key in range(10):
+            cache.put(str(key), "x" * 300)
+        self.assertLessEqual(cache.nbytes, 1000)
+        self.assertEqual(len(cache), 3)
+        self.assertIn("9", cache)
+
+    def test_disk_cached(self) -> None:
+        self.assertIsNone(get_disk_cache())
+        expected = qs(x=self.data, freq=12)
+        with disk_cache(self.path) as cache:
+            self.assertIs(get_disk_cache(), cache)
+            self.assertEqual(qs(x=self.data, freq=12), expected)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertEqual(qs(self.data, 12), expected)
+            self.assertEqual(qs(PreparedSeries(self.data), 12), expected)
+            self.assertEqual((cache.hits, cache.misses), (2, 1))
+            qs(x=self.data, freq=4)
+            qs(x=self.data.values[::-1], freq=12)
+            stability(self.data)
+            self.assertEqual((cache.hits, cache.misses), (2, 4))
+        self.assertIsNone(get_disk_cache())
+
+        with disk_cache(DiskCache(self.path)) as cache:
+            self.assertEqual(qs(x=self.data, freq=12), expected)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_disk_cached_random(self) -> None:
+        # An unseeded resampled p-value is random, so it is never stored. A seeded one is.
+        with disk_cache(self.path) as cache:
+            for _ in range(2):
+                qs(x=self.data, freq=12, resample="permutation", n_resamples=19)
+                is_regular(x=self.data, resample="permutation", n_resamples=19)
+            # Only the deterministic `entropy()` inside `is_regular()` is stored.
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(len(cache), 1)
+            for _ in range(2):
+                qs(x=self.data, freq=12, resample="permutation", n_resamples=19, seed=0)
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
@@ -0,0 +1,156 @@
+import io
+import os
+import tempfile
+import unittest
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+from src.batch import run_batch
+from src.cli import _rows_batches, main, score
+from src.tests.test_base import BaseTester
+
+
+class CliTests(BaseTester):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        values = self.data.values.astype(float)
+        self.long = pd.DataFrame(
+            {
+                "series_id": ["a"] * 144 + ["b"] * 100 + ["c"] * 144,
+                "value": np.concatenate([values, values[:100], values[::-1]]),
+            }
+        )
+        self.expected = run_batch(self.long, freq=12, tests=["qs", "entropy"])
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.folder.name, name)
+
+    def test_score_long(self) -> None:
+        self.long.to_csv(self.path("long.csv"), index=False)
+        progress = io.StringIO()
+        count = score(
+            self.path("long.csv"),
+            self.path("out.csv"),
+            freq=12,
+            tests=["qs", "entropy"],
+            chunk_size=50,
+            progress=progress,
+        )
+        self.assertEqual(count, 3)
+        self.assertIn("3 series scored", progress.getvalue())
+        result = pd.read_csv(self.path("out.csv"), keep_default_na=False)
+        self.assertListEqual(
+            list(result["series_id"]), list(self.expected["series_id"])
+        )
+        np.testing.assert_allclose(result["stat"], self.expected["stat"])
+
+    def test_score_rows(self) -> None:
+        rows = pd.DataFrame(
+            [group["value"].to_numpy() for _, group in self.long.groupby("series_id")]
+        )
+        rows.insert(0, "series_id", ["a", "b", "c"])
+        rows.to_csv(self.path("rows.csv"), index=False)
+        status = main(
+            [
+                "score",
+                self.path("rows.csv"),
+                self.path("out.csv"),
+                "--freq=12",
+                "--tests=qs,entropy",
+                "--layout=rows",
+                "--chunk-size=2",
+                "--n-jobs=2",
+                "--quiet",
+            ]
+        )
+        self.assertEqual(status, 0)
+        result = pd.read_csv(self.path("out.csv"))
+        np.testing.assert_allclose(result["stat"], self.expected["stat"])
+
+    def test_score_empty(self) -> None:
+        for layout in ["long", "rows"]:
+            self.long.iloc[:0].to_csv(self.path("empty.csv"), index=False)
+            count = score(
+                self.path("empty.csv"), self.path("out.csv"), 12, layout=layout
+            )
+            self.assertEqual(count, 0)
+
+    def test_rows_batches(self) -> None:
+        # Each Parquet batch has its own index from `0`, so the rows are numbered across the whole file.
+        rows = pd.DataFrame(np.arange(12.0).reshape(4, 3))
+        frames = [rows.iloc[:2].reset_index(drop=True), rows.iloc[:0], rows.iloc[2:]]
+        frames[-1] = frames[-1].reset_index(drop=True)
+        batches = list(_rows_batches(iter(frames), "series_id", "value"))
+        self.assertEqual(len(batches), 2)
+        result = pd.concat(batches)
+        self.assertListEqual(list(result["series_id"].unique()), [0, 1, 2, 3])
+        np.testing.assert_array_equal(result["value"], np.arange(12.0))
+
+    def test_score_rows_empty(self) -> None:
+        # An empty row still gets an error row, so every output row can be matched back to its input row.
+        rows = pd.DataFrame(np.tile(self.data.values.astype(float), (5, 1)))
+        rows.iloc[2] = np.nan
+        rows.to_csv(self.path("rows.csv"), index=False)
+        count = score(
+            self.path("rows.csv"),
+            self.path("out.csv"),
+            freq=12,
+            tests=["qs"],
+            layout="rows",
+            chunk_size=2,
+        )
+        self.assertEqual(count, 5)
+        result = pd.read_csv(self.path("out.csv"))
+        self.assertListEqual(list(result["series_id"]), [0, 1, 2, 3, 4])
+        self.assertListEqual(list(result["status"]), ["ok", "ok", "error", "ok", "ok"])
+
+    def test_score_errors(self) -> None:
+        self.long.to_csv(self.path("long.csv"), index=False)
+        with self.assertRaises(ValueError):
+            score(self.path("long.csv"), self.path("out.csv"), 12, tests=["error"])
+        with self.assertRaises(ValueError):
+            score(self.path("long.csv"), self.path("out.csv"), 12, layout="error")
+        with self.assertRaises(ValueError):
+            score(self.path("long.csv"), self.path("out.csv"), 12, id_col="error")
+        status = main(
+            ["score", self.path("missing.csv"), self.path("out.csv"), "--freq=12"]
+        )
+        self.assertEqual(status, 1)
+
+    @unittest.skipUnless(find_spec("pyarrow"), "`pyarrow` is not installed")
+    def test_score_parquet(self) -> None:
+        self.long.to_parquet(self.path("long.parquet"))
+        score(
+            self.path("long.parquet"),
+            self.path("out.parquet"),
+            freq=12,
+            tests=["qs", "entropy"],
+            chunk_size=50,
+        )
+        result = pd.read_parquet(self.path("out.parquet"))
+        np.testing.assert_allclose(result["stat"], self.expected["stat"])
+
+    @unittest.skipUnless(find_spec("pyarrow"), "`pyarrow` is not installed")
+    def test_score_parquet_rows(self) -> None:
+        rows = pd.DataFrame(
+            [group["value"].to_numpy() for _, group in self.long.groupby("series_id")]
+        )
+        rows.columns = rows.columns.astype(str)
+        rows.to_parquet(self.path("rows.parquet"))
+        count = score(
+            self.path("rows.parquet"),
+            self.path("out.parquet"),
+            freq=12,
+            tests=["qs", "entropy"],
+            layout="rows",
+            chunk_size=2,
+        )
+        self.assertEqual(count, 3)
+        result = pd.read_parquet(self.path("out.parquet"))
+        self.assertListEqual(list(result["series_id"]), ["0", "1", "2"])
+        np.testing.assert_allclose(result["stat"], self.expected["stat"])
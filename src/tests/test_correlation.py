@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import numpy as np
 from statsmodels.tsa.stattools import acf as st_acf
 from statsmodels.tsa.stattools import ccf as st_ccf
@@ -5,7 +8,10 @@ from statsmodels.tsa.stattools import pacf as st_pacf
 
 from src.correlation import acf
 from src.correlation import ccf
+from src.correlation import ccf_matrix
+from src.correlation import OnlineACF
 from src.correlation import pacf
+from src.seasonality import qs
 from src.tests.test_base import BaseTester
 
 
@@ -25,3 +31,290 @@ class CorrelationTests(BaseTester):
         np.testing.assert_array_almost_equal(
             self.ccf, st_ccf(self.data, np.array(self.data) + 1)
         )
+
+
+class BatchCorrelationTests(BaseTester):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.panel = np.vstack(
+            [np.array(self.data), np.array(self.data)[::-1], rng.normal(size=144)]
+        )
+
+    def test_acf_batch(self):
+        for adjusted, fft in [(False, True), (True, True), (False, False)]:
+            result = acf(self.panel, nlags=24, adjusted=adjusted, fft=fft)
+            self.assertEqual(result.shape, (3, 25))
+            for row, expected in zip(result, self.panel):
+                np.testing.assert_array_almost_equal(
+                    row, st_acf(expected, nlags=24, adjusted=adjusted, fft=fft)
+                )
+        np.testing.assert_array_almost_equal(
+            acf(self.panel.T, nlags=24, axis=0), acf(self.panel, nlags=24)
+        )
+
+    def test_acf_batch_confint_qstat(self):
+        result, confint, qstat, pvalues = acf(
+            self.panel, nlags=12, qstat=True, alpha=0.05
+        )
+        self.assertEqual(confint.shape, (3, 13, 2))
+        self.assertEqual(qstat.shape, (3, 12))
+        for idx, row in enumerate(self.panel):
+            expected = st_acf(row, nlags=12, qstat=True, alpha=0.05)
+            np.testing.assert_array_almost_equal(result[idx], expected[0])
+            np.testing.assert_array_almost_equal(confint[idx], expected[1])
+            np.testing.assert_array_almost_equal(qstat[idx], expected[2])
+            np.testing.assert_array_almost_equal(pvalues[idx], expected[3])
+
+    def test_acf_batch_missing(self):
+        panel = self.panel.copy()
+        panel[0, 5] = np.nan
+        with self.assertRaises(ValueError):
+            acf(panel, missing="raise")
+        result = acf(panel, nlags=12, missing="drop")
+        np.testing.assert_array_almost_equal(
+            result[0], st_acf(panel[0], nlags=12, missing="drop")
+        )
+
+    def test_pacf_batch(self):
+        for method in ["ywadjusted", "ldadjusted", "ywmle", "ldbiased", "ols"]:
+            result = pacf(self.panel, nlags=20, method=method)
+            self.assertEqual(result.shape, (3, 21))
+            for row, expected in zip(result, self.panel):
+                np.testing.assert_array_almost_equal(
+                    row, st_pacf(expected, nlags=20, method=method)
+                )
+        result, confint = pacf(self.panel, alpha=0.05)
+        expected = st_pacf(self.panel[0], alpha=0.05)
+        np.testing.assert_array_almost_equal(result[0], expected[0])
+        np.testing.assert_array_almost_equal(confint[0], expected[1])
+        with self.assertRaises(ValueError):
+            pacf(self.panel, nlags=100)
+
+    def test_acf_lags(self):
+        expected = st_acf(self.panel[0], nlags=143)
+        for lags in [[12, 24], [24, 0, 12], list(range(143, 0, -1))]:
+            np.testing.assert_array_almost_equal(
+                acf(self.panel[0], lags=lags), expected[lags]
+            )
+        result = acf(self.panel, lags=[1, 12])
+        self.assertEqual(result.shape, (3, 2))
+        np.testing.assert_array_almost_equal(
+            result, acf(self.panel, nlags=12)[:, [1, 12]]
+        )
+        np.testing.assert_array_almost_equal(
+            acf(self.panel[0], lags=[3], adjusted=True),
+            st_acf(self.panel[0], nlags=3, adjusted=True)[[3]],
+        )
+
+    def test_acf_lags_missing(self):
+        series = self.panel[0].copy()
+        series[[3, 50]] = np.nan
+        np.testing.assert_array_almost_equal(
+            acf(series, lags=[12, 24], missing="drop"),
+            st_acf(series, nlags=24, missing="drop")[[12, 24]],
+        )
+        with self.assertRaises(ValueError):
+            acf(series, lags=[12], missing="raise")
+        with self.assertRaises(ValueError):
+            acf(series, lags=[12], missing="conservative")
+
+    def test_acf_lags_errors(self):
+        with self.assertRaises(ValueError):
+            acf(self.data, lags=[144])
+        with self.assertRaises(ValueError):
+            acf(self.data, lags=[-1])
+        with self.assertRaises(ValueError):
+            acf(self.data, lags=[12], qstat=True)
+        with self.assertRaises(ValueError):
+            acf(self.data, lags=[12], alpha=0.05)
+
+    def test_acf_chunked(self):
+        series = self.panel[2].cumsum()
+        for chunk_size in [7, 50, 1000]:
+            for adjusted, fft in [(False, True), (True, True), (False, False)]:
+                np.testing.assert_array_almost_equal(
+                    acf(
+                        series,
+                        nlags=30,
+                        adjusted=adjusted,
+                        fft=fft,
+                        chunk_size=chunk_size,
+                    ),
+                    st_acf(series, nlags=30, adjusted=adjusted),
+                )
+        result = acf(series, nlags=12, qstat=True, alpha=0.05, chunk_size=20)
+        expected = st_acf(series, nlags=12, qstat=True, alpha=0.05)
+        for actual, wanted in zip(result, expected):
+            np.testing.assert_array_almost_equal(actual, wanted)
+        np.testing.assert_array_almost_equal(
+            acf(series, lags=[24, 1], chunk_size=20), st_acf(series, nlags=24)[[24, 1]]
+        )
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "series.npy")
+            np.save(path, series)
+            mapped = np.load(path, mmap_mode="r")
+            np.testing.assert_array_almost_equal(
+                acf(mapped, nlags=10), st_acf(series, nlags=10)
+            )
+            del mapped
+            # A memory-mapped panel takes the batched in-memory path, as it cannot be chunked.
+            np.save(path, self.panel)
+            mapped = np.load(path, mmap_mode="r")
+            np.testing.assert_array_almost_equal(
+                acf(mapped, nlags=10), acf(self.panel, nlags=10)
+            )
+            del mapped
+        with self.assertRaises(ValueError):
+            acf(self.panel, chunk_size=20)
+        with self.assertRaises(ValueError):
+            acf(series, missing="drop", chunk_size=20)
+        with self.assertRaises(ValueError):
+            acf(series, chunk_size=0)
+
+    def test_ccf_chunked(self):
+        x, y = self.panel[0], self.panel[2]
+        for adjusted, fft in [(True, True), (False, False)]:
+            np.testing.assert_array_almost_equal(
+                ccf(x, y, adjusted=adjusted, fft=fft, nlags=40, chunk_size=16),
+                st_ccf(x, y, adjusted=adjusted, fft=fft, nlags=40),
+            )
+        # Without `nlags`, memory-mapped series are read into memory, rather than needing every lag in each chunk.
+        with tempfile.TemporaryDirectory() as folder:
+            mapped = []
+            for name, values in [("x", x), ("y", y)]:
+                np.save(os.path.join(folder, f"{name}.npy"), values)
+                mapped.append(
+                    np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r")
+                )
+            np.testing.assert_array_almost_equal(ccf(*mapped), st_ccf(x, y))
+            np.testing.assert_array_almost_equal(
+                ccf(*mapped, nlags=10), st_ccf(x, y, nlags=10)
+            )
+            del mapped
+        with self.assertRaises(ValueError):
+            ccf(x, y, chunk_size=16)
+        with self.assertRaises(ValueError):
+            ccf(x, y[:-1], nlags=4, chunk_size=16)
+
+    def test_ccf_matrix(self):
+        panel = np.vstack([self.panel, np.array(self.data)[::2].repeat(2)])
+        result = ccf_matrix(panel, max_lag=12, top_k=3, block=2)
+        np.testing.assert_array_equal(result["x"], [0, 0, 0, 1, 1, 2])
+        np.testing.assert_array_equal(result["y"], [1, 2, 3, 2, 3, 3])
+        self.assertEqual(result["lag"].shape, (6, 3))
+        for i, j, lags, values in zip(*result.values()):
+            forward = st_ccf(panel[i], panel[j])[:13]
+            backward = st_ccf(panel[j], panel[i])[:13]
+            expected = np.concatenate([backward[:0:-1], forward])
+            np.testing.assert_array_almost_equal(values, expected[lags + 12])
+            self.assertAlmostEqual(np.abs(values[0]), np.abs(expected).max())
+            self.assertTrue(np.all(np.diff(np.abs(values)) <= 0))
+        for params in [dict(fft=False), dict(n_jobs=2)]:
+            other = ccf_matrix(panel, max_lag=12, top_k=3, **params)
+            for key in result:
+                np.testing.assert_array_almost_equal(other[key], result[key])
+
+    def test_ccf_matrix_errors(self):
+        with self.assertRaises(ValueError):
+            ccf_matrix(self.panel, max_lag=144)
+        with self.assertRaises(ValueError):
+            ccf_matrix(self.panel, max_lag=2, top_k=6)
+        with self.assertRaises(ValueError):
+            ccf_matrix(self.panel, max_lag=2, block=0)
+        with self.assertRaises(ValueError):
+            ccf_matrix(self.panel[0], max_lag=2)
+
+    def test_float32(self):
+        rng = np.random.default_rng(7)
+        # The last row has a level far above its variation, which `float32` only keeps by centring it first.
+        panel = np.vstack(
+            [
+                self.panel,
+                rng.normal(size=(2, 144)).cumsum(axis=1),
+                1e4 + rng.normal(size=(1, 144)),
+            ]
+        )
+        for kwargs in [
+            dict(nlags=24),
+            dict(nlags=24, fft=False),
+            dict(nlags=12, qstat=True, alpha=0.05),
+            dict(lags=[12, 24]),
+        ]:
+            for x in [panel, panel[0]]:
+                expected = acf(x, **kwargs)
+                result = acf(x, dtype="float32", **kwargs)
+                expected = expected if isinstance(expected, tuple) else (expected,)
+                result = result if isinstance(result, tuple) else (result,)
+                for part, reference in zip(result, expected):
+                    self.assertEqual(part.dtype, np.float32)
+                    np.testing.assert_allclose(
+                        part, reference, atol=1e-6 * max(1, np.abs(reference).max())
+                    )
+        stationary = rng.normal(size=(3, 500)) + [[0], [1e3], [1e5]]
+        for x in [stationary, stationary[2]]:
+            result = pacf(x, nlags=20, dtype="float32")
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_allclose(result, pacf(x, nlags=20), atol=1e-5)
+        expected = ccf_matrix(panel, max_lag=6, top_k=2)
+        for fft in [True, False]:
+            result = ccf_matrix(panel, max_lag=6, top_k=2, fft=fft, dtype="float32")
+            self.assertEqual(result["ccf"].dtype, np.float32)
+            np.testing.assert_array_equal(result["lag"], expected["lag"])
+            np.testing.assert_allclose(result["ccf"], expected["ccf"], atol=1e-6)
+
+
+class OnlineACFTests(BaseTester):
+    def setUp(self):
+        self.values = self.data.values.astype(float)
+
+    def test_online_acf(self):
+        online = OnlineACF(nlags=24)
+        for start in range(0, len(self.values), 7):
+            online.update(self.values[start : start + 7])
+        self.assertEqual(online.nobs, len(self.values))
+        np.testing.assert_array_almost_equal(
+            online.acf(), st_acf(self.values, nlags=24)
+        )
+
+    def test_online_acf_window(self):
+        online = OnlineACF(nlags=12, window=60)
+        for value in self.values:
+            online.update(value)
+        self.assertEqual(online.nobs, 60)
+        np.testing.assert_array_almost_equal(
+            online.acf(), st_acf(self.values[-60:], nlags=12)
+        )
+
+    def test_online_acf_forgetting(self):
+        lam = 0.95
+        online = OnlineACF(nlags=5, forgetting=lam)
+        online.update(self.values[:50]).update(self.values[50:])
+        weights = lam ** np.arange(len(self.values) - 1, -1, -1)
+        mean = (weights * self.values).sum() / weights.sum()
+        dev = self.values - mean
+        acov = np.array(
+            [(weights[k:] * dev[k:] * dev[: len(dev) - k]).sum() for k in range(6)]
+        )
+        np.testing.assert_array_almost_equal(online.acf(), acov / acov[0])
+
+    def test_online_qs(self):
+        online = OnlineACF(nlags=24, diff=True)
+        for start in range(0, len(self.values), 12):
+            online.update(self.values[start : start + 12])
+        self.assertAlmostEqual(
+            online.qs(freq=12)["stat"], qs(self.data, freq=12)["stat"]
+        )
+
+    def test_online_acf_errors(self):
+        with self.assertRaises(ValueError):
+            OnlineACF(nlags=0)
+        with self.assertRaises(ValueError):
+            OnlineACF(nlags=12, window=10)
+        with self.assertRaises(ValueError):
+            OnlineACF(nlags=12, forgetting=1.5)
+        with self.assertRaises(ValueError):
+            OnlineACF(nlags=12).update([1.0, np.nan])
+        with self.assertRaises(ValueError):
+            OnlineACF(nlags=12).update(self.values[:5]).acf()
+        with self.assertRaises(ValueError):
+            OnlineACF(nlags=12).update(self.values).qs(freq=12)
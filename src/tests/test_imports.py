@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+# The backends which take seconds to import, and so must only be imported on first use.
+HEAVY_MODULES = [
+    "antropy",
+    "numba",
+    "pmdarima",
+    "scipy.stats",
+    "sklearn",
+    "statsmodels",
+    "tsfeatures",
+]
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _cold_import(module: str) -> list:
+    code = (
+        "import json, sys\n"
+        f"import {module}\n"
+        f"heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print(json.dumps(heavy))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class ImportTests(unittest.TestCase):
+    def test_lazy_backends(self) -> None:
+        # What is loaded, rather than how long it takes, so a slow or busy machine cannot fail the test.
+        for module in [
+            "src.batch",
+            "src.cli",
+            "src.correlation",
+            "src.regularity",
+            "src.seasonality",
+            "src.stability",
+            "src.stationarity",
+            "src.profile",
+        ]:
+            with self.subTest(module=module):
+                self.assertListEqual(_cold_import(module), [])
+
+    def test_tsfeatures_keeps_warnings(self) -> None:
+        # `tsfeatures` disables `warnings.warn()` when it is imported, so check on a cold import that it is put back.
+        code = (
+            "import warnings\n"
+            "warn = warnings.warn\n"
+            "from src.stability import _tsfeatures\n"
+            "_tsfeatures()\n"
+            "print(warnings.warn is warn)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "True")
@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+import numpy as np
+
+from src.correlation import acf
+from src.seasonality import qs
+from src.tests.test_base import BaseTester
+from src.utils.cache import disk_cache
+from src.utils.precision import get_precision, precision, set_precision
+from src.utils.precision import as_precision, precision_offset, resolve_dtype
+
+
+class PrecisionTests(BaseTester):
+    def tearDown(self) -> None:
+        set_precision("float64")
+
+    def test_precision(self) -> None:
+        self.assertEqual(get_precision(), "float64")
+        self.assertEqual(resolve_dtype(), np.float64)
+        with precision("float32"):
+            self.assertEqual(get_precision(), "float32")
+            self.assertEqual(resolve_dtype(), np.float32)
+            self.assertEqual(resolve_dtype("float64"), np.float64)
+        self.assertEqual(get_precision(), "float64")
+        self.assertEqual(set_precision("float32"), "float32")
+        self.assertEqual(resolve_dtype(None), np.float32)
+        with self.assertRaises(ValueError):
+            set_precision("float16")
+        with self.assertRaises(ValueError):
+            resolve_dtype("int64")
+        with self.assertRaises(ValueError):
+            acf(self.data, nlags=12, dtype="float16")
+
+    def test_as_precision(self) -> None:
+        panel = np.array([[1e4 + 0.5, 1e4 - 0.5, np.nan], [np.nan] * 3])
+        np.testing.assert_array_equal(as_precision(panel, np.float64), panel)
+        np.testing.assert_array_equal(precision_offset(panel, np.float64), 0)
+        np.testing.assert_array_equal(precision_offset(panel, np.float32), [[1e4], [0]])
+        result = as_precision(panel, np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_array_equal(result[0], [0.5, -0.5, np.nan])
+        np.testing.assert_array_equal(
+            as_precision(panel, np.float32, axis=0)[:, 0], [0, np.nan]
+        )
+
+    def test_global_precision(self) -> None:
+        expected = acf(self.data, nlags=24)
+        with precision("float32"):
+            result = acf(self.data, nlags=24)
+            self.assertEqual(
+                acf(self.data, nlags=24, dtype="float64").dtype, np.float64
+            )
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, atol=1e-6)
+        self.assertEqual(acf(self.data, nlags=24).dtype, np.float64)
+
+    def test_disk_cache_key(self) -> None:
+        with tempfile.TemporaryDirectory() as folder:
+            with disk_cache(os.path.join(folder, "cache.sqlite")) as cache:
+                qs(x=self.data, freq=12)
+                with precision("float32"):
+                    qs(x=self.data, freq=12)
+                qs(x=self.data, freq=12, dtype="float32")
+                self.assertEqual((cache.hits, cache.misses), (0, 3))
+                qs(x=self.data, freq=12)
+                self.assertEqual((cache.hits, cache.misses), (1, 3))
+                cache.close()
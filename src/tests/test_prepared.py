@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.correlation import acf
+from src.regularity import entropy
+from src.seasonality import ch, qs, seasonal_strength
+from src.stability import lumpiness, stability
+from src.stationarity import adf
+from src.tests.test_base import BaseTester
+from src.utils.cache import hash_array
+from src.utils.checks import get_typechecking, typechecking
+from src.utils.prepared import PreparedSeries, prepare
+
+
+class PreparedSeriesTests(BaseTester):
+    def setUp(self) -> None:
+        self.prepared = PreparedSeries(self.data)
+
+    def test_prepared_series(self) -> None:
+        values = self.data.values.astype(float)
+        self.assertEqual(len(self.prepared), len(values))
+        self.assertFalse(self.prepared.values.flags.writeable)
+        self.assertFalse(self.prepared.has_nan)
+        self.assertAlmostEqual(self.prepared.mean, values.mean())
+        self.assertAlmostEqual(self.prepared.var, values.var())
+        self.assertEqual(self.prepared.key, hash_array(values))
+        self.assertIs(prepare(self.prepared), self.prepared)
+        self.assertEqual(prepare(self.prepared, np.float32).dtype, np.float32)
+        self.assertEqual(hash_array(list(values)), hash_array(values.astype(int)))
+        self.assertNotEqual(prepare(self.prepared, np.float32).key, self.prepared.key)
+        missing = PreparedSeries([1.0, np.nan, 3.0])
+        self.assertEqual(missing.n_valid, 2)
+        self.assertAlmostEqual(missing.var, 1.0)
+        with self.assertRaises(ValueError):
+            PreparedSeries(np.ones((2, 2)))
+        with self.assertRaises(ValueError):
+            PreparedSeries(values, dtype=np.int64)
+
+    def test_caller_array_untouched(self) -> None:
+        # The prepared values are a frozen copy, so the caller can still change their own array, without making the prepared statistics stale.
+        values = self.data.values.astype(float)
+        prepared = PreparedSeries(values)
+        qs(values, 12)
+        seasonal_strength(values, 12)
+        self.assertTrue(values.flags.writeable)
+        values[0] = 0.0
+        self.assertEqual(prepared.values[0], self.data.values[0])
+        self.assertEqual(prepared.key, hash_array(self.data.values.astype(float)))
+
+    def test_functions_accept_prepared(self) -> None:
+        values = self.data.values
+        self.assertEqual(
+            qs(self.prepared, freq=12)["stat"], qs(self.data, freq=12)["stat"]
+        )
+        self.assertEqual(qs(values, freq=12)["stat"], qs(self.data, freq=12)["stat"])
+        self.assertEqual(ch(self.prepared, m=12), ch(values, m=12))
+        self.assertAlmostEqual(
+            seasonal_strength(self.prepared, m=12), seasonal_strength(values, m=12)
+        )
+        self.assertEqual(stability(self.prepared), stability(values))
+        self.assertEqual(lumpiness(self.prepared), lumpiness(values))
+        self.assertEqual(entropy(self.prepared), entropy(values))
+        self.assertEqual(adf(self.prepared)[0], adf(values)[0])
+        np.testing.assert_array_equal(
+            acf(self.prepared, nlags=12), acf(values, nlags=12)
+        )
+
+    def test_typechecking(self) -> None:
+        with self.assertRaises(TypeError):
+            stability(list(self.data.values))
+        with typechecking(False):
+            self.assertFalse(get_typechecking())
+            self.assertEqual(
+                stability(list(self.data.values)), stability(self.data.values)
+            )
+        self.assertTrue(get_typechecking())
@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.correlation import acf, pacf
+from src.profile import STATISTICS, profile
+from src.regularity import entropy, is_regular
+from src.seasonality import _STL_CACHE, ch, clear_stl_cache, ocsb, qs
+from src.seasonality import seasonal_strength, spikiness, trend_strength
+from src.stability import lumpiness, stability
+from src.tests.test_base import BaseTester
+
+
+class ProfileTests(BaseTester):
+    def test_profile(self) -> None:
+        result = profile(x=self.data, freq=12)
+        self.assertListEqual(list(result), STATISTICS)
+        np.testing.assert_array_almost_equal(result["acf"], acf(self.data))
+        np.testing.assert_array_almost_equal(result["pacf"], pacf(self.data))
+        self.assertAlmostEqual(result["entropy"], entropy(self.data))
+        self.assertDictEqual(result["is_regular"], is_regular(self.data))
+        self.assertDictEqual(result["qs"], qs(self.data, 12))
+        self.assertEqual(result["ocsb"], ocsb(self.data, 12))
+        self.assertEqual(result["ch"], ch(self.data, 12))
+        for name, func in [
+            ("seasonal_strength", seasonal_strength),
+            ("trend_strength", trend_strength),
+            ("spikiness", spikiness),
+        ]:
+            self.assertAlmostEqual(result[name], func(self.data, 12))
+        self.assertAlmostEqual(result["stability"], stability(self.data, 12))
+        self.assertAlmostEqual(
+            result["lumpiness"] / lumpiness(self.data, 12), 1.0, places=12
+        )
+
+    def test_profile_include(self) -> None:
+        clear_stl_cache()
+        result = profile(x=self.data, freq=12, include=["stability", "qs"])
+        self.assertListEqual(list(result), ["stability", "qs"])
+        self.assertEqual(_STL_CACHE.misses, 0)
+        result = profile(x=self.data, include=["seasonal_strength", "trend_strength"])
+        self.assertDictEqual(result, {"seasonal_strength": 0, "trend_strength": 0})
+        self.assertEqual(_STL_CACHE.misses, 0)
+        self.assertNotIn("qs", profile(x=self.data, freq=1))
+        self.assertAlmostEqual(
+            profile(x=self.data, include=["stability"])["stability"],
+            stability(self.data),
+        )
+
+    def test_profile_failures(self) -> None:
+        with self.assertRaises(ValueError):
+            profile(x=self.data, freq=12, include=["unknown"])
+        with self.assertRaises(AttributeError):
+            profile(x=self.data, freq=1, include=["qs"])
+        with self.assertRaises(ValueError):
+            profile(x=np.ones(48), freq=12, include=["qs"])
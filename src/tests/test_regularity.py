@@ -1,5 +1,9 @@
+from unittest import mock
+
+import numpy as np
+
 from src.tests.test_base import BaseTester
-from src.regularity import is_regular
+from src.regularity import entropy, entropy_profile, is_regular, multiscale_entropy
 
 
 class TestRegularity(BaseTester):
@@ -35,3 +39,103 @@ class TestRegularity(BaseTester):
             is_regular(x=self.data, algorithm="error")
         with self.assertRaises(ValueError):
             is_regular(x=self.data, tolerance="error")
+
+    def test_regularity_resample(self):
+        result = is_regular(
+            x=self.data, resample="permutation", n_resamples=99, seed=42
+        )
+        self.assertListEqual(
+            list(result.keys()), ["result", "entropy", "tolerance", "Pval"]
+        )
+        self.assertAlmostEqual(result["entropy"], self.sample_result["entropy"])
+        self.assertAlmostEqual(result["Pval"], 1 / 100)
+        noise = np.random.default_rng(42).normal(size=200)
+        for resample in ["permutation", "phase"]:
+            pvals = [
+                is_regular(
+                    noise, resample=resample, n_resamples=150, seed=7, n_jobs=n_jobs
+                )["Pval"]
+                for n_jobs in [1, 2]
+            ]
+            self.assertEqual(pvals[0], pvals[1])
+            self.assertGreater(pvals[0], 0.05)
+        with self.assertRaises(ValueError):
+            is_regular(x=self.data, resample="block")
+
+    def test_float32(self):
+        noise = np.random.default_rng(3).normal(size=300)
+        rounded = (noise - noise.mean()).astype(np.float32)
+        for algorithm in ["sample", "approx"]:
+            for x in [noise, 1e4 + noise]:
+                self.assertEqual(
+                    entropy(x, algorithm=algorithm, dtype="float32"),
+                    entropy(rounded.astype(np.float64), algorithm=algorithm),
+                )
+        result = is_regular(noise, resample="phase", n_resamples=50, seed=1)
+        rounded_result = is_regular(
+            noise, resample="phase", n_resamples=50, seed=1, dtype="float32"
+        )
+        self.assertAlmostEqual(rounded_result["entropy"], result["entropy"], places=2)
+        self.assertGreater(rounded_result["Pval"], 0.05)
+        with self.assertRaises(ValueError):
+            entropy(noise, dtype="float16")
+
+    def test_native_engine(self):
+        rng = np.random.default_rng(42)
+        for x in [np.array(self.data), rng.normal(size=1000), rng.normal(size=6000)]:
+            for algorithm in ["sample", "approx"]:
+                for order in [2, 3]:
+                    self.assertAlmostEqual(
+                        entropy(x=x, order=order, algorithm=algorithm),
+                        entropy(
+                            x=x, order=order, algorithm=algorithm, engine="antropy"
+                        ),
+                    )
+        # Without `sklearn`, the approximate entropy counts its matches with `scipy` instead.
+        with mock.patch("src.regularity.find_spec", return_value=None):
+            self.assertAlmostEqual(
+                entropy(x=x, algorithm="approx"),
+                entropy(x=x, algorithm="approx", engine="antropy"),
+            )
+        self.assertTrue(np.isnan(entropy(x=np.arange(10.0), order=2)))
+        with self.assertRaises(ValueError):
+            entropy(x=self.data, engine="error")
+
+    def test_entropy_profile(self):
+        profile = entropy_profile(x=self.data, orders=[2, 3, 4], scales=[1, 2, 3])
+        self.assertEqual(profile.shape, (3, 3))
+        self.assertListEqual(list(profile.index), [1, 2, 3])
+        self.assertListEqual(list(profile.columns), [2, 3, 4])
+        for order in [2, 3, 4]:
+            for algorithm in ["sample", "approx"]:
+                self.assertAlmostEqual(
+                    entropy_profile(
+                        x=self.data, orders=[order], algorithm=algorithm
+                    ).loc[1, order],
+                    entropy(x=self.data, order=order, algorithm=algorithm),
+                )
+        x = np.array(self.data, dtype=float)
+        coarse = x.reshape(-1, 2).mean(axis=1)
+        np.testing.assert_array_almost_equal(
+            entropy_profile(x=self.data, orders=[2], scales=[2], tolerance=5.0),
+            entropy_profile(x=coarse, orders=[2], scales=[1], tolerance=5.0),
+        )
+        np.testing.assert_array_almost_equal(
+            multiscale_entropy(x=self.data, scales=[1, 2, 3]), profile[2]
+        )
+        self.assertTrue(
+            np.isnan(entropy_profile(x=self.data, orders=[2], scales=[100]).iloc[0, 0])
+        )
+        with self.assertRaises(ValueError):
+            entropy_profile(x=self.data, algorithm="error")
+
+    def test_entropy_profile_pairs(self):
+        x = np.sin(np.arange(2000) / 7) + np.random.default_rng(42).normal(size=2000)
+        for algorithm in ["sample", "approx"]:
+            for order in [2, 3, 4]:
+                self.assertAlmostEqual(
+                    entropy_profile(x=x, orders=[order], algorithm=algorithm).iloc[
+                        0, 0
+                    ],
+                    entropy(x=x, order=order, algorithm=algorithm, engine="antropy"),
+                )
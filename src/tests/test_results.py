@@ -0,0 +1,91 @@
+import os
+import pickle
+import tempfile
+import unittest
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+from src.batch import run_batch
+from src.regularity import is_regular
+from src.seasonality import qs
+from src.tests.test_base import BaseTester
+from src.utils.dict_helpers import dict_slice_by_keys
+from src.utils.results import QSResult, RegularityResult, ResultTable
+
+
+class ResultTests(BaseTester):
+    def test_result_objects(self) -> None:
+        result = qs(x=self.data, freq=12, result_object=True)
+        self.assertIsInstance(result, QSResult)
+        self.assertFalse(hasattr(result, "__dict__"))
+        self.assertEqual(result, qs(x=self.data, freq=12))
+        self.assertEqual(result.stat, result["stat"])
+        self.assertListEqual(list(result), ["stat", "Pval", "test", "model"])
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        with self.assertRaises(AttributeError):
+            result.stat = 0.0
+        with self.assertRaises(KeyError):
+            result["missing"]
+        with self.assertRaises(TypeError):
+            QSResult(missing=1)
+        regular = is_regular(x=self.data.values, result_object=True)
+        self.assertIsInstance(regular, RegularityResult)
+        self.assertEqual(
+            regular.to_dict(), {**is_regular(x=self.data.values), "Pval": None}
+        )
+
+    def test_result_table(self) -> None:
+        fields = {"freq": np.int64, "stat": np.float64, "note": object, "model": object}
+        table = ResultTable(fields, capacity=1)
+        self.assertNotIn("model", table.fields)
+        for freq in [4, 12, 24]:
+            table.append(qs(x=self.data, freq=freq, result_object=True), freq=freq)
+        table.append(note="empty")
+        self.assertEqual(len(table), 4)
+        np.testing.assert_array_equal(table["freq"], [4, 12, 24, 0])
+        self.assertTrue(np.isnan(table["stat"][3]))
+        self.assertListEqual(list(table["note"]), [None, None, None, "empty"])
+        with self.assertRaises(KeyError):
+            table.append(other=1)
+
+        other = ResultTable(fields)
+        other.append(freq=6, stat=1.0)
+        table.extend(other)
+        frame = table.to_pandas()
+        self.assertListEqual(list(frame.columns), ["freq", "stat", "note"])
+        self.assertListEqual(list(frame["freq"]), [4, 12, 24, 0, 6])
+        self.assertEqual(frame["stat"].dtype, np.float64)
+        with self.assertRaises(ValueError):
+            table.extend(ResultTable({"freq": np.int64}))
+
+        kept = ResultTable(fields, keep_models=True)
+        kept.append(qs(x=self.data, freq=12, residuals=True, result_object=True))
+        self.assertIsNotNone(kept["model"][0])
+
+    @unittest.skipUnless(find_spec("pyarrow"), "`pyarrow` is not installed")
+    def test_result_table_parquet(self) -> None:
+        table = ResultTable({"freq": np.int64, "stat": np.float64})
+        table.append(freq=12, stat=1.0)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "results.parquet")
+            table.to_parquet(path)
+            pd.testing.assert_frame_equal(pd.read_parquet(path), table.to_pandas())
+
+    def test_run_batch_models(self) -> None:
+        panel = np.vstack([self.data.values, self.data.values[::-1]])
+        params = {"qs": {"residuals": True}}
+        result = run_batch(panel, freq=12, tests="qs", params=params)
+        self.assertNotIn("model", result.columns)
+        result = run_batch(panel, freq=12, tests="qs", params=params, keep_models=True)
+        self.assertEqual(result.columns[-1], "model")
+        self.assertTrue(all(model is not None for model in result["model"]))
+
+    def test_dict_slice_by_keys(self) -> None:
+        dictionary = {"a": 1, "b": 2, "c": 3}
+        self.assertDictEqual(
+            dict_slice_by_keys(dictionary, ["c", "a"]), {"c": 3, "a": 1}
+        )
+        self.assertDictEqual(dict_slice_by_keys(dictionary, "b"), {"b": 2})
+        self.assertDictEqual(dict_slice_by_keys(dictionary, ["z"]), {})
@@ -1,10 +1,15 @@
+import numpy as np
 import pandas as pd
 from pmdarima.arima import ARIMA
 
 from src.seasonality import ch, seasonal_strength, spikiness, trend_strength
+from src.seasonality import _STL_CACHE, clear_stl_cache, decompose, stl_features
 from src.seasonality import ocsb
-from src.seasonality import qs
+from src.seasonality import detect_seasonality, qs
+from src.seasonality import _ARIMA_CACHE, clear_arima_cache
+from src.tests.benchmarks.generators import make_panel, seasonal_series
 from src.tests.test_base import BaseTester
+from src.utils.kernels import get_kernel
 
 
 class SeasonalityTests(BaseTester):
@@ -64,6 +69,84 @@ class SeasonalityTests(BaseTester):
         with self.assertRaises(ValueError):
             qs(pd.Series([0, 1]), 4, True, True, True)
 
+    def test_qs_resample(self) -> None:
+        result = qs(x=self.data, freq=12, resample="permutation", seed=42)
+        self.assertEqual(result["stat"], self.qs_result["stat"])
+        self.assertAlmostEqual(result["Pval"], 1 / 1000)
+        noise = np.random.default_rng(42).normal(size=144)
+        for resample in ["permutation", "block"]:
+            pvals = [
+                qs(
+                    noise, 12, resample=resample, n_resamples=300, seed=7, n_jobs=n_jobs
+                )["Pval"]
+                for n_jobs in [1, 1, 2]
+            ]
+            self.assertEqual(len(set(pvals)), 1)
+            self.assertGreater(pvals[0], 0.05)
+            self.assertLessEqual(pvals[0], 1)
+        with self.assertRaises(ValueError):
+            qs(x=self.data, freq=12, resample="phase")
+        with self.assertRaises(ValueError):
+            qs(x=self.data, freq=12, resample="block", block_size=0)
+
+    def test_qs_backends(self) -> None:
+        clear_arima_cache()
+        for backend in ["stepwise", "budget", "fixed"]:
+            result = qs(
+                x=self.data, freq=12, residuals=True, backend=backend, time_budget=0.1
+            )
+            self.assertIsInstance(result["model"], ARIMA)
+            self.assertGreater(result["stat"], 0)
+        self.assertAlmostEqual(
+            qs(self.data, 12, True, True, True, backend="fixed")["stat"],
+            qs(self.data, 12, True, True, False)["stat"],
+        )
+        with self.assertRaises(ValueError):
+            qs(self.data, 12, backend="grid")
+
+    def test_qs_arima_cache(self) -> None:
+        clear_arima_cache()
+        first = qs(x=self.data, freq=12, diff=False, residuals=True)
+        self.assertEqual(_ARIMA_CACHE.misses, 1)
+        second = qs(x=self.data, freq=24, diff=False, residuals=True)
+        self.assertEqual(_ARIMA_CACHE.hits, 1)
+        # Each call gets its own copy of the cached model, so changing one leaves the cache as it was.
+        self.assertIsNot(first["model"], second["model"])
+        self.assertEqual(first["model"].order, second["model"].order)
+        first["model"].order = (9, 9, 9)
+        third = qs(x=self.data, freq=12, diff=False, residuals=True)
+        self.assertEqual(third["model"].order, second["model"].order)
+        self.assertEqual(third["stat"], first["stat"])
+        qs(x=self.data, freq=4, diff=False, residuals=True)
+        self.assertEqual(len(_ARIMA_CACHE), 2)
+
+    def test_detect_seasonality(self) -> None:
+        result = detect_seasonality(x=self.data)
+        self.assertListEqual(list(result), ["period", "stat", "Pval", "power"])
+        self.assertEqual(result["period"][0], 12)
+        self.assertAlmostEqual(result["Pval"][0], self.qs_result["Pval"])
+        data = self.data.values.astype(float)
+        data[[5, 40]] = np.nan
+        for diff in [True, False]:
+            result = detect_seasonality(x=data, candidates=range(2, 40), diff=diff)
+            self.assertTrue(np.all(np.diff(result["stat"]) <= 0))
+            for period, stat, pval in zip(
+                result["period"], result["stat"], result["Pval"]
+            ):
+                expected = qs(x=data, freq=int(period), diff=diff)
+                self.assertAlmostEqual(stat, expected["stat"], 8)
+                self.assertAlmostEqual(pval, expected["Pval"], 8)
+
+    def test_detect_seasonality_failures(self) -> None:
+        with self.assertRaises(AttributeError):
+            detect_seasonality(pd.Series([None, None]))
+        with self.assertRaises(ValueError):
+            detect_seasonality(pd.Series([1, 1, 1, 1]))
+        with self.assertRaises(ValueError):
+            detect_seasonality(self.data, candidates=[1, 12])
+        with self.assertRaises(ValueError):
+            detect_seasonality(self.data, candidates=[72])
+
     def test_ocsb(self) -> None:
         self.assertEqual(self.ocsb_result, 1)
 
@@ -74,11 +157,150 @@ class SeasonalityTests(BaseTester):
         self.assertAlmostEqual(self.seasonal_strength_result, 0.9815304216549953)
         self.assertEqual(seasonal_strength(self.data, 1), 0)
         self.assertEqual(seasonal_strength([1, 1], 2), 0)
+        single = np.full(48, np.nan)
+        single[5] = 3.0
+        self.assertEqual(seasonal_strength(single, 12, decomposition="classical"), 0)
 
     def test_trend_strength(self) -> None:
         self.assertAlmostEqual(self.trend_strength_result, 0.9971375301013928)
         self.assertEqual(trend_strength(self.data, 1), 0)
         self.assertEqual(trend_strength([1, 1], 2), 0)
+        single = np.full(48, np.nan)
+        single[5] = 3.0
+        self.assertEqual(trend_strength(single, 12, decomposition="classical"), 0)
 
     def test_spikiness(self) -> None:
         self.assertAlmostEqual(self.spikiness_result, 0.16276032794671697)
+        for backend in ["numba", "auto"]:
+            self.assertAlmostEqual(
+                spikiness(x=self.data, m=12, backend=backend), self.spikiness_result
+            )
+        with self.assertRaises(ValueError):
+            spikiness(x=self.data, m=12, backend="error")
+
+    def test_stl_features(self) -> None:
+        clear_stl_cache()
+        result = stl_features(x=self.data, m=12)
+        self.assertListEqual(
+            list(result.keys()), ["seasonal_strength", "trend_strength", "spikiness"]
+        )
+        self.assertAlmostEqual(
+            result["seasonal_strength"], self.seasonal_strength_result
+        )
+        self.assertAlmostEqual(result["trend_strength"], self.trend_strength_result)
+        self.assertAlmostEqual(result["spikiness"], self.spikiness_result)
+        self.assertEqual(_STL_CACHE.misses, 1)
+
+    def test_decompositions(self) -> None:
+        # The faster decompositions trade a little accuracy for speed. `stl_fast` stays close to `stl` on any series, while `classical` only does on a stable, additive seasonal pattern.
+        expected = stl_features(x=self.data, m=12)
+        result = stl_features(x=self.data, m=12, decomposition="stl_fast")
+        for name in ["seasonal_strength", "trend_strength"]:
+            self.assertAlmostEqual(result[name], expected[name], delta=0.005)
+        self.assertAlmostEqual(
+            result["spikiness"] / expected["spikiness"], 1, delta=0.1
+        )
+        for seed in range(3):
+            x = seasonal_series(240, freq=12, seed=seed)
+            expected = stl_features(x=x, m=12)
+            for decomposition, delta in [("stl_fast", 0.005), ("classical", 0.1)]:
+                result = stl_features(x=x, m=12, decomposition=decomposition)
+                self.assertAlmostEqual(
+                    seasonal_strength(x, 12, decomposition=decomposition),
+                    result["seasonal_strength"],
+                )
+                for name in ["seasonal_strength", "trend_strength"]:
+                    self.assertAlmostEqual(result[name], expected[name], delta=delta)
+        # The classical residuals are `NaN` at both ends, so only the valid ones count towards spikiness.
+        residuals = decompose(x=x, m=12)["residuals"]
+        n_valid = np.count_nonzero(~np.isnan(residuals))
+        self.assertLess(n_valid, len(x))
+        self.assertAlmostEqual(
+            spikiness(x, 12, decomposition="classical"),
+            get_kernel("loo_variance")(residuals, n_valid),
+        )
+        self.assertEqual(trend_strength(x, 1, decomposition="classical"), 0)
+        with self.assertRaises(ValueError):
+            seasonal_strength(x=self.data, m=12, decomposition="error")
+
+    def test_decompose(self) -> None:
+        from statsmodels.tsa.seasonal import seasonal_decompose
+
+        panel = make_panel(4, 100, freq=12, seed=1)
+        parts = decompose(x=panel, m=12)
+        self.assertListEqual(list(parts), ["trend", "seasonal", "residuals"])
+        for index, row in enumerate(panel):
+            expected = seasonal_decompose(row, period=12)
+            for name, attr in [
+                ("trend", "trend"),
+                ("seasonal", "seasonal"),
+                ("residuals", "resid"),
+            ]:
+                np.testing.assert_allclose(parts[name][index], getattr(expected, attr))
+        np.testing.assert_allclose(
+            decompose(x=panel[1], m=7)["seasonal"],
+            decompose(x=panel, m=7)["seasonal"][1],
+        )
+        for decomposition in ["stl", "stl_fast"]:
+            parts = decompose(x=panel[:2], m=12, decomposition=decomposition)
+            np.testing.assert_allclose(
+                parts["residuals"][1],
+                decompose(x=panel[1], m=12, decomposition=decomposition)["residuals"],
+            )
+        # The cached decomposition is shared, so changing a returned component must not change later features.
+        x = seasonal_series(240, freq=12, seed=4)
+        expected = seasonal_strength(x, 12)
+        decompose(x=x, m=12, decomposition="stl")["seasonal"][:] = 0
+        self.assertEqual(seasonal_strength(x, 12), expected)
+        with self.assertRaises(ValueError):
+            decompose(x=panel, m=1)
+        with self.assertRaises(ValueError):
+            decompose(x=panel[np.newaxis], m=12)
+
+    def test_float32(self) -> None:
+        offsets = [
+            1e3 + np.random.default_rng(0).normal(size=2000),
+            1e4 + seasonal_series(2000, freq=12, seed=3),
+        ]
+        for x in [self.data, seasonal_series(2000, freq=12, seed=3), *offsets]:
+            expected = qs(x=x, freq=12)
+            result = qs(x=x, freq=12, dtype="float32")
+            self.assertAlmostEqual(
+                result["stat"], expected["stat"], delta=1e-5 * max(1, expected["stat"])
+            )
+            self.assertAlmostEqual(result["Pval"], expected["Pval"], delta=1e-6)
+            for decomposition in ["stl", "classical"]:
+                result = stl_features(
+                    x=x, m=12, decomposition=decomposition, dtype="float32"
+                )
+                expected = stl_features(x=x, m=12, decomposition=decomposition)
+                for name in ["seasonal_strength", "trend_strength"]:
+                    self.assertAlmostEqual(result[name], expected[name], delta=1e-6)
+                self.assertAlmostEqual(
+                    result["spikiness"],
+                    expected["spikiness"],
+                    delta=1e-5 * expected["spikiness"],
+                )
+        panel = make_panel(4, 300, freq=12, seed=2) + [[0], [1e3], [1e4], [-1e5]]
+        expected = decompose(x=panel, m=12)
+        for x in [panel, panel[0]]:
+            parts = decompose(x=x, m=12, dtype="float32")
+            for name, part in parts.items():
+                self.assertEqual(part.dtype, np.float32)
+                np.testing.assert_allclose(
+                    part,
+                    expected[name] if x.ndim == 2 else expected[name][0],
+                    atol=1e-6 * np.abs(panel).max(),
+                )
+        parts = decompose(x=panel[:2], m=12, decomposition="stl", dtype="float32")
+        self.assertEqual(parts["trend"].dtype, np.float32)
+
+    def test_stl_cache(self) -> None:
+        clear_stl_cache()
+        seasonal_strength(x=self.data, m=12)
+        trend_strength(x=self.data.values, m=12)
+        spikiness(x=list(self.data.values), m=12)
+        self.assertEqual(len(_STL_CACHE), 1)
+        self.assertEqual(_STL_CACHE.hits, 2)
+        seasonal_strength(x=self.data, m=4)
+        self.assertEqual(len(_STL_CACHE), 2)
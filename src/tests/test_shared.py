@@ -0,0 +1,48 @@
+import pickle
+from functools import partial
+
+import numpy as np
+
+from src.tests.test_base import BaseTester
+from src.utils.shared import SharedArray, shared_map
+
+
+def _spread(x: np.ndarray, out: np.ndarray, note: str = "short") -> str:
+    out[:] = x.min(), x.max()
+    return note if len(x) < 3 else None
+
+
+def _write(x: np.ndarray, out: np.ndarray) -> None:
+    x[0] = 0
+
+
+class SharedTests(BaseTester):
+    def test_shared_array(self) -> None:
+        with SharedArray.copy(np.arange(6.0).reshape(2, 3)) as shared:
+            attached = pickle.loads(pickle.dumps(shared))
+            attached.array[0, 0] = 10
+            self.assertEqual(shared.array[0, 0], 10)
+            attached.close()
+        with SharedArray.create((2,), np.int64, fill=3) as shared:
+            np.testing.assert_array_equal(shared.array, [3, 3])
+
+    def test_shared_map(self) -> None:
+        panel = np.arange(12.0).reshape(4, 3)
+        for n_jobs in [1, 2]:
+            results, extras = shared_map(_spread, panel, n_outputs=2, n_jobs=n_jobs)
+            np.testing.assert_array_equal(results, panel[:, [0, 2]])
+            self.assertDictEqual(extras, {})
+            results, extras = shared_map(
+                partial(_spread, note="ragged"),
+                panel,
+                n_outputs=2,
+                n_jobs=n_jobs,
+                chunksize=1,
+                lengths=np.array([3, 1, 2, 3]),
+            )
+            np.testing.assert_array_equal(results[:, 1], [2, 3, 7, 11])
+            self.assertDictEqual(extras, {1: "ragged", 2: "ragged"})
+            with self.assertRaises(ValueError):
+                shared_map(_write, panel, n_jobs=n_jobs)
+        with self.assertRaises(ValueError):
+            shared_map(_spread, panel[0])
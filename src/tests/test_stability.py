@@ -1,11 +1,17 @@
-from tsfeatures import lumpiness as ts_lumpiness
-from tsfeatures import stability as ts_stability
+import os
+import tempfile
+
+import numpy as np
 
 from src.stability import is_lumpy
 from src.stability import is_stable
 from src.stability import lumpiness
+from src.stability import rolling_lumpiness
+from src.stability import rolling_stability
 from src.stability import stability
+from src.stability import _tsfeatures
 from src.tests.test_base import BaseTester
+from src.utils.kernels import get_kernel, warmup
 
 
 class StabilityTests(BaseTester):
@@ -16,9 +22,98 @@ class StabilityTests(BaseTester):
         self.is_lumpy = is_lumpy(self.data)
 
     def test_stability(self):
-        self.assertEqual(self.stability, ts_stability(self.data)["stability"])
+        self.assertEqual(
+            self.stability, _tsfeatures().stability(self.data)["stability"]
+        )
         self.assertTrue(self.is_stable)
 
     def test_lumpiness(self):
-        self.assertEqual(self.lumpiness, ts_lumpiness(self.data)["lumpiness"])
+        self.assertEqual(
+            self.lumpiness, _tsfeatures().lumpiness(self.data)["lumpiness"]
+        )
         self.assertTrue(self.is_lumpy)
+
+    def test_rolling_stability(self):
+        values = self.data.values.astype(float)
+        for freq, window in [(12, 60), (1, 25), (4, 9)]:
+            expected = [
+                stability(values[i : i + window], freq=freq)
+                for i in range(len(values) - window + 1)
+            ]
+            # Prefix sums lose a few digits when the tiles are near-identical, so compare on the scale of the whole rolling series.
+            np.testing.assert_allclose(
+                rolling_stability(values, window=window, freq=freq),
+                expected,
+                atol=1e-9 * np.max(expected),
+            )
+
+    def test_rolling_lumpiness(self):
+        values = self.data.values.astype(float)
+        for freq, window in [(12, 60), (1, 25), (4, 9)]:
+            expected = [
+                lumpiness(values[i : i + window], freq=freq)
+                for i in range(len(values) - window + 1)
+            ]
+            # Prefix sums lose a few digits when the tiles are near-identical, so compare on the scale of the whole rolling series.
+            np.testing.assert_allclose(
+                rolling_lumpiness(values, window=window, freq=freq),
+                expected,
+                atol=1e-9 * np.max(expected),
+            )
+        with self.assertRaises(ValueError):
+            rolling_lumpiness(values, window=len(values) + 1)
+
+    def test_chunked(self):
+        values = self.data.values.astype(float)
+        values[[5, 30, 31]] = np.nan
+        for freq in [1, 4, 12]:
+            for chunk_size in [1, 25, 1000]:
+                self.assertAlmostEqual(
+                    stability(values, freq=freq, chunk_size=chunk_size),
+                    stability(values, freq=freq),
+                )
+                self.assertAlmostEqual(
+                    lumpiness(values, freq=freq, chunk_size=chunk_size)
+                    / lumpiness(values, freq=freq),
+                    1.0,
+                )
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "data.npy")
+            np.save(path, values)
+            mapped = np.load(path, mmap_mode="r")
+            self.assertAlmostEqual(stability(mapped, freq=12), stability(values, 12))
+            del mapped
+        self.assertEqual(stability(values[:15], chunk_size=5), 0)
+        with self.assertRaises(ValueError):
+            stability(values, chunk_size=0)
+
+    def test_backends(self):
+        values = self.data.values.astype(float)
+        values[[5, 30, 31]] = np.nan
+        self.assertListEqual(warmup("numba"), ["tile_variance", "loo_variance"])
+        for backend in ["numpy", "numba", "auto"]:
+            for freq in [1, 4, 12]:
+                for func in [stability, lumpiness]:
+                    np.testing.assert_allclose(
+                        func(values, freq=freq, backend=backend),
+                        func(values, freq=freq),
+                        rtol=1e-12,
+                    )
+            self.assertEqual(stability(values[:15], backend=backend), 0)
+            self.assertTrue(np.isnan(lumpiness(np.ones(20) * np.nan, backend=backend)))
+        offset = 1e3 + np.random.default_rng(0).normal(size=2000)
+        for backend in ["numpy", "numba"]:
+            for func in [stability, lumpiness]:
+                for x in [values, offset]:
+                    result = func(x, freq=12, backend=backend, dtype="float32")
+                    np.testing.assert_allclose(result, func(x, freq=12), rtol=1e-5)
+        with self.assertRaises(ValueError):
+            stability(values, backend="error")
+        with self.assertRaises(ValueError):
+            get_kernel("tile_variance", backend="error")
+        with self.assertRaises(KeyError):
+            get_kernel("error")
+        for backend in ["numpy", "numba"]:
+            with np.errstate(all="ignore"):
+                result = get_kernel("loo_variance", backend)(np.array([1.0, np.nan]), 2)
+            self.assertTrue(np.isnan(result))
@@ -0,0 +1,81 @@
+import numpy as np
+from statsmodels.tsa.stattools import adfuller
+from statsmodels.tsa.stattools import kpss as st_kpss
+
+from src.stationarity import adf
+from src.stationarity import kpss
+from src.stationarity import pp
+from src.tests.test_base import BaseTester
+
+
+class StationarityTests(BaseTester):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(42)
+        values = self.data.values.astype(float)
+        self.panel = np.vstack(
+            [
+                values,
+                np.log(values),
+                rng.normal(size=len(values)),
+                rng.normal(size=len(values)).cumsum(),
+            ]
+        )
+
+    def test_adf(self) -> None:
+        for regression in ["c", "ct", "ctt", "n"]:
+            for autolag in ["AIC", "BIC", "t-stat", None]:
+                result = adf(self.panel, regression=regression, autolag=autolag)
+                for idx, series in enumerate(self.panel):
+                    expected = adfuller(series, regression=regression, autolag=autolag)
+                    self.assertAlmostEqual(result[0][idx], expected[0])
+                    self.assertAlmostEqual(result[1][idx], expected[1])
+                    self.assertEqual(result[2][idx], expected[2])
+                    self.assertEqual(result[3][idx], expected[3])
+                    self.assertAlmostEqual(result[4]["5%"][idx], expected[4]["5%"])
+        single = adf(self.data, maxlag=4)
+        self.assertEqual(len(single), 6)
+        self.assertIsInstance(single[0], float)
+        self.assertEqual(single[2], adfuller(self.data, maxlag=4)[2])
+
+    def test_kpss(self) -> None:
+        for regression in ["c", "ct"]:
+            for nlags in ["auto", "legacy", 3]:
+                result = kpss(self.panel, regression=regression, nlags=nlags)
+                for idx, series in enumerate(self.panel):
+                    expected = st_kpss(series, regression=regression, nlags=nlags)
+                    self.assertAlmostEqual(result[0][idx], expected[0])
+                    self.assertAlmostEqual(result[1][idx], expected[1])
+                    self.assertEqual(result[2][idx], expected[2])
+                    self.assertDictEqual(result[3], expected[3])
+
+    def test_pp(self) -> None:
+        # Checked against `arch.unitroot.PhillipsPerron(data)`.
+        stat, pvalue, lags, nobs, crit = pp(self.data)
+        self.assertAlmostEqual(stat, -1.3511383338496277)
+        self.assertAlmostEqual(pvalue, 0.6054641645706575)
+        self.assertEqual((lags, nobs), (14, 143))
+        for regression in ["c", "ct", "n"]:
+            result = pp(self.panel, regression=regression)
+            for idx, series in enumerate(self.panel):
+                expected = pp(series, regression=regression)
+                self.assertAlmostEqual(result[0][idx], expected[0])
+                self.assertAlmostEqual(result[1][idx], expected[1])
+
+    def test_axis(self) -> None:
+        np.testing.assert_array_almost_equal(
+            adf(self.panel.T, axis=0)[0], adf(self.panel)[0]
+        )
+
+    def test_failures(self) -> None:
+        with self.assertRaises(ValueError):
+            adf(self.panel, regression="t")
+        with self.assertRaises(ValueError):
+            adf(self.panel, autolag="hqic")
+        with self.assertRaises(ValueError):
+            adf(self.panel, maxlag=100)
+        with self.assertRaises(ValueError):
+            adf(np.ones((2, 50)))
+        with self.assertRaises(ValueError):
+            kpss(self.panel, nlags=len(self.data))
+        with self.assertRaises(ValueError):
+            pp(np.where(self.panel > 1, np.nan, self.panel))
@@ -0,0 +1,378 @@
+import inspect
+import os
+import pickle
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from hashlib import blake2b
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Union
+
+import numpy as np
+
+from src.utils.precision import get_precision
+
+
+__all__ = [
+    "hash_array",
+    "LRUCache",
+    "DiskCache",
+    "disk_cached",
+    "set_disk_cache",
+    "get_disk_cache",
+    "disk_cache",
+]
+
+
+# Bump this whenever a change to this library alters the results of any `disk_cached` function, so that stale entries are never returned.
+_KEY_VERSION = 1
+
+# The third-party packages whose versions are part of every disk cache key, because they compute (part of) the cached results.
+_KEY_PACKAGES = ("numpy", "scipy", "statsmodels", "pmdarima", "antropy", "tsfeatures")
+
+_MISSING = object()
+
+
+def hash_array(x: Any) -> str:
+    """
+    Summary:
+        Build a content-addressed key for an array-like series.
+
+    Params:
+        x (array_like):
+            The data to hash. Anything accepted by `np.asarray()` will work.
+
+    Returns:
+        str:
+            A hex digest of the dtype, shape and raw bytes of the data.
+
+    ???+ Info "Details"
+        Two inputs with identical values hash to the same key, regardless of whether they were passed in as a `list`, `pd.Series` or `np.ndarray`.
+        The index of any `pandas` object is deliberately ignored.
+        Every input is hashed as `float64`, except a `float32` input, which keeps its own dtype. So a `float32` series never shares a key with the same values in `float64`, since the results computed from it may differ.
+    """
+    arr = np.asarray(x)
+    if arr.dtype != np.float32:
+        arr = arr.astype(np.float64, copy=False)
+    arr = np.ascontiguousarray(arr)
+    digest = blake2b(digest_size=16)
+    digest.update(arr.dtype.str.encode())
+    digest.update(str(arr.shape).encode())
+    digest.update(arr.view(np.uint8))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Summary:
+        A small, thread-safe, bounded least-recently-used cache.
+
+    Params:
+        maxsize (int, optional):
+            The maximum number of entries to retain. When full, the least recently used entry is evicted. Defaults to `128`.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Invalid value for `maxsize`: {maxsize}. Must be `>=1`.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class DiskCache:
+    """
+    Summary:
+        A persistent, size-bounded, least-recently-used cache, stored in a single SQLite file.
+
+    Params:
+        path (str):
+            The path of the SQLite file. It is created if it does not exist.
+        maxsize (int, optional):
+            The maximum number of entries to retain. Defaults to `100_000`.
+        max_bytes (Optional[int], optional):
+            If given, also the maximum total size of the pickled values, in bytes. Defaults to `None`.
+
+    Raises:
+        ValueError:
+            If `maxsize` or `max_bytes` are not positive.
+
+    ???+ Info "Details"
+        Values are pickled, and every read records its access time, so the least recently used entries are evicted first whenever either bound is exceeded.
+        The connection is opened lazily, and re-opened in any forked child process, so one `DiskCache` can be shared by the workers of a process pool. SQLite serialises their writes.
+        The `hits` and `misses` counters are kept per process.
+    """
+
+    def __init__(
+        self, path: str, maxsize: int = 100_000, max_bytes: Optional[int] = None
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Invalid value for `maxsize`: {maxsize}. Must be `>=1`.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(
+                f"Invalid value for `max_bytes`: {max_bytes}. Must be `>=1`."
+            )
+        self.path = os.fspath(path)
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid: Optional[int] = None
+        self._lock = Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.update(_connection=None, _pid=None, _lock=None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"DiskCache(path={self.path!r}, maxsize={self.maxsize}, max_bytes={self.max_bytes})"
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            import sqlite3
+
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT 1 FROM entries WHERE key = ?", (key,))
+                .fetchone()
+            )
+        return row is not None
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            query = "SELECT COALESCE(SUM(size), 0) FROM entries"
+            return self._connect().execute(query).fetchone()[0]
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            connection.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time_ns(), key)
+            )
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time_ns()),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection) -> None:
+        count, nbytes = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        excess = count - self.maxsize
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            # Walk the entries from the least recently used, until enough bytes are freed.
+            oldest = connection.execute("SELECT size FROM entries ORDER BY accessed")
+            freed, evicted = 0, 0
+            for (size,) in oldest:
+                if nbytes - freed <= self.max_bytes and evicted >= excess:
+                    break
+                freed, evicted = freed + size, evicted + 1
+            excess = evicted
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM entries")
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+_DISK_CACHE: Dict[str, Optional[DiskCache]] = {"cache": None}
+
+
+def set_disk_cache(cache: Optional[Union[str, DiskCache]]) -> Optional[DiskCache]:
+    """
+    Summary:
+        Turn the persistent result cache on (for a path or a `DiskCache`) or off (for `None`), for the whole process.
+
+    Returns:
+        Optional[DiskCache]:
+            The cache now in use.
+    """
+    if cache is not None and not isinstance(cache, DiskCache):
+        cache = DiskCache(cache)
+    _DISK_CACHE["cache"] = cache
+    return cache
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """
+    Summary:
+        The persistent result cache currently in use, if any.
+    """
+    return _DISK_CACHE["cache"]
+
+
+@contextmanager
+def disk_cache(cache: Union[str, DiskCache]) -> Iterator[DiskCache]:
+    """
+    Summary:
+        Temporarily turn the persistent result cache on, for example around a daily batch run.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> with disk_cache("results.sqlite") as cache:
+        ...     results = [qs(x=series, freq=12) for series in panel]
+        >>> cache.hits, cache.misses
+        (0, 1000)
+        ```
+    """
+    previous = get_disk_cache()
+    try:
+        yield set_disk_cache(cache)
+    finally:
+        set_disk_cache(previous)
+
+
+@lru_cache(maxsize=None)
+def _key_versions() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = [f"key={_KEY_VERSION}"]
+    for package in _KEY_PACKAGES:
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=none")
+    return ";".join(versions)
+
+
+def _key_token(value: Any) -> str:
+    from src.utils.prepared import PreparedSeries
+
+    if isinstance(value, PreparedSeries):
+        return value.key
+    if isinstance(value, np.ndarray) or hasattr(value, "to_numpy"):
+        return hash_array(value)
+    return repr(value)
+
+
+def _is_random(arguments: Dict[str, Any]) -> bool:
+    return (
+        arguments.get("resample") is not None
+        and "seed" in arguments
+        and arguments["seed"] is None
+    )
+
+
+def disk_cached(func: Callable) -> Callable:
+    """
+    Summary:
+        Cache the results of a function in the persistent cache set by `set_disk_cache()`, whenever one is set.
+
+    ???+ Info "Details"
+        The key is a hash of the function name, the content of every array argument (via `hash_array()`), the `repr()` of every other argument (after filling in defaults), the precision set by `set_precision()`, and the versions of this library's cache keys and of the packages which compute the results.
+        So a series which has not changed costs one hash and one lookup, rather than a full recomputation. Any warnings raised by the original computation are not raised again on a cache hit.
+        A call with a `resample` method but no `seed` (as `qs()` and `is_regular()` take) has a random p-value, so it is always recomputed and never stored, rather than returning its first draw forever.
+    """
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _DISK_CACHE["cache"]
+        if cache is None:
+            return func(*args, **kwargs)
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            return func(*args, **kwargs)
+        bound.apply_defaults()
+        if _is_random(bound.arguments):
+            return func(*args, **kwargs)
+        digest = blake2b(digest_size=16)
+        digest.update(f"{name}|{_key_versions()}|{get_precision()}".encode())
+        for argument, value in bound.arguments.items():
+            digest.update(f"|{argument}={_key_token(value)}".encode())
+        key = digest.hexdigest()
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+        return value
+
+    return wrapper
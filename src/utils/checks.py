@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from functools import wraps
+from itertools import chain
+from typing import Any, Callable, Iterator
+
+from typeguard import typechecked as _typechecked
+
+from src.utils.prepared import PreparedSeries
+
+
+__all__ = [
+    "array_like",
+    "bool_like",
+    "typechecked",
+    "set_typechecking",
+    "get_typechecking",
+    "typechecking",
+]
+
+
+# Stand-ins for the `statsmodels.tools.validation` annotations of the same names, which import `pandas` and `scipy` just to annotate a signature. Like those, they accept any value.
+array_like = Any
+bool_like = Any
+
+_TYPECHECKING = {"enabled": True}
+
+
+def set_typechecking(enabled: bool) -> None:
+    """
+    Summary:
+        Turn the runtime type checks of every public function on or off, for the whole process.
+
+    Params:
+        enabled (bool):
+            Whether or not to check the types of the arguments.
+    """
+    _TYPECHECKING["enabled"] = bool(enabled)
+
+
+def get_typechecking() -> bool:
+    """
+    Summary:
+        Whether the runtime type checks of the public functions are currently turned on.
+    """
+    return _TYPECHECKING["enabled"]
+
+
+@contextmanager
+def typechecking(enabled: bool) -> Iterator[None]:
+    """
+    Summary:
+        Temporarily turn the runtime type checks on or off, for example around a hot loop.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> with typechecking(False):
+        ...     results = [qs(x=series, freq=12) for series in panel]
+        ```
+    """
+    previous = get_typechecking()
+    set_typechecking(enabled)
+    try:
+        yield
+    finally:
+        set_typechecking(previous)
+
+
+def typechecked(func: Callable) -> Callable:
+    """
+    Summary:
+        A drop-in replacement for `typeguard.typechecked`, which can be turned off with `set_typechecking()`, and which is always skipped when any argument is a `PreparedSeries` (because that has already been validated).
+    """
+    checked = _typechecked(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _TYPECHECKING["enabled"] or any(
+            isinstance(arg, PreparedSeries) for arg in chain(args, kwargs.values())
+        ):
+            return func(*args, **kwargs)
+        return checked(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,74 @@
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "resolve_chunk_size", "iter_chunks", "moments"]
+
+
+# The number of values read at once when a 1D `np.memmap` input is processed without an explicit `chunk_size`. At 8 bytes each, that is 8 MiB per chunk.
+DEFAULT_CHUNK_SIZE = 2**20
+
+
+def resolve_chunk_size(x: Any, chunk_size: Optional[int]) -> Optional[int]:
+    """
+    Summary:
+        Decide whether, and in how large chunks, a series should be processed out-of-core.
+
+    Params:
+        x (Any):
+            The series.
+        chunk_size (Optional[int]):
+            The chunk size requested by the caller.
+
+    Raises:
+        ValueError:
+            If `chunk_size` is not a positive integer.
+
+    Returns:
+        Optional[int]:
+            The requested `chunk_size`, or `DEFAULT_CHUNK_SIZE` for a 1D `np.memmap` when none was requested, or otherwise `None`, meaning the series should be processed in memory. A memory-mapped panel is not chunked by default, because only 1D series can be processed in chunks.
+    """
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError(
+                f"Invalid option for `chunk_size` parameter: {chunk_size}.\n"
+                f"Must be a positive integer."
+            )
+        return chunk_size
+    return DEFAULT_CHUNK_SIZE if isinstance(x, np.memmap) and x.ndim == 1 else None
+
+
+def iter_chunks(
+    x: np.ndarray, chunk_size: int, overlap: int = 0
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Summary:
+        Read a 1D series one chunk at a time, as `float64`.
+
+    Params:
+        x (np.ndarray):
+            The series. Typically an `np.memmap`, so only the current chunk is ever read into memory.
+        chunk_size (int):
+            The number of values in each chunk.
+        overlap (int, optional):
+            The number of values after the end of each chunk to also include, where available. Defaults to `0`.
+
+    Returns:
+        Iterator[Tuple[int, np.ndarray]]:
+            The start position of each chunk, and a copy of `x[start : start + chunk_size + overlap]`.
+    """
+    for start in range(0, len(x), chunk_size):
+        yield start, np.array(x[start : start + chunk_size + overlap], dtype=np.float64)
+
+
+def moments(x: np.ndarray, chunk_size: int) -> Tuple[float, float]:
+    """
+    Summary:
+        The mean and the variance (`ddof=0`) of a 1D series, in two passes over its chunks.
+    """
+    mean = sum(chunk.sum() for _, chunk in iter_chunks(x, chunk_size)) / len(x)
+    squares = sum(
+        ((chunk - mean) ** 2).sum() for _, chunk in iter_chunks(x, chunk_size)
+    )
+    return mean, squares / len(x)
@@ -4,4 +4,4 @@ from typing import List, Union
 def dict_slice_by_keys(dictionary: dict, keys: Union[str, List[str]]):
     if isinstance(keys, str):
         keys = [keys]
-    return {key: value for key, value in dictionary.items() if key in keys}
+    return {key: dictionary[key] for key in keys if key in dictionary}
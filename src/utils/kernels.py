@@ -0,0 +1,260 @@
+"""
+A registry of the small numerical kernels behind `stability()`, `lumpiness()` and `spikiness()`, with one implementation per backend.
+
+The `"numpy"` implementations are always available.
+The `"numba"` implementations are plain loops, compiled by `numba` on first use. They make one or two passes over the data, and allocate no temporary arrays.
+`numba` is optional: without it, `"auto"` falls back to `"numpy"`, and asking for `"numba"` explicitly raises an `ImportError`.
+"""
+
+import warnings
+from importlib.util import find_spec
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+__all__ = [
+    "KERNEL_BACKENDS",
+    "register_kernel",
+    "get_kernel",
+    "resolve_backend",
+    "warmup",
+]
+
+
+KERNEL_BACKENDS = ["auto", "numpy", "numba"]
+_KERNELS: Dict[Tuple[str, str], Callable] = {}
+
+
+# ------------------------------------------------------------------------------#
+# Registry                                                                   ####
+# ------------------------------------------------------------------------------#
+
+
+def register_kernel(name: str, backend: str) -> Callable[[Callable], Callable]:
+    """
+    Summary:
+        Register a function as the `backend` implementation of the kernel `name`.
+
+    Params:
+        name (str):
+            The name of the kernel, such as `"tile_variance"`.
+        backend (str):
+            The name of the backend, such as `"numpy"`.
+
+    Returns:
+        Callable[[Callable], Callable]:
+            A decorator, which registers the function and returns it unchanged.
+    """
+
+    def register(func: Callable) -> Callable:
+        _KERNELS[(name, backend)] = func
+        return func
+
+    return register
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    Summary:
+        Resolve `"auto"` to `"numba"` when it is installed, or `"numpy"` otherwise.
+
+    Raises:
+        ValueError:
+            If `backend` is not one of the valid options.
+    """
+    if backend not in KERNEL_BACKENDS:
+        raise ValueError(
+            f"Invalid option for `backend` parameter: {backend}.\n"
+            f"Valid options are: {KERNEL_BACKENDS}."
+        )
+    if backend == "auto":
+        return "numba" if find_spec("numba") else "numpy"
+    return backend
+
+
+def get_kernel(name: str, backend: str = "numpy") -> Callable:
+    """
+    Summary:
+        Look up the `backend` implementation of the kernel `name`.
+
+    Params:
+        name (str):
+            The name of the kernel.
+        backend (str, optional):
+            One of `"auto"`, `"numpy"` or `"numba"`. Defaults to `"numpy"`.
+
+    Raises:
+        ValueError:
+            If `backend` is not one of the valid options.
+        ImportError:
+            If `backend="numba"`, but `numba` is not installed.
+        KeyError:
+            If there is no such kernel.
+
+    Returns:
+        Callable:
+            The kernel.
+    """
+    backend = resolve_backend(backend)
+    if backend == "numba":
+        _compile_numba()
+    return _KERNELS[(name, backend)]
+
+
+def warmup(backend: str = "auto", names: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Summary:
+        Compile the kernels ahead of time, so the first real call does not pay for it.
+
+    Params:
+        backend (str, optional):
+            The backend to warm up. Defaults to `"auto"`.
+        names (Optional[Sequence[str]], optional):
+            The kernels to warm up. Defaults to `None`, which warms up all of them.
+
+    Returns:
+        List[str]:
+            The names of the kernels which were warmed up.
+
+    ???+ Info "Details"
+        Each kernel is compiled for both `float64` and `float32` series, so the single precision mode of `src.utils.precision` does not pay for a second compilation either.
+        The compiled `numba` kernels are also cached on disk, next to this module, so only the first process ever compiles them, and later processes just load them. Pass `warmup` as the `initializer` of a `ProcessPoolExecutor` to load them in every worker before any task arrives.
+        With the `"numpy"` backend, there is nothing to compile, and this only checks that the kernels exist.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> warmup("numba")
+        ['tile_variance', 'loo_variance']
+        ```
+    """
+    names = list(_SAMPLES) if names is None else list(names)
+    for name in names:
+        for args in _SAMPLES[name]:
+            get_kernel(name, backend)(*args)
+    return names
+
+
+# ------------------------------------------------------------------------------#
+# Numpy kernels                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+def _tile_stats(x: np.ndarray, width: int, stat: str) -> np.ndarray:
+    """
+    The mean, or variance (`ddof=1`), of every full tile `x[i*width : (i+1)*width]`, ignoring `NaN`s.
+    """
+    tiles = x[: len(x) // width * width].reshape(-1, width)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if stat == "mean":
+            return np.nanmean(tiles, axis=1)
+        return np.nanvar(tiles, axis=1, ddof=1)
+
+
+def _tile_variance(x: np.ndarray, width: int, values: np.ndarray) -> float:
+    """
+    The variance (`ddof=1`) of the tile statistics `values` of `x`, ignoring `NaN`s, as `tsfeatures` computes it.
+    """
+    if len(x) < 2 * width:
+        return 0.0
+    values = values[~np.isnan(values)]
+    return np.var(values, ddof=1) if len(values) > 1 else np.nan
+
+
+@register_kernel("tile_variance", "numpy")
+def _tile_variance_numpy(x: np.ndarray, width: int, var: bool) -> float:
+    return _tile_variance(x, width, _tile_stats(x, width, "var" if var else "mean"))
+
+
+@register_kernel("loo_variance", "numpy")
+def _loo_variance_numpy(residuals: np.ndarray, n: int) -> float:
+    # The leave-one-out variances differ from each other by only `O(1/n)`, which single precision cannot resolve, so they are always computed in `float64`.
+    residuals = np.asarray(residuals, dtype=np.float64)
+    d = (residuals - np.nanmean(residuals)) ** 2
+    varloo = (np.nanvar(residuals, ddof=1) * (n - 1) - d) / (n - 2)
+    return np.nanvar(varloo, ddof=1)
+
+
+# ------------------------------------------------------------------------------#
+# Numba kernels                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+def _tile_variance_loop(x: np.ndarray, width: int, var: bool) -> float:
+    # The variance (`ddof=1`) of the mean (or variance, with `var`) of every full tile, ignoring `NaN`s, in one pass of Welford updates.
+    if len(x) < 2 * width:
+        return 0.0
+    count, mean, squares = 0, 0.0, 0.0
+    for tile in range(len(x) // width):
+        n, tile_mean, tile_squares = 0, 0.0, 0.0
+        for i in range(tile * width, (tile + 1) * width):
+            if not np.isnan(x[i]):
+                n += 1
+                delta = x[i] - tile_mean
+                tile_mean += delta / n
+                tile_squares += delta * (x[i] - tile_mean)
+        if var:
+            if n < 2:
+                continue
+            value = tile_squares / (n - 1)
+        else:
+            if n < 1:
+                continue
+            value = tile_mean
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        squares += delta * (value - mean)
+    return squares / (count - 1) if count > 1 else np.nan
+
+
+def _loo_variance_loop(residuals: np.ndarray, n: int) -> float:
+    # The variance (`ddof=1`) of the leave-one-out variances of `residuals`, ignoring `NaN`s, in two passes and no temporary arrays.
+    count, mean, squares = 0, 0.0, 0.0
+    for value in residuals:
+        if not np.isnan(value):
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            squares += delta * (value - mean)
+    if count < 2:
+        return np.nan
+    total = squares / (count - 1) * (n - 1)
+    loo_count, loo_mean, loo_squares = 0, 0.0, 0.0
+    for value in residuals:
+        if not np.isnan(value):
+            loo = (total - (value - mean) ** 2) / (n - 2)
+            loo_count += 1
+            delta = loo - loo_mean
+            loo_mean += delta / loo_count
+            loo_squares += delta * (loo - loo_mean)
+    return loo_squares / (loo_count - 1) if loo_count > 1 else np.nan
+
+
+_LOOPS = {"tile_variance": _tile_variance_loop, "loo_variance": _loo_variance_loop}
+
+# Small arguments of the expected types, to compile each kernel for every signature it is called with.
+_SAMPLES = {
+    "tile_variance": [
+        (np.arange(8, dtype=dtype), 2, False) for dtype in (np.float64, np.float32)
+    ],
+    "loo_variance": [
+        (np.arange(8, dtype=dtype), 8) for dtype in (np.float64, np.float32)
+    ],
+}
+
+
+def _compile_numba() -> None:
+    if all((name, "numba") in _KERNELS for name in _LOOPS):
+        return
+    try:
+        import numba
+    except ImportError as error:
+        raise ImportError(
+            f"The `numba` backend needs the `numba` package.\n"
+            f"Install it, or use the `numpy` backend."
+        ) from error
+    for name, loop in _LOOPS.items():
+        _KERNELS[(name, "numba")] = numba.njit(cache=True, nogil=True)(loop)
@@ -0,0 +1,146 @@
+from typing import Any, Optional
+
+import numpy as np
+
+from src.utils.cache import hash_array
+
+
+__all__ = ["PreparedSeries", "prepare", "unwrap"]
+
+
+_DTYPES = (np.float64, np.float32)
+
+
+class PreparedSeries:
+    """
+    Summary:
+        A univariate time series which has been validated and converted once, so it can be passed to many tests without being checked and converted again by each of them.
+
+    Params:
+        x (array_like):
+            The time series data. Anything accepted by `np.asarray()` will work, including `list`, `pd.Series` and `np.ndarray`.
+        dtype (np.dtype, optional):
+            Either `np.float64` or `np.float32`. Defaults to `np.float64`.
+
+    Raises:
+        ValueError:
+            If `x` is not one-dimensional, or `dtype` is not a supported floating point type.
+
+    ???+ Info "Details"
+        The values are stored as a contiguous, read-only copy of `x`. The missing-value mask, the number of observations, the mean, the variance and the content hash (used as the key of the model caches) are computed on first use, and then kept.
+
+        Every public function in the `correlation`, `regularity`, `seasonality`, `stability` and `stationarity` modules accepts a `PreparedSeries` anywhere it accepts an `array_like`, and skips its runtime type checks when given one.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> from src.seasonality import qs
+        >>> data = PreparedSeries(load_airline())
+        >>> [qs(x=data, freq=freq)["stat"] for freq in (4, 12)]
+        [0.0, 194.4692892087745]
+        ```
+    """
+
+    __slots__ = ("values", "_mask", "_mean", "_var", "_key")
+
+    def __init__(self, x: Any, dtype: Any = np.float64) -> None:
+        if np.dtype(dtype) not in [np.dtype(d) for d in _DTYPES]:
+            raise ValueError(
+                f"Invalid option for `dtype` parameter: {dtype}.\n"
+                f"Valid options are: {[np.dtype(d).name for d in _DTYPES]}."
+            )
+        # Always a fresh copy, so freezing it leaves the caller's array writable, and later changes to that array cannot make the cached statistics stale.
+        values = np.array(x, dtype=dtype, order="C", copy=True)
+        if values.ndim != 1:
+            raise ValueError(f"Invalid shape for `x`: {values.shape}. Must be 1D.")
+        values.flags.writeable = False
+        self.values = values
+        self._mask: Optional[np.ndarray] = None
+        self._mean: Optional[float] = None
+        self._var: Optional[float] = None
+        self._key: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        if dtype is None or np.dtype(dtype) == self.values.dtype:
+            return self.values.copy() if copy else self.values
+        return self.values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"PreparedSeries(nobs={self.nobs}, dtype={self.dtype.name})"
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    @property
+    def nobs(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def mask(self) -> np.ndarray:
+        """`True` where the value is missing."""
+        if self._mask is None:
+            self._mask = np.isnan(self.values)
+            self._mask.flags.writeable = False
+        return self._mask
+
+    @property
+    def has_nan(self) -> bool:
+        return bool(self.mask.any())
+
+    @property
+    def n_valid(self) -> int:
+        return int(self.nobs - self.mask.sum())
+
+    @property
+    def mean(self) -> float:
+        """The mean of the non-missing values."""
+        if self._mean is None:
+            self._mean = float(np.nanmean(self.values)) if self.n_valid else np.nan
+        return self._mean
+
+    @property
+    def var(self) -> float:
+        """The (`ddof=0`) variance of the non-missing values."""
+        if self._var is None:
+            self._var = float(np.nanvar(self.values)) if self.n_valid else np.nan
+        return self._var
+
+    @property
+    def key(self) -> str:
+        """The `hash_array()` of the values."""
+        if self._key is None:
+            self._key = hash_array(self.values)
+        return self._key
+
+
+def prepare(x: Any, dtype: Any = np.float64) -> PreparedSeries:
+    """
+    Summary:
+        Convert `x` to a `PreparedSeries`, unless it already is one of the requested `dtype`.
+
+    Params:
+        x (array_like):
+            The time series data.
+        dtype (np.dtype, optional):
+            Either `np.float64` or `np.float32`. Defaults to `np.float64`.
+
+    Returns:
+        PreparedSeries:
+            The prepared series.
+    """
+    if isinstance(x, PreparedSeries) and x.dtype == np.dtype(dtype):
+        return x
+    return PreparedSeries(x, dtype=dtype)
+
+
+def unwrap(x: Any) -> Any:
+    """
+    Summary:
+        Return the underlying `np.ndarray` of a `PreparedSeries`, or any other input unchanged. Use this before handing data to a third-party library.
+    """
+    return x.values if isinstance(x, PreparedSeries) else x
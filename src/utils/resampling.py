@@ -0,0 +1,188 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+__all__ = ["RESAMPLE_METHODS", "surrogates", "resample_statistic", "pvalue"]
+
+
+RESAMPLE_METHODS = ["permutation", "block", "phase"]
+
+# The number of replicates generated and evaluated by each task. Every task has its own child seed, so the results do not depend on how the tasks are spread over the workers.
+_TASK_SIZE = 128
+
+
+def surrogates(
+    x: np.ndarray,
+    n: int,
+    method: str,
+    rng: np.random.Generator,
+    block_size: int = 1,
+) -> np.ndarray:
+    """
+    Summary:
+        Generate `n` resampled copies of a series, as one `(n, len(x))` matrix.
+
+    Params:
+        x (np.ndarray):
+            The series, without any `NaN`s.
+        n (int):
+            The number of replicates.
+        method (str):
+            One of:
+            - `"permutation"`: Shuffle the values, which destroys every autocorrelation,
+            - `"block"`: A circular block bootstrap, which keeps the dependence within each block of `block_size` values,
+            - `"phase"`: Randomise the Fourier phases, which keeps the whole autocorrelation function (and so any linear structure) but destroys everything else.
+        rng (np.random.Generator):
+            The random number generator.
+        block_size (int, optional):
+            The block length, for the `"block"` method. Defaults to `1`.
+
+    Raises:
+        ValueError:
+            If `method` is not one of the valid options.
+
+    Returns:
+        np.ndarray:
+            The replicates, one per row, with the same dtype as `x`.
+    """
+    nobs = len(x)
+    if method == "permutation":
+        return rng.permuted(np.tile(x, (n, 1)), axis=1)
+    if method == "block":
+        nblocks = ceil(nobs / block_size)
+        starts = rng.integers(0, nobs, size=(n, nblocks, 1))
+        index = (starts + np.arange(block_size)) % nobs
+        return x[index.reshape(n, -1)[:, :nobs]]
+    if method == "phase":
+        from scipy.fft import irfft, rfft
+
+        # `scipy.fft` keeps a `float32` series in single precision, where `np.fft` would upcast it.
+        spectrum = rfft(x - x.mean())
+        phases = np.exp(2j * np.pi * rng.random((n, len(spectrum)))).astype(
+            spectrum.dtype
+        )
+        # The mean, and the Nyquist frequency of an even-length series, must stay real.
+        phases[:, 0] = 1
+        if nobs % 2 == 0:
+            phases[:, -1] = 1
+        return irfft(spectrum * phases, n=nobs, axis=-1) + x.mean()
+    raise ValueError(
+        f"Invalid option for `method` parameter: {method}.\n"
+        f"Valid options are: {RESAMPLE_METHODS}."
+    )
+
+
+def _resample_task(
+    x: np.ndarray,
+    statistic: Callable[[np.ndarray], np.ndarray],
+    n: int,
+    method: str,
+    block_size: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    panel = surrogates(x, n, method, np.random.default_rng(seed), block_size)
+    return np.asarray(statistic(panel), dtype=np.float64)
+
+
+def resample_statistic(
+    x: np.ndarray,
+    statistic: Callable[[np.ndarray], np.ndarray],
+    n_resamples: int,
+    method: str,
+    block_size: int = 1,
+    seed: Optional[int] = None,
+    n_jobs: int = 1,
+) -> np.ndarray:
+    """
+    Summary:
+        Evaluate a statistic on `n_resamples` resampled copies of a series.
+
+    Params:
+        x (np.ndarray):
+            The series, without any `NaN`s.
+        statistic (Callable[[np.ndarray], np.ndarray]):
+            A function of a `(B, T)` matrix of replicates, which returns the `B` values of the statistic. To run in parallel, it must be picklable, such as a module-level function or a `functools.partial` of one.
+        n_resamples (int):
+            The number of replicates.
+        method (str):
+            The resampling method. See `surrogates()`.
+        block_size (int, optional):
+            The block length, for the `"block"` method. Defaults to `1`.
+        seed (Optional[int], optional):
+            The random seed. The same seed always gives the same replicates, whatever the value of `n_jobs`. Defaults to `None`.
+        n_jobs (int, optional):
+            The number of worker processes. Use `1` to run in the current process, or `-1` to use every core. Defaults to `1`.
+
+    Raises:
+        ValueError:
+            If `n_resamples` or `block_size` are not positive, or `method` is not valid.
+
+    Returns:
+        np.ndarray:
+            The `n_resamples` values of the statistic.
+    """
+    if n_resamples < 1:
+        raise ValueError(
+            f"Invalid option for `n_resamples` parameter: {n_resamples}.\n"
+            f"Must be a positive integer."
+        )
+    if block_size < 1:
+        raise ValueError(
+            f"Invalid option for `block_size` parameter: {block_size}.\n"
+            f"Must be a positive integer."
+        )
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(
+            f"Invalid option for `resample` parameter: {method}.\n"
+            f"Valid options are: {RESAMPLE_METHODS}."
+        )
+    sizes = [_TASK_SIZE] * (n_resamples // _TASK_SIZE)
+    sizes += [n_resamples % _TASK_SIZE] if n_resamples % _TASK_SIZE else []
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+
+    results: List[np.ndarray] = []
+    if n_jobs == 1 or len(sizes) == 1:
+        for size, child in zip(sizes, seeds):
+            results.append(
+                _resample_task(x, statistic, size, method, block_size, child)
+            )
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(
+                executor.map(
+                    _resample_task,
+                    [x] * len(sizes),
+                    [statistic] * len(sizes),
+                    sizes,
+                    [method] * len(sizes),
+                    [block_size] * len(sizes),
+                    seeds,
+                )
+            )
+    return np.concatenate(results)
+
+
+def pvalue(observed: float, replicates: np.ndarray, alternative: str) -> float:
+    """
+    Summary:
+        The Monte-Carlo p-value of an observed statistic, `(1 + k) / (1 + B)`, where `k` of the `B` replicates are at least as extreme.
+
+    Params:
+        observed (float):
+            The statistic of the original series.
+        replicates (np.ndarray):
+            The statistic of each replicate.
+        alternative (str):
+            Either `"greater"`, when large values are extreme, or `"less"`, when small values are.
+    """
+    replicates = replicates[~np.isnan(replicates)]
+    if alternative == "greater":
+        extreme = np.count_nonzero(replicates >= observed)
+    else:
+        extreme = np.count_nonzero(replicates <= observed)
+    return (1 + extreme) / (1 + len(replicates))
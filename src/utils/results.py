@@ -0,0 +1,250 @@
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+__all__ = ["Result", "QSResult", "RegularityResult", "ResultTable"]
+
+
+# ------------------------------------------------------------------------------#
+# Results                                                                    ####
+# ------------------------------------------------------------------------------#
+
+
+class Result(Mapping):
+    """
+    Summary:
+        The base of the compact, read-only result types.
+
+    ???+ Info "Details"
+        Each subclass stores its fields in `__slots__`, so an instance has no per-object `__dict__`, and costs a fraction of the memory of the equivalent `dict`.
+        It still behaves like a read-only `dict`: `result["stat"]`, `result.keys()`, `dict(result)` and `result == {...}` all work as before. The fields are also available as attributes, such as `result.stat`.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        if len(args) > len(self._fields):
+            raise TypeError(
+                f"{type(self).__name__} takes at most {len(self._fields)} values."
+            )
+        values = dict(zip(self._fields, args), **kwargs)
+        unknown = [key for key in values if key not in self._fields]
+        if unknown:
+            raise TypeError(
+                f"Invalid fields for {type(self).__name__}: {unknown}.\n"
+                f"Valid fields are: {list(self._fields)}."
+            )
+        for field in self._fields:
+            object.__setattr__(self, field, values.get(field))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), tuple(getattr(self, field) for field in self._fields)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={self[field]!r}" for field in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+class QSResult(Result):
+    """
+    Summary:
+        The result of `qs(result_object=True)`.
+    """
+
+    __slots__ = _fields = ("stat", "Pval", "test", "model")
+
+
+class RegularityResult(Result):
+    """
+    Summary:
+        The result of `is_regular(result_object=True)`. The `Pval` is `None` unless `is_regular()` was given a `resample` method.
+    """
+
+    __slots__ = _fields = ("result", "entropy", "tolerance", "Pval")
+
+
+# ------------------------------------------------------------------------------#
+# Tables                                                                     ####
+# ------------------------------------------------------------------------------#
+
+
+def _fill_value(dtype: np.dtype) -> Any:
+    if dtype.kind == "O":
+        return None
+    if dtype.kind in "fc":
+        return np.nan
+    return dtype.type(0)
+
+
+class ResultTable:
+    """
+    Summary:
+        Accumulate many results in one numpy array per field, rather than one `dict` per result.
+
+    Params:
+        fields (Mapping[str, Any]):
+            The name and `dtype` of each field, in column order. Use `object` for strings, identifiers and models.
+        keep_models (bool, optional):
+            Whether or not to retain the values of a field named `"model"`. When `False`, that field is dropped on `append()`, so fitted models can be released as soon as each result is recorded. Defaults to `False`.
+        capacity (int, optional):
+            The number of rows to allocate up front. The arrays double in size whenever they are full. Defaults to `1024`.
+
+    ???+ Info "Details"
+        Appending a row writes one element into each preallocated array, so the cost per result is a handful of array stores, with no per-row object kept alive.
+        Tables built in worker processes can be combined with `extend()`, which copies whole columns at once.
+        Both `to_pandas()` and `to_parquet()` build their output from the column arrays directly, rather than row by row.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> from sktime.datasets import load_airline
+        >>> from src.seasonality import qs
+        >>> data = load_airline()
+        >>> table = ResultTable({"freq": np.int64, "stat": np.float64, "Pval": np.float64, "model": object})
+        >>> for freq in (4, 12):
+        ...     table.append(qs(x=data, freq=freq, result_object=True), freq=freq)
+        >>> table.to_pandas()
+           freq        stat          Pval
+        0     4    0.000000  1.000000e+00
+        1    12  194.469289  5.909223e-43
+        ```
+    """
+
+    __slots__ = ("keep_models", "_dtypes", "_columns", "_size")
+
+    def __init__(
+        self,
+        fields: Mapping,
+        keep_models: bool = False,
+        capacity: int = 1024,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError(
+                f"Invalid option for `capacity` parameter: {capacity}.\n"
+                f"Must be a positive integer."
+            )
+        self.keep_models = keep_models
+        self._dtypes = {
+            name: np.dtype(dtype)
+            for name, dtype in fields.items()
+            if keep_models or name != "model"
+        }
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, dtype in self._dtypes.items()
+        }
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name][: self._size]
+
+    def __repr__(self) -> str:
+        return f"ResultTable(rows={self._size}, fields={list(self._dtypes)})"
+
+    @property
+    def fields(self) -> Dict[str, np.dtype]:
+        return dict(self._dtypes)
+
+    def _reserve(self, rows: int) -> None:
+        capacity = len(next(iter(self._columns.values()), ()))
+        if self._size + rows <= capacity:
+            return
+        capacity = max(2 * capacity, self._size + rows)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def append(self, result: Optional[Mapping] = None, **values: Any) -> None:
+        """
+        Summary:
+            Add one row, from the fields of `result` and/or keyword arguments. Fields of `result` which are not in the table are ignored, and fields of the table which are not given are filled with `NaN` (for floating point fields), `None` (for `object` fields) or `0`.
+
+        Raises:
+            KeyError:
+                If any keyword argument does not match a field of the table. A `"model"` value is always accepted, and dropped unless `keep_models` is `True`.
+        """
+        unknown = [
+            name for name in values if name not in self._dtypes and name != "model"
+        ]
+        if unknown:
+            raise KeyError(
+                f"Invalid fields: {unknown}.\n"
+                f"Valid fields are: {list(self._dtypes)}."
+            )
+        if result is not None:
+            values = {**result, **values}
+        self._reserve(1)
+        for name, column in self._columns.items():
+            column[self._size] = values.get(name, _fill_value(column.dtype))
+        self._size += 1
+
+    def extend(self, other: "ResultTable") -> None:
+        """
+        Summary:
+            Add every row of another table with the same fields, one column at a time.
+        """
+        if list(other._dtypes) != list(self._dtypes):
+            raise ValueError(
+                f"Invalid fields for `other`: {list(other._dtypes)}.\n"
+                f"Must match: {list(self._dtypes)}."
+            )
+        self._reserve(len(other))
+        for name, column in self._columns.items():
+            column[self._size : self._size + len(other)] = other[name]
+        self._size += len(other)
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """
+        Summary:
+            Export the table as a `pd.DataFrame`, with one column per field. Numeric columns are passed to `pandas` without copying.
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame({name: self[name] for name in self._columns}, copy=False)
+        return frame.infer_objects()
+
+    def to_parquet(self, path: str, **kwargs: Any) -> None:
+        """
+        Summary:
+            Write the table to a Parquet file, building each Arrow column straight from its numpy array.
+
+        Raises:
+            ImportError:
+                If `pyarrow` is not installed.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise ImportError(
+                f"Writing Parquet files requires `pyarrow`. Install it with: `pip install pyarrow`."
+            ) from err
+        columns = {name: self[name] for name in self._columns if name != "model"}
+        pq.write_table(pa.table(columns), path, **kwargs)
@@ -0,0 +1,238 @@
+"""
+Run a function over every row of a panel in parallel, without pickling the panel.
+
+The panel is copied into one block of `multiprocessing.shared_memory` before the workers start, and every worker maps that same block as a read-only `np.ndarray`.
+Each task is only a range of row indices, and each worker writes its scalar results straight into a second shared block, so neither the data nor the numeric results are ever serialised.
+Only the occasional extra value returned by the function (such as a warning message, or a fitted model) travels back through a pipe.
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from math import ceil
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+__all__ = ["SharedArray", "shared_map"]
+
+
+# ------------------------------------------------------------------------------#
+# Shared arrays                                                              ####
+# ------------------------------------------------------------------------------#
+
+
+class SharedArray:
+    """
+    Summary:
+        A `np.ndarray` which lives in a block of `multiprocessing.shared_memory`.
+
+    ???+ Info "Details"
+        Pickling a `SharedArray` only sends the name, shape and dtype of its block, and unpickling it in another process maps the same memory, with no copy.
+        Only the process which created the block unlinks it, on `close()` or when leaving a `with` block.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> with SharedArray.copy(np.arange(6.0).reshape(2, 3)) as shared:
+        ...     shared.array[1]
+        array([3., 4., 5.])
+        ```
+    """
+
+    def __init__(
+        self, name: str, shape: Tuple[int, ...], dtype: str, owner: bool = False
+    ) -> None:
+        self._shm = SharedMemory(name=name)
+        self._owner = owner
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def create(
+        cls, shape: Tuple[int, ...], dtype: Any = np.float64, fill: Any = 0
+    ) -> "SharedArray":
+        """
+        Summary:
+            Allocate a new shared block, filled with `fill`.
+        """
+        dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = SharedMemory(create=True, size=nbytes)
+        shared = cls(shm.name, tuple(shape), dtype.str, owner=True)
+        shm.close()
+        shared.array.fill(fill)
+        return shared
+
+    @classmethod
+    def copy(cls, array: np.ndarray) -> "SharedArray":
+        """
+        Summary:
+            Allocate a new shared block, and copy `array` into it.
+        """
+        array = np.asarray(array)
+        shared = cls.create(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.name, self.array.shape, self.array.dtype.str)
+
+    def close(self) -> None:
+        """
+        Summary:
+            Release this process's mapping of the block, and free the block itself if this process created it.
+        """
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+# ------------------------------------------------------------------------------#
+# Executor                                                                   ####
+# ------------------------------------------------------------------------------#
+
+
+def _apply(
+    func: Callable,
+    panel: np.ndarray,
+    out: np.ndarray,
+    lengths: Optional[np.ndarray],
+    start: int,
+    stop: int,
+) -> Dict[int, Any]:
+    extras = {}
+    for row in range(start, stop):
+        x = panel[row] if lengths is None else panel[row, : lengths[row - start]]
+        extra = func(x, out[row])
+        if extra is not None:
+            extras[row] = extra
+    return extras
+
+
+def _shared_task(
+    func: Callable,
+    inputs: SharedArray,
+    outputs: SharedArray,
+    lengths: Optional[np.ndarray],
+    start: int,
+    stop: int,
+) -> Dict[int, Any]:
+    # The shared arrays arrive as just their names, and are mapped (not copied) here, for the duration of the task.
+    try:
+        inputs.array.flags.writeable = False
+        return _apply(func, inputs.array, outputs.array, lengths, start, stop)
+    finally:
+        inputs.close()
+        outputs.close()
+
+
+def shared_map(
+    func: Callable[[np.ndarray, np.ndarray], Any],
+    panel: np.ndarray,
+    n_outputs: int = 1,
+    n_jobs: int = -1,
+    chunksize: Optional[int] = None,
+    lengths: Optional[np.ndarray] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[np.ndarray, Dict[int, Any]]:
+    """
+    Summary:
+        Apply `func` to every row of a 2D panel, over a pool of processes which all share one copy of the panel.
+
+    Params:
+        func (Callable[[np.ndarray, np.ndarray], Any]):
+            Called as `func(x, out)` for every row, where `x` is a read-only view of the row, and `out` is a writable view of its `n_outputs` results, which start as `NaN`. Anything other than `None` that it returns is sent back to the parent. It must be picklable, such as a module-level function or a `functools.partial` of one.
+        panel (np.ndarray):
+            The panel, with one series per row.
+        n_outputs (int, optional):
+            The number of scalar results of each row. Defaults to `1`.
+        n_jobs (int, optional):
+            The number of worker processes. Use `1` to run in the current process, or `-1` to use every core. With an `executor`, this only sets the default `chunksize`. Defaults to `-1`.
+        chunksize (Optional[int], optional):
+            The number of rows in each task. Defaults to `None`, which splits the panel into roughly four tasks per worker.
+        lengths (Optional[np.ndarray], optional):
+            The number of leading values of each row to pass to `func`, for a ragged panel padded out to a rectangle. Defaults to `None`, which passes every row whole.
+        executor (Optional[Executor], optional):
+            An existing `ProcessPoolExecutor` to run the tasks on, such as one shared by many calls, so that its workers only start (and import their dependencies) once. Defaults to `None`, which starts a new pool of `n_jobs` workers for this call.
+
+    Raises:
+        ValueError:
+            If `panel` is not a 2D array.
+
+    Returns:
+        Tuple[np.ndarray, Dict[int, Any]]:
+            The `(len(panel), n_outputs)` array of results, and the extra values returned by `func`, keyed by row.
+
+    ???+ Info "Details"
+        The panel is copied once into shared memory, then each task sends only the names of the shared blocks and a `(start, stop)` range of rows to a worker. The workers never copy a row, and they write the scalar results directly into a shared output array. Both shared blocks are freed before returning, even if `func` raises.
+
+    ???+ Example "Examples"
+        Basic usage:
+        ```python linenums="1"
+        >>> import numpy as np
+        >>> def spread(x, out):
+        ...     out[:] = x.min(), x.max()
+        >>> results, extras = shared_map(spread, np.arange(6.0).reshape(3, 2), n_outputs=2, n_jobs=2)
+        >>> results
+        array([[0., 1.],
+               [2., 3.],
+               [4., 5.]])
+        ```
+    """
+    panel = np.asarray(panel)
+    if panel.ndim != 2:
+        raise ValueError(
+            f"Invalid shape for `panel`: {panel.shape}.\n"
+            f"Must be a 2D array with one series per row."
+        )
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+    nrows = len(panel)
+
+    if executor is None and (n_jobs == 1 or nrows <= 1):
+        panel = panel.view()
+        panel.flags.writeable = False
+        results = np.full((nrows, n_outputs), np.nan)
+        return results, _apply(func, panel, results, lengths, 0, nrows)
+
+    chunksize = chunksize or max(1, ceil(nrows / (n_jobs * 4)))
+    bounds = [(i, min(i + chunksize, nrows)) for i in range(0, nrows, chunksize)]
+    extras = {}
+    with SharedArray.copy(panel) as inputs, SharedArray.create(
+        (nrows, n_outputs), np.float64, fill=np.nan
+    ) as outputs:
+        pool = executor or ProcessPoolExecutor(max_workers=n_jobs)
+        futures = [
+            pool.submit(
+                _shared_task,
+                func,
+                inputs,
+                outputs,
+                None if lengths is None else lengths[start:stop],
+                start,
+                stop,
+            )
+            for start, stop in bounds
+        ]
+        try:
+            for future in futures:
+                extras.update(future.result())
+        finally:
+            # Never free the shared blocks while a task may still be using them.
+            wait(futures)
+            if executor is None:
+                pool.shutdown()
+        results = outputs.array.copy()
+    return results, extras